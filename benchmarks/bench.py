@@ -0,0 +1,352 @@
+"""
+Benchmark suite for the simulation, world and rendering hot paths
+Runs offscreen with the SDL dummy video driver, seeds every benchmark so
+repeated runs do the same work, writes the results as JSON and compares
+them against a stored baseline
+
+    python -m benchmarks.bench                    # run and compare with the baseline
+    python -m benchmarks.bench --save-baseline    # record a new baseline
+    python -m benchmarks.bench --filter world     # only benchmarks matching "world"
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from game.core_game import GameState
+from game.ecs import Survivors
+from game.event_manager import EventManager
+from game.player import Player
+from game.resource_manager import ResourceManager
+from game.rng import GameRNG
+from game.ui import UI
+from game.world import World
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+REQUIREMENTS_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "requirements.txt")
+
+# Each entry is (name, setup); setup(seed) prepares fresh state and returns
+# (operations, run), where run() performs `operations` operations
+Setup = Callable[[int], Tuple[int, Callable[[], None]]]
+BENCHMARKS: List[Tuple[str, Setup]] = []
+
+
+def benchmark(name: str):
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+def _rich_game_state(seed: int) -> GameState:
+    """GameState that cannot die, so every call does the full amount of work"""
+    state = GameState(GameRNG(seed))
+    state.food = state.water = state.fuel = 10**9
+    state.player_health = 10**9
+    return state
+
+
+@benchmark("game_state.update")
+def bench_game_state_update(seed):
+    state = _rich_game_state(seed)
+    frames = 60 * 60 * 5
+
+    def run():
+        update = state.update
+        for _ in range(frames):
+            update(1 / 60)
+    return frames, run
+
+
+@benchmark("game_state.advance_day")
+def bench_game_state_advance_day(seed):
+    state = _rich_game_state(seed)
+    days = 20000
+
+    def run():
+        for _ in range(days):
+            state.advance_day()
+    return days, run
+
+
+def _register_world_benchmarks():
+    for width, height in ((1024, 768), (10240, 10240), (40960, 40960)):
+        @benchmark(f"world.generate_terrain[{width}x{height}]")
+        def bench_generate(seed, width=width, height=height):
+            world = World(width, height, GameRNG(seed))
+
+            def run():
+                world.generate_terrain()
+            return 1, run
+
+    for width, height in ((800, 600), (1024, 768), (1920, 1080)):
+        @benchmark(f"world.draw[{width}x{height}]")
+        def bench_draw(seed, width=width, height=height):
+            world = World(width, height, GameRNG(seed))
+            screen = pygame.Surface((width, height))
+            world.draw(screen)
+            frames = 200
+
+            def run():
+                for _ in range(frames):
+                    world.draw(screen)
+            return frames, run
+
+    for count in (10, 100, 1000, 10000):
+        @benchmark(f"world.check_hazard_collision[{count}]")
+        def bench_collision(seed, count=count):
+            world = World(1024, 768, GameRNG(seed))
+            world.hazards.clear()
+            rng = np.random.default_rng(seed)
+            world.hazards.add_many(rng.uniform(0, 1024, count), rng.uniform(0, 768, count),
+                                   rng.integers(0, 3, count), rng.integers(30, 80, count))
+            points = list(zip(rng.uniform(0, 1024, 5000).tolist(), rng.uniform(0, 768, 5000).tolist()))
+
+            def run():
+                check = world.check_hazard_collision
+                for x, y in points:
+                    check(x, y)
+            return len(points), run
+
+    @benchmark("world.check_hazard_collisions[5000x1000]")
+    def bench_collisions(seed):
+        world = World(1024, 768, GameRNG(seed))
+        world.hazards.clear()
+        rng = np.random.default_rng(seed)
+        world.hazards.add_many(rng.uniform(0, 1024, 1000), rng.uniform(0, 768, 1000),
+                               rng.integers(0, 3, 1000), rng.integers(30, 80, 1000))
+        points = np.column_stack([rng.uniform(0, 1024, 5000), rng.uniform(0, 768, 5000)])
+        batches = 20
+
+        def run():
+            for _ in range(batches):
+                world.check_hazard_collisions(points)
+        return batches, run
+
+    @benchmark("world.draw_hazards[10000]")
+    def bench_draw_hazards(seed):
+        world = World(1024, 768, GameRNG(seed))
+        world.hazards.clear()
+        rng = np.random.default_rng(seed)
+        world.hazards.add_many(rng.uniform(0, 1024, 10000), rng.uniform(0, 768, 10000),
+                               rng.integers(0, 3, 10000), rng.integers(30, 80, 10000))
+        screen = pygame.Surface((1024, 768))
+        frames = 10
+
+        def run():
+            for _ in range(frames):
+                world.draw_hazards(screen, world.hazards)
+        return frames, run
+
+
+_register_world_benchmarks()
+
+
+def _survivors(seed: int, count: int) -> Survivors:
+    rng = GameRNG(seed)
+    survivors = Survivors(World(1024, 768, rng.stream("world")), rng.stream("npcs"), capacity=count)
+    survivors.reset(count)
+    return survivors
+
+
+@benchmark("ecs.update[5000]")
+def bench_ecs_update(seed):
+    survivors = _survivors(seed, 5000)
+    frames = 600
+
+    def run():
+        for frame in range(frames):
+            survivors.update(1.0, new_day=frame % 120 == 119)
+    return frames, run
+
+
+@benchmark("ecs.update[5000x1000]")
+def bench_ecs_update_hazards(seed):
+    survivors = _survivors(seed, 5000)
+    hazards = survivors.world.hazards
+    hazards.clear()
+    rng = np.random.default_rng(seed)
+    hazards.add_many(rng.uniform(0, 1024, 1000), rng.uniform(0, 768, 1000),
+                     rng.integers(0, 3, 1000), rng.integers(30, 80, 1000))
+    frames = 200
+
+    def run():
+        for frame in range(frames):
+            survivors.update(1.0, new_day=frame % 120 == 119)
+    return frames, run
+
+
+@benchmark("ecs.draw[5000]")
+def bench_ecs_draw(seed):
+    survivors = _survivors(seed, 5000)
+    screen = pygame.Surface((1024, 768))
+    frames = 200
+
+    def run():
+        for _ in range(frames):
+            survivors.draw(screen, 0.5)
+    return frames, run
+
+
+@benchmark("ui.draw")
+def bench_ui_draw(seed):
+    ui = UI(1024, 768)
+    screen = pygame.Surface((1024, 768))
+    player = Player(512, 384)
+    resources = ResourceManager(GameRNG(seed))
+    frames = 500
+
+    def run():
+        for frame in range(frames):
+            # Change a value now and then, as a running game does
+            player.health = 100 - (frame // 50)
+            ui.draw(screen, player, resources, 1 + frame // 100)
+    return frames, run
+
+
+@benchmark("event_manager.trigger_random_event")
+def bench_event_manager(seed):
+    rng = GameRNG(seed)
+    events = EventManager(rng.stream("events"))
+    resources = ResourceManager(rng.stream("resources"))
+    player = Player(512, 384)
+    triggers = 20000
+
+    def run():
+        for _ in range(triggers):
+            events.trigger_random_event(player, resources)
+    return triggers, run
+
+
+def run_benchmarks(pattern: Optional[str] = None, repeat: int = 5, seed: int = 1234) -> Dict:
+    """Run every matching benchmark `repeat` times and collect per-operation timings"""
+    results = {}
+    for name, setup in BENCHMARKS:
+        if pattern and pattern not in name:
+            continue
+        timings = []
+        for _ in range(repeat):
+            operations, run = setup(seed)
+            start = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - start) / operations)
+        median = statistics.median(timings)
+        results[name] = {
+            "operations": operations,
+            "repeat": repeat,
+            "median_seconds": median,
+            "min_seconds": min(timings),
+            "ops_per_second": 1.0 / median if median > 0 else float("inf"),
+        }
+        print(f"{name:<45} {median * 1e6:>12.2f} us/op")
+    return results
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def pinned_versions(path: str = REQUIREMENTS_PATH) -> Dict[str, str]:
+    """Package versions pinned with == in requirements.txt"""
+    pins = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                name, _, version = line.split("#")[0].strip().partition("==")
+                if version:
+                    pins[name.strip().lower()] = version.strip()
+    return pins
+
+
+def environment_differences(expected: Dict[str, str], actual: Dict[str, str]) -> List[str]:
+    """Keys both environments have but with different values, as readable lines"""
+    return [f"{key}: {expected[key]} vs {actual[key]}"
+            for key in expected if key in actual and expected[key] != actual[key]]
+
+
+def warn_environment(what: str, differences: List[str]):
+    if differences:
+        print(f"\nWARNING: {what}:")
+        for line in differences:
+            print(f"  {line}")
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Names of benchmarks more than `tolerance` slower than the baseline"""
+    regressions = []
+    print()
+    for name, result in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            print(f"{name:<45} (no baseline)")
+            continue
+        ratio = result["median_seconds"] / reference["median_seconds"]
+        flag = "REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"{name:<45} {ratio:>7.2f}x baseline {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument("--filter", default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default=None, help="write results as JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline before failing")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    results = run_benchmarks(args.filter, args.repeat, args.seed)
+    report = {"environment": environment(), "seed": args.seed, "results": results}
+    warn_environment("installed packages differ from the versions pinned in requirements.txt",
+                     environment_differences(pinned_versions(), report["environment"]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    warn_environment("the baseline was recorded in another environment, so ratios include that difference",
+                     environment_differences(baseline.get("environment", {}), report["environment"]))
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the baseline")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
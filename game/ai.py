@@ -0,0 +1,456 @@
+"""
+Monte Carlo tree search survivor AI
+Decisions are searched on SurvivorModel, a plain copy of the GameState
+rules that walks a whole decision step of frames in closed form and
+resolves events through the game's own EventCatalog. Search statistics
+live in a transposition table keyed on a discretized state, so states
+reached along different paths share them and they carry over from one
+decision to the next. Every decision stops at a fixed time budget so the
+AI can play live inside the frame loop; searching on a process pool as
+well is optional
+"""
+
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+from .core_game import GameState
+from .rng import GameRNG, derive_seed
+from .simulation import BatchReport, DEFAULT_DT
+
+# Actions outside of events; during an event the actions are its choice ids
+WALK = "walk"
+REST = "rest"
+MOVES = (WALK, REST)
+
+# Seconds of game time per day, as in GameState.update
+DAY_SECONDS = 60
+
+# Pool workers stop this long before the deadline to send their results back
+RESULT_MARGIN = 0.001
+
+
+class SurvivorModel:
+    """The rules of a GameState (or compatible class) for fast rollouts
+
+    Daily consumption and daily events run the game class's own
+    advance_day; walking a step of frames and rolling for an encounter
+    during it are done in closed form.
+    """
+
+    def __init__(self, state, rng: GameRNG, frames: int, speed: float, dt: float):
+        self.rules = type(state)
+        self.CATALOG = state.CATALOG
+        self.rng = rng
+        self.frames = frames
+        self.speed = speed
+        self.step_seconds = frames * dt
+        # Chance of at least one encounter roll succeeding during a step
+        self.encounter_chance = 1 - (1 - state.ENCOUNTER_CHANCE) ** frames
+        self.encounters = self.CATALOG.choice_ids()
+
+        self.day = state.day
+        self.time_passed = state.time_passed
+        self.player_health = state.player_health
+        self.player_stamina = state.player_stamina
+        self.player_morale = getattr(state, "player_morale", 100)
+        self.food = state.food
+        self.water = state.water
+        self.medicine = state.medicine
+        self.fuel = state.fuel
+        self.weapons = state.weapons
+        self.distance_traveled = state.distance_traveled
+        self.target_distance = state.target_distance
+        self.player_alive = state.player_alive
+        self.victory = state.victory
+        event = state.current_event
+        self.event = tuple(choice["id"] for choice in event["choices"]) if event else None
+
+    def copy(self) -> "SurvivorModel":
+        copy = object.__new__(SurvivorModel)
+        copy.__dict__.update(self.__dict__)
+        return copy
+
+    @property
+    def finished(self) -> bool:
+        return self.victory or not self.player_alive
+
+    def actions(self) -> Tuple[str, ...]:
+        if self.finished:
+            return ()
+        return self.event or MOVES
+
+    def apply(self, action: str):
+        """Resolve the pending event with `action`, or walk or rest for one step"""
+        if self.event is not None:
+            self.CATALOG.resolve(self, action, self.rng)
+            self.event = None
+        elif action == REST:
+            self.player_stamina = min(100, self.player_stamina + 20)
+            self.advance_day()
+        else:
+            self.walk()
+
+        if self.player_health <= 0:
+            self.player_alive = False
+        if self.distance_traveled >= self.target_distance:
+            self.victory = True
+
+    def walk(self):
+        """`frames` move_player(speed, 0) calls and update(dt) ticks"""
+        frames, step = self.frames, self.speed
+        self.distance_traveled += step * 0.1 * frames
+        drain = step * 0.01
+        if self.player_stamina - frames * drain >= 0:
+            self.player_stamina -= frames * drain
+        else:
+            exhausted_from = max(1, int(self.player_stamina // drain) + 1)
+            self.player_stamina = 0
+            self.player_health -= 0.5 * (frames - exhausted_from + 1)
+
+        self.time_passed += self.step_seconds
+        if self.time_passed >= DAY_SECONDS:
+            self.advance_day()
+            self.time_passed = 0
+        if self.rng.random() < self.encounter_chance:
+            self.event = self.rng.choice(self.encounters)
+
+    def advance_day(self):
+        self.rules.advance_day(self)
+
+    def trigger_daily_event(self):
+        self.CATALOG.daily_event(self, self.rng)
+
+    def evaluate(self) -> float:
+        """Value in [0, 1]: 1 for reaching safety, 0 for death"""
+        if self.victory:
+            return 1.0
+        if not self.player_alive:
+            return 0.0
+        progress = min(1.0, self.distance_traveled / self.target_distance)
+        health = min(1.0, self.player_health / 100)
+        # Days the scarcer of food and water lasts at the mean daily consumption
+        supplies = min(1.0, min(self.food / 5, self.water / 7.5) / 10)
+        return 0.1 + 0.4 * progress + 0.3 * health + 0.1 * supplies
+
+    def key(self) -> Tuple:
+        """Discretized state for the transposition table"""
+        return (self.event, self.day,
+                int(self.player_health) // 10, int(self.player_stamina) // 20,
+                self.food // 10, self.water // 10, min(self.medicine, 3),
+                self.fuel // 5, min(self.weapons, 3),
+                int(self.distance_traveled * 20 / self.target_distance),
+                int(self.time_passed // 15))
+
+
+class Node:
+    """Search statistics of one discretized state"""
+
+    __slots__ = ("actions", "visits", "counts", "values")
+
+    def __init__(self, actions: Tuple[str, ...]):
+        self.actions = actions
+        self.visits = 0
+        self.counts = [0] * len(actions)
+        self.values = [0.0] * len(actions)
+
+
+class SurvivorAI:
+    """Chooses event options and walk/rest actions for a GameState by MCTS
+
+    Each decision searches for `budget` seconds, or for exactly
+    `iterations` iterations when given (reproducible but not time bound).
+    With `workers`, the same search also runs in that many processes and
+    the root statistics of those that finish within the budget are merged.
+    Set decision_times to a list to record how long each decision took.
+    """
+
+    def __init__(self, budget: float = 0.005, iterations: Optional[int] = None,
+                 step_frames: int = 300, speed: float = 3.0, dt: float = DEFAULT_DT,
+                 horizon: int = 24, exploration: float = 1.0, max_nodes: int = 200000,
+                 workers: int = 0, seed: Optional[int] = None):
+        self.budget = budget
+        self.iterations = iterations
+        self.step_frames = step_frames
+        self.speed = speed
+        self.dt = dt
+        self.horizon = horizon
+        self.exploration = exploration
+        self.max_nodes = max_nodes
+        self.workers = workers
+        self.seed = seed
+        # Rollouts draw from their own stream and never touch the game's RNG
+        self.rng = GameRNG(seed)
+        self.table: Dict[Tuple, Node] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Decisions handed to the pool so far; worker seeds derive from it
+        self._submitted = 0
+        # Recent cost of collecting and merging worker results, which the
+        # local search leaves room for
+        self._merge_time = 0.0
+        # Frames left of the current walk step when playing live
+        self._walk_frames = 0
+        self.decision_times: Optional[List[float]] = None
+
+    def options(self) -> Dict:
+        """Constructor arguments of an equivalent in-process search"""
+        return {"budget": self.budget, "iterations": self.iterations,
+                "step_frames": self.step_frames, "speed": self.speed, "dt": self.dt,
+                "horizon": self.horizon, "exploration": self.exploration,
+                "max_nodes": self.max_nodes}
+
+    def model(self, state) -> SurvivorModel:
+        return SurvivorModel(state, self.rng, self.step_frames, self.speed, self.dt)
+
+    def decide(self, state) -> str:
+        """Best action for `state`: a choice id during an event, else WALK or REST"""
+        if self.decision_times is None:
+            return self.best_action(self.model(state))
+        start = time.perf_counter()
+        action = self.best_action(self.model(state))
+        self.decision_times.append(time.perf_counter() - start)
+        return action
+
+    def best_action(self, model: SurvivorModel) -> str:
+        actions = model.actions()
+        if len(actions) < 2:
+            return actions[0] if actions else REST
+
+        # Monotonic time is shared by all processes, so workers can keep to it
+        deadline = time.monotonic() + self.budget
+        futures = []
+        if self.workers:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                                 initargs=(self.options(),))
+            shared = model.__dict__.copy()
+            del shared["rng"]
+            # Seeds follow the submission, not the process that happens to run it
+            seeds = [derive_seed(self.seed, f"decision-{self._submitted}/worker-{index}")
+                     if self.seed is not None else None for index in range(self.workers)]
+            self._submitted += 1
+            futures = [self._pool.submit(_search_worker, shared, deadline - RESULT_MARGIN, seed)
+                       for seed in seeds]
+
+        search_deadline = deadline - self._merge_time if futures else deadline
+        counts = dict(zip(actions, self.search(model, search_deadline).counts))
+        if futures:
+            start = time.monotonic()
+            # A fixed iteration count waits for every worker; a time budget
+            # drops the ones whose results have not arrived by the deadline
+            timeout = None if self.iterations is not None else max(0.0, deadline - start)
+            done, _ = wait(futures, timeout)
+            for future in futures:
+                if future in done:
+                    for action, count in future.result().items():
+                        counts[action] += count
+            # Follow increases at once and decreases slowly
+            self._merge_time = max(time.monotonic() - start, 0.9 * self._merge_time)
+        return max(actions, key=counts.__getitem__)
+
+    def search(self, model: SurvivorModel, deadline: Optional[float] = None) -> Node:
+        """Run MCTS iterations from `model` until `deadline` (time.monotonic)
+
+        Returns the root node of `model`.
+        """
+        if len(self.table) > self.max_nodes:
+            self.table.clear()
+        key = model.key()
+        root = self.table.get(key)
+        if root is None:
+            root = self.table[key] = Node(model.actions())
+
+        if self.iterations is not None:
+            for _ in range(self.iterations):
+                self.iterate(model, root)
+        else:
+            clock = time.monotonic
+            start = clock()
+            if deadline is None:
+                deadline = start + self.budget
+            done = 0
+            while True:
+                self.iterate(model, root)
+                done += 1
+                now = clock()
+                # Stop when one more average iteration would overrun the budget
+                if now + (now - start) / done > deadline:
+                    break
+        return root
+
+    def iterate(self, root_model: SurvivorModel, node: Node):
+        """Select down the table, expand one state, roll out and back up"""
+        table = self.table
+        model = root_model.copy()
+        path = []
+        depth = 0
+        while True:
+            index = self.select(node)
+            path.append((node, index))
+            model.apply(node.actions[index])
+            depth += 1
+            if model.finished or depth >= self.horizon:
+                value = model.evaluate()
+                break
+            key = model.key()
+            child = table.get(key)
+            if child is None:
+                table[key] = Node(model.actions())
+                value = self.rollout(model, self.horizon - depth)
+                break
+            node = child
+
+        for node, index in path:
+            node.visits += 1
+            node.counts[index] += 1
+            node.values[index] += value
+
+    def select(self, node: Node) -> int:
+        """UCB1, trying every action once first"""
+        counts = node.counts
+        if 0 in counts:
+            return counts.index(0)
+        values = node.values
+        scale = self.exploration * math.sqrt(math.log(node.visits))
+        best, best_score = 0, -1.0
+        for index, count in enumerate(counts):
+            score = values[index] / count + scale / math.sqrt(count)
+            if score > best_score:
+                best, best_score = index, score
+        return best
+
+    def rollout(self, model: SurvivorModel, steps: int) -> float:
+        """Play the default policy for up to `steps` steps and evaluate"""
+        rng = self.rng
+        walk_cost = self.speed * 0.01 * self.step_frames
+        for _ in range(steps):
+            if model.finished:
+                break
+            if model.event is not None:
+                action = rng.choice(model.event)
+            elif model.player_stamina >= walk_cost and rng.random() < 0.9:
+                action = WALK
+            else:
+                action = REST
+            model.apply(action)
+        return model.evaluate()
+
+    def play(self, state):
+        """Make this frame's inputs for `state`; call before state.update(dt)"""
+        if state.game_over or state.victory:
+            return
+        if state.current_event:
+            state.handle_event_choice(self.decide(state))
+            return
+        if self._walk_frames <= 0:
+            if self.decide(state) == REST:
+                state.rest()
+                return
+            self._walk_frames = self.step_frames
+        self._walk_frames -= 1
+        state.move_player(self.speed, 0.0)
+
+    def choice_policy(self, state, event: Dict, rng: GameRNG) -> str:
+        """Event choices for HeadlessSimulator(choice_policy=...)"""
+        return self.decide(state)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+class RandomSurvivor(SurvivorAI):
+    """Uniformly random decisions, like EventManager.auto_resolve_encounter"""
+
+    def best_action(self, model: SurvivorModel) -> str:
+        actions = model.actions()
+        return self.rng.choice(actions) if actions else REST
+
+
+# Search of each pool worker
+_worker_ai: Optional[SurvivorAI] = None
+
+
+def _init_worker(options: Dict):
+    global _worker_ai
+    _worker_ai = SurvivorAI(**options)
+
+
+def _search_worker(shared: Dict, deadline: float, seed: Optional[int]) -> Dict[str, int]:
+    # Any process may run any submission, so each search starts from its
+    # own seed and an empty table
+    _worker_ai.rng = GameRNG(seed)
+    _worker_ai.table.clear()
+    model = object.__new__(SurvivorModel)
+    model.__dict__.update(shared)
+    model.rng = _worker_ai.rng
+    root = _worker_ai.search(model, deadline)
+    return dict(zip(root.actions, root.counts))
+
+
+def run_game(ai: SurvivorAI, seed: int, max_days: int = 30, dt: float = DEFAULT_DT) -> Dict:
+    """Play one GameState frame by frame with `ai` making every decision"""
+    state = GameState(GameRNG(seed))
+    decision_times: List[float] = []
+    ai.decision_times = decision_times
+    ai._walk_frames = 0
+    try:
+        while not (state.game_over or state.victory) and state.day <= max_days:
+            ai.play(state)
+            state.update(dt)
+    finally:
+        ai.decision_times = None
+
+    if state.victory:
+        cause = "victory"
+    elif state.game_over:
+        cause = "death"
+    else:
+        cause = "timeout"
+    return {"days": state.day, "victory": state.victory, "alive": state.player_alive,
+            "cause": cause, "decisions": decision_times}
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play Death Game with the MCTS survivor AI")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--budget", type=float, default=0.005, help="seconds per decision")
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--max-days", type=int, default=30)
+    parser.add_argument("--random", action="store_true", help="decide uniformly at random instead")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    ai_class = RandomSurvivor if args.random else SurvivorAI
+    ai = ai_class(budget=args.budget, workers=args.workers, seed=args.seed)
+    report = BatchReport()
+    decisions: List[float] = []
+    start = time.perf_counter()
+    try:
+        for run in range(args.runs):
+            result = run_game(ai, derive_seed(args.seed, f"game-{run}"), args.max_days)
+            decisions.extend(result.pop("decisions"))
+            report.add(result)
+    finally:
+        ai.close()
+    report.elapsed = time.perf_counter() - start
+
+    summary = report.summary()
+    print(f"Runs:         {summary['runs']}")
+    print(f"Victory rate: {summary['victory_rate']:.1%}")
+    print(f"Mean days:    {summary['mean_days']:.2f}")
+    for cause, count in summary["causes"].items():
+        print(f"  {cause:<20} {count}")
+    if decisions:
+        decisions.sort()
+        print(f"Decisions:    {len(decisions)}, "
+              f"mean {sum(decisions) / len(decisions) * 1000:.2f} ms, "
+              f"p99 {decisions[int(len(decisions) * 0.99)] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
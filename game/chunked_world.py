@@ -0,0 +1,331 @@
+"""
+Chunked streaming world for long journeys
+The world is split into fixed-size square chunks. Each chunk's terrain is
+cut from one seeded noise field and its hazards come from a seed derived
+from the terrain seed and the chunk coordinates, so an untouched chunk
+can be dropped and regenerated identically later. Loaded chunks live in
+an LRU cache of bounded size; chunks with edited tiles or changed hazards
+are parked in an overflow dict when evicted, so their changes survive.
+Storm drift is not a change: the storms of an evicted chunk start again
+from their seeded positions, which keeps memory flat on long journeys.
+The chunks around the focus form the active window, which fills the
+usual World attributes (terrain_grid, terrain_surface, hazards) so the
+rest of the game can use a ChunkedWorld in place of a World
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pygame
+
+from .rng import GameRNG, derive_seed
+from .hazards import HAZARD_CODES, STORM
+from .terrain import Terrain, generate_terrain_codes, terrain_code
+from .world import World, HAZARD_TYPES, MAX_HAZARD_RADIUS
+
+
+class Chunk:
+    """Terrain tiles and hazards of one square region of the world"""
+
+    def __init__(self, cx: int, cy: int, terrain_grid: np.ndarray, hazards: Tuple[np.ndarray, ...]):
+        self.cx = cx
+        self.cy = cy
+        self.terrain_grid = terrain_grid
+        # Hazard columns (x, y, type, radius, active) in HazardSet.add_many order
+        self.hazards = hazards
+        self.surface = None
+        # Set once the tiles or hazards (other than storm positions) differ
+        # from what the seed generates
+        self.modified = False
+
+
+class ChunkedWorld(World):
+    """World of lazily generated chunks kept in an LRU cache
+
+    width and height are the viewport size; the world itself is unbounded.
+    terrain_grid, terrain_surface and hazards hold the active window, the
+    chunks within load_radius of the focus plus every chunk on screen.
+    """
+
+    def __init__(self, width, height, rng=None, chunk_tiles: int = 16, max_chunks: int = 32,
+                 load_radius: int = 1):
+        self.chunk_tiles = chunk_tiles
+        self.load_radius = load_radius
+        self.max_chunks = max_chunks
+        self.chunks: "OrderedDict[Tuple[int, int], Chunk]" = OrderedDict()
+        # Evicted chunks that could not be regenerated from their seed
+        self.evicted: Dict[Tuple[int, int], Chunk] = {}
+        self.chunks_generated = 0
+
+        # Chunk range (cx0, cy0, cx1, cy1) of the active window, and each
+        # window chunk with the slice of self.hazards holding its hazards
+        self.window = None
+        self.window_chunks: Dict[Tuple[int, int], Tuple[Chunk, slice]] = {}
+
+        # Top-left corner of the viewport in world coordinates
+        self.camera_x = 0.0
+        self.camera_y = 0.0
+        super().__init__(width, height, rng)
+
+    @property
+    def chunk_size(self) -> int:
+        return self.chunk_tiles * self.terrain_size
+
+    def chunk_coords(self, x: float, y: float) -> Tuple[int, int]:
+        return int(x // self.chunk_size), int(y // self.chunk_size)
+
+    def generate_terrain(self):
+        # Terrain is generated per chunk on demand
+        if self.chunk_size < MAX_HAZARD_RADIUS:
+            raise ValueError("Chunks must be larger than the biggest hazard radius")
+        self.terrain_seed = self.rng.randint(0, 2**63 - 1)
+        self.chunks.clear()
+        self.evicted.clear()
+        self.window = None
+        self.window_chunks = {}
+        self.load_window()
+
+    def generate_hazards(self):
+        # Hazards come with their chunks
+        pass
+
+    def get_chunk(self, cx: int, cy: int) -> Chunk:
+        """Return a chunk, generating it on a cache miss and evicting the least recently used"""
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+
+        chunk = self.evicted.pop(key, None)
+        if chunk is None:
+            chunk = self.generate_chunk(cx, cy)
+            self.chunks_generated += 1
+        self.chunks[key] = chunk
+        self.evict()
+        return chunk
+
+    def evict(self):
+        """Drop the least recently used chunks outside the window beyond max_chunks"""
+        # The window and every chunk on screen must fit at once
+        limit = max(self.max_chunks, len(self.window_chunks))
+        for key in list(self.chunks):
+            if len(self.chunks) <= limit:
+                break
+            if key in self.window_chunks:
+                continue
+            chunk = self.chunks.pop(key)
+            if chunk.modified:
+                chunk.surface = None
+                self.evicted[key] = chunk
+
+    def generate_chunk(self, cx: int, cy: int) -> Chunk:
+        """Build a chunk from its own seed so it is identical every time it is loaded"""
+        # One noise field spans every chunk, so terrain continues across edges
+        terrain_grid = generate_terrain_codes(self.chunk_tiles, self.chunk_tiles, self.terrain_seed,
+                                              cx * self.chunk_tiles, cy * self.chunk_tiles)
+        rng = GameRNG(derive_seed(self.terrain_seed, f"chunk:{cx},{cy}"))
+
+        # Same hazard density per screen area as the fixed World
+        left, top = cx * self.chunk_size, cy * self.chunk_size
+        rows = []
+        for _ in range(rng.randint(2, 8)):
+            x = left + rng.randint(0, self.chunk_size - 1)
+            y = top + rng.randint(0, self.chunk_size - 1)
+            rows.append((x, y, HAZARD_CODES[rng.choice(HAZARD_TYPES)], rng.randint(30, MAX_HAZARD_RADIUS)))
+        x, y, types, radius = zip(*rows)
+        hazards = (np.array(x, dtype=np.float64), np.array(y, dtype=np.float64),
+                   np.array(types, dtype=np.uint8), np.array(radius, dtype=np.float64),
+                   np.ones(len(rows), dtype=np.bool_))
+        return Chunk(cx, cy, terrain_grid, hazards)
+
+    def window_range(self) -> Tuple[int, int, int, int]:
+        """Chunk range (cx0, cy0, cx1, cy1) around the focus and the viewport"""
+        radius = self.load_radius
+        focus_cx, focus_cy = self.chunk_coords(self.camera_x + self.width / 2,
+                                               self.camera_y + self.height / 2)
+        first_cx, first_cy = self.chunk_coords(self.camera_x, self.camera_y)
+        last_cx, last_cy = self.chunk_coords(self.camera_x + self.width, self.camera_y + self.height)
+        return (min(focus_cx - radius, first_cx), min(focus_cy - radius, first_cy),
+                max(focus_cx + radius, last_cx), max(focus_cy + radius, last_cy))
+
+    def load_window(self):
+        """Make the chunks around the focus the active window, if they changed"""
+        window = self.window_range()
+        if window == self.window:
+            return
+        self.store_window()
+
+        cx0, cy0, cx1, cy1 = window
+        tiles = self.chunk_tiles
+        self.window = window
+        self.window_chunks = {}
+        self.terrain_grid = np.empty(((cy1 - cy0 + 1) * tiles, (cx1 - cx0 + 1) * tiles), dtype=np.uint8)
+        self.hazards.clear()
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                chunk = self.get_chunk(cx, cy)
+                row, col = (cy - cy0) * tiles, (cx - cx0) * tiles
+                self.terrain_grid[row:row + tiles, col:col + tiles] = chunk.terrain_grid
+                start = len(self.hazards)
+                self.hazards.add_many(*chunk.hazards)
+                self.window_chunks[(cx, cy)] = (chunk, slice(start, len(self.hazards)))
+        self.terrain_dirty = True
+
+    def store_window(self):
+        """Copy tile edits and hazard changes of the window back into its chunks"""
+        hazards = self.hazards
+        for chunk, rows in self.window_chunks.values():
+            grid = self.window_tiles(chunk.cx, chunk.cy)
+            if not np.array_equal(grid, chunk.terrain_grid):
+                chunk.terrain_grid = grid.copy()
+                chunk.surface = None
+                chunk.modified = True
+            columns = (hazards.x[rows], hazards.y[rows], hazards.type[rows],
+                       hazards.radius[rows], hazards.active[rows])
+            # Drifted storms are kept while the chunk is cached but do not
+            # make it worth parking
+            if not all(np.array_equal(new, old) for new, old in zip(columns[2:], chunk.hazards[2:])):
+                chunk.modified = True
+            chunk.hazards = tuple(column.copy() for column in columns)
+
+    def window_tiles(self, cx: int, cy: int) -> np.ndarray:
+        """View of terrain_grid covering one chunk of the window"""
+        tiles = self.chunk_tiles
+        row, col = (cy - self.window[1]) * tiles, (cx - self.window[0]) * tiles
+        return self.terrain_grid[row:row + tiles, col:col + tiles]
+
+    def chunk_terrain(self, cx: int, cy: int) -> np.ndarray:
+        """Current tiles of a chunk; chunks that are not loaded are read from the noise field"""
+        if (cx, cy) in self.window_chunks:
+            return self.window_tiles(cx, cy)
+        chunk = self.chunks.get((cx, cy)) or self.evicted.get((cx, cy))
+        if chunk is not None:
+            return chunk.terrain_grid
+        tiles = self.chunk_tiles
+        return generate_terrain_codes(tiles, tiles, self.terrain_seed, cx * tiles, cy * tiles)
+
+    def chunk_state(self) -> Tuple[List[Chunk], List[Chunk]]:
+        """Cached chunks from least to most recently used, and parked chunks in grid order"""
+        self.store_window()
+        parked = sorted(self.evicted.values(), key=lambda chunk: (chunk.cy, chunk.cx))
+        return list(self.chunks.values()), parked
+
+    def restore_chunks(self, cached: List[Chunk], parked: List[Chunk]):
+        """Replace all chunk state and reload the window around the camera"""
+        self.chunks = OrderedDict(((chunk.cx, chunk.cy), chunk) for chunk in cached)
+        self.evicted = {(chunk.cx, chunk.cy): chunk for chunk in parked}
+        self.window = None
+        self.window_chunks = {}
+        self.load_window()
+        # Loading the window touched its chunks; put the cache back in its saved order
+        for chunk in cached:
+            self.chunks.move_to_end((chunk.cx, chunk.cy))
+
+    def get_bounds(self):
+        left, top = self.window[0] * self.chunk_size, self.window[1] * self.chunk_size
+        rows, cols = self.terrain_grid.shape
+        return left, top, left + cols * self.terrain_size, top + rows * self.terrain_size
+
+    def screen_offset(self):
+        return -int(self.camera_x), -int(self.camera_y)
+
+    def center_on(self, x: float, y: float):
+        """Move the viewport so that (x, y) is in the middle of the screen"""
+        self.camera_x = x - self.width / 2
+        self.camera_y = y - self.height / 2
+
+    def set_terrain(self, row, col, terrain_type):
+        """Change a single tile given in world tile coordinates"""
+        cx, local_col = divmod(col, self.chunk_tiles)
+        cy, local_row = divmod(row, self.chunk_tiles)
+        if (cx, cy) in self.window_chunks:
+            self.window_tiles(cx, cy)[local_row, local_col] = terrain_code(terrain_type)
+            self.terrain_dirty = True
+            return
+        chunk = self.get_chunk(cx, cy)
+        chunk.terrain_grid[local_row, local_col] = terrain_code(terrain_type)
+        chunk.surface = None
+        chunk.modified = True
+
+    def update(self, step_scale=1.0, focus=None):
+        # Stream in the chunks around the player before they come on screen
+        if focus is not None:
+            self.center_on(*focus)
+        self.load_window()
+
+        # Storms of the window drift, each staying inside its own chunk
+        hazards = self.hazards
+        storms = hazards.type == STORM
+        size = self.chunk_size
+        left = np.floor(hazards.x[storms] / size) * size
+        top = np.floor(hazards.y[storms] / size) * size
+        hazards.drift_storms(self.rng.numpy(), step_scale, (left, top, left + size - 1, top + size - 1))
+
+    def bake_terrain(self):
+        """Compose the window background from per-chunk surfaces"""
+        # Edited tiles go back to their chunks first so stale surfaces are dropped
+        self.store_window()
+        cx0, cy0 = self.window[0], self.window[1]
+        rows, cols = self.terrain_grid.shape
+        size = self.terrain_size
+        self.terrain_surface = pygame.Surface((cols * size, rows * size))
+        for chunk, _ in self.window_chunks.values():
+            if chunk.surface is None:
+                chunk.surface = self.render_terrain(chunk.terrain_grid)
+            self.terrain_surface.blit(chunk.surface, ((chunk.cx - cx0) * self.chunk_size,
+                                                      (chunk.cy - cy0) * self.chunk_size))
+        if pygame.display.get_surface() is not None:
+            self.terrain_surface = self.terrain_surface.convert()
+        self.terrain_dirty = False
+        return self.terrain_surface
+
+    def draw(self, screen):
+        # The camera scrolls, so every draw covers the whole screen
+        self.load_window()
+        if self.terrain_dirty or self.terrain_surface is None:
+            self.bake_terrain()
+        left, top, _, _ = self.get_bounds()
+        offset = self.screen_offset()
+        screen.blit(self.terrain_surface, (left + offset[0], top + offset[1]))
+        return self.draw_hazards(screen, self.hazards, offset)
+
+    def restore(self, screen, rect):
+        """Redraw the background terrain over one region of the screen"""
+        if self.terrain_dirty or self.terrain_surface is None:
+            self.bake_terrain()
+        left, top, _, _ = self.get_bounds()
+        offset = self.screen_offset()
+        area = pygame.Rect(rect).move(-left - offset[0], -top - offset[1])
+        return screen.blit(self.terrain_surface, rect, area)
+
+    def get_terrain_code_at(self, x, y):
+        col, row = int(x // self.terrain_size), int(y // self.terrain_size)
+        cx, local_col = divmod(col, self.chunk_tiles)
+        cy, local_row = divmod(row, self.chunk_tiles)
+        return Terrain(self.chunk_terrain(cx, cy)[local_row, local_col])
+
+    def count_terrain_in_radius(self, x, y, radius, terrain_type):
+        """Number of tiles of a terrain type whose centers lie within radius of (x, y)"""
+        size = self.terrain_size
+        col0, row0 = int((x - radius) // size), int((y - radius) // size)
+        cols = int((x + radius) // size) + 1 - col0
+        rows = int((y + radius) // size) + 1 - row0
+
+        # Copy the covered part of every overlapping chunk into one block
+        block = np.empty((rows, cols), dtype=np.uint8)
+        tiles = self.chunk_tiles
+        for cy in range(row0 // tiles, (row0 + rows - 1) // tiles + 1):
+            for cx in range(col0 // tiles, (col0 + cols - 1) // tiles + 1):
+                grid = self.chunk_terrain(cx, cy)
+                top, left = max(row0, cy * tiles), max(col0, cx * tiles)
+                bottom = min(row0 + rows, (cy + 1) * tiles)
+                right = min(col0 + cols, (cx + 1) * tiles)
+                block[top - row0:bottom - row0, left - col0:right - col0] = \
+                    grid[top - cy * tiles:bottom - cy * tiles, left - cx * tiles:right - cx * tiles]
+
+        centers_x = (np.arange(col0, col0 + cols) + 0.5) * size - x
+        centers_y = (np.arange(row0, row0 + rows) + 0.5) * size - y
+        inside = centers_x[None, :] ** 2 + centers_y[:, None] ** 2 <= radius * radius
+        return int(np.count_nonzero(inside & (block == terrain_code(terrain_type))))
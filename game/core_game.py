@@ -4,18 +4,69 @@ This module contains the game state and logic that can be shared
 between desktop (Pygame) and mobile (Kivy) versions
 """
 
-import random
 import time
 from typing import Dict, List, Tuple, Optional
 
+from .event_catalog import DEFAULT_CATALOG
+from .replay import InputLog
+from .rng import GameRNG
+from .scheduler import EventScheduler
+
 class GameState:
     """Core game state that's independent of the UI framework"""
     
-    def __init__(self):
+    # Chance of a random encounter on each update() call
+    ENCOUNTER_CHANCE = 1 / 1000
+    
+    # Encounters, daily events and compiled choice effects
+    CATALOG = DEFAULT_CATALOG
+    
+    def __init__(self, rng: Optional[GameRNG] = None, record: bool = False):
+        # All randomness goes through this stream so runs can be replayed
+        self.rng = rng or GameRNG()
+        self.scheduler = EventScheduler(self.rng)
+        # With record set, every session's inputs go to a fresh InputLog
+        self.record = record
+        self.input_log: Optional[InputLog] = None
         self.reset_game()
     
+    def fork(self) -> "GameState":
+        """Independent copy of this game, RNG position included
+
+        Scalars are copied, the catalog and current event are shared and
+        the RNG state is shared until one side draws. Forks do not record
+        inputs.
+        """
+        return self.forks(1)[0]
+    
+    def forks(self, count: int) -> List["GameState"]:
+        """`count` forks sharing one captured RNG state"""
+        copies = []
+        for rng in self.rng.forks(count):
+            copy = object.__new__(type(self))
+            copy.__dict__.update(self.__dict__)
+            copy.rng = rng
+            copy.scheduler = self.scheduler.fork(rng)
+            copy.record = False
+            copy.input_log = None
+            copies.append(copy)
+        return copies
+    
+    def restore(self, other: "GameState"):
+        """Return to the state of `other`, usually a fork taken earlier"""
+        rng, scheduler = self.rng, self.scheduler
+        record, input_log = self.record, self.input_log
+        self.__dict__.update(other.__dict__)
+        self.rng, self.scheduler = rng, scheduler
+        self.record, self.input_log = record, input_log
+        rng.restore(other.rng)
+        scheduler.restore(other.scheduler)
+    
     def reset_game(self):
         """Reset game to initial state"""
+        if self.record:
+            self.input_log = InputLog.start(self.rng)
+        
         self.day = 1
         self.time_passed = 0
         self.game_over = False
@@ -46,9 +97,16 @@ class GameState:
         self.deaths_from_disease = 0
         self.deaths_from_violence = 0
         self.total_events_faced = 0
+        
+        # Encounter rolls are sampled ahead of time instead of every frame
+        self.scheduler.clear()
+        self.scheduler.schedule_chance("encounter", self.ENCOUNTER_CHANCE)
     
     def update(self, dt: float):
         """Update game state - call this every frame"""
+        if self.input_log is not None:
+            self.input_log.tick(dt)
+        
         if self.game_over or not self.player_alive:
             return
         
@@ -61,7 +119,7 @@ class GameState:
             self.time_passed = 0
         
         # Check for random events
-        if random.randint(1, 1000) == 1:
+        if "encounter" in self.scheduler.advance():
             self.trigger_random_event()
         
         # Check death conditions
@@ -75,6 +133,9 @@ class GameState:
     
     def move_player(self, dx: float, dy: float):
         """Move player and update distance traveled"""
+        if self.input_log is not None:
+            self.input_log.move(dx, dy)
+        
         if not self.player_alive:
             return
             
@@ -93,14 +154,25 @@ class GameState:
             # Exhaustion damages health
             self.player_health -= 0.5
     
+    def rest(self):
+        """Rest for the rest of the day to recover stamina"""
+        if self.input_log is not None:
+            self.input_log.rest()
+        
+        if not self.player_alive:
+            return
+        
+        self.player_stamina = min(100, self.player_stamina + 20)
+        self.advance_day()  # Resting advances time
+    
     def advance_day(self):
         """Advance to next day with resource consumption"""
         self.day += 1
         
         # Daily resource consumption
-        self.food -= random.randint(3, 7)
-        self.water -= random.randint(5, 10)
-        self.fuel -= random.randint(1, 3)
+        self.food -= self.rng.randint(3, 7)
+        self.water -= self.rng.randint(5, 10)
+        self.fuel -= self.rng.randint(1, 3)
         
         # Apply effects of resource shortage
         if self.food <= 0:
@@ -117,111 +189,27 @@ class GameState:
         self.player_stamina = min(100, self.player_stamina + 20)
         
         # Random daily events
-        if random.randint(1, 3) == 1:
+        if self.rng.randint(1, 3) == 1:
             self.trigger_daily_event()
     
     def trigger_random_event(self):
         """Trigger a random encounter"""
-        events = [
-            {
-                "title": "Wild Animal Attack",
-                "description": "A hostile animal blocks your path!",
-                "choices": [
-                    {"text": "Fight it (-health, +food if win)", "id": "fight_animal"},
-                    {"text": "Run away (-stamina)", "id": "flee_animal"},
-                    {"text": "Use weapon (-weapon)", "id": "weapon_animal"}
-                ]
-            },
-            {
-                "title": "Sick Traveler",
-                "description": "You encounter a sick traveler asking for help.",
-                "choices": [
-                    {"text": "Help them (-medicine, +morale)", "id": "help_sick"},
-                    {"text": "Ignore them (-morale)", "id": "ignore_sick"},
-                    {"text": "Rob them (+resources, -morale)", "id": "rob_sick"}
-                ]
-            },
-            {
-                "title": "Resource Cache",
-                "description": "You found an abandoned supply cache!",
-                "choices": [
-                    {"text": "Take everything (+resources)", "id": "take_all"},
-                    {"text": "Take only what you need (+some resources)", "id": "take_some"},
-                    {"text": "Leave it for others (+morale)", "id": "leave_cache"}
-                ]
-            }
-        ]
-        
-        self.current_event = random.choice(events)
+        self.current_event = self.CATALOG.random_encounter(self.rng)
         self.total_events_faced += 1
     
     def trigger_daily_event(self):
         """Trigger a daily event"""
-        daily_events = [
-            "Harsh weather slows your progress",
-            "You found some berries along the way",
-            "A storm damages your supplies",
-            "You met friendly travelers who shared food"
-        ]
-        
-        event = random.choice(daily_events)
-        if "weather" in event or "storm" in event:
-            self.player_health -= random.randint(5, 15)
-            self.fuel -= random.randint(1, 5)
-        elif "berries" in event or "food" in event:
-            self.food += random.randint(2, 8)
+        self.CATALOG.daily_event(self, self.rng)
     
     def handle_event_choice(self, choice_id: str):
         """Handle player's choice for current event"""
+        if self.input_log is not None:
+            self.input_log.choice(choice_id)
+        
         if not self.current_event:
             return
         
-        if choice_id == "fight_animal":
-            if random.randint(1, 2) == 1:  # 50% chance to win
-                self.player_health -= random.randint(10, 25)
-                self.food += random.randint(5, 15)
-            else:
-                self.player_health -= random.randint(20, 40)
-        
-        elif choice_id == "flee_animal":
-            self.player_stamina -= 30
-        
-        elif choice_id == "weapon_animal":
-            if self.weapons > 0:
-                self.weapons -= 1
-                self.food += random.randint(8, 20)
-            else:
-                # No weapon available, fight with bare hands
-                self.player_health -= random.randint(15, 35)
-        
-        elif choice_id == "help_sick":
-            if self.medicine > 0:
-                self.medicine -= 1
-                self.player_morale += 10
-            else:
-                self.player_morale -= 5
-        
-        elif choice_id == "ignore_sick":
-            self.player_morale -= 15
-        
-        elif choice_id == "rob_sick":
-            self.food += random.randint(1, 5)
-            self.water += random.randint(1, 3)
-            self.player_morale -= 25
-        
-        elif choice_id == "take_all":
-            self.food += random.randint(10, 20)
-            self.water += random.randint(5, 15)
-            self.medicine += random.randint(1, 5)
-            self.fuel += random.randint(3, 10)
-        
-        elif choice_id == "take_some":
-            self.food += random.randint(3, 8)
-            self.water += random.randint(2, 6)
-            self.medicine += random.randint(0, 2)
-        
-        elif choice_id == "leave_cache":
-            self.player_morale += 20
+        self.CATALOG.resolve(self, choice_id, self.rng)
         
         # Clear current event
         self.current_event = None
@@ -0,0 +1,589 @@
+"""
+Entity-component system for many concurrent survivors
+Entities are integer ids. Every component is a set of NumPy columns
+indexed by entity id, plus a mask of the entities that have it, and
+systems update all matching entities in one batched pass per step:
+movement, foraging, daily consumption, hazard exposure, vitals and
+rendering. Survivors bundles the store and the systems for GameEngine's
+NPCs
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pygame
+
+from .hazards import HAZARD_TYPES, HazardSet
+from .resource_manager import MAX_AMOUNTS, RESOURCE_NAMES, STARTING_AMOUNTS
+from .terrain import MOVEMENT_COST, Terrain
+
+# Component name -> {column: (dtype, default)}
+COMPONENTS: Dict[str, Dict[str, Tuple[type, object]]] = {
+    # Position, position at the start of the last step (for interpolated
+    # drawing) and unit heading
+    "position": {"x": (np.float64, 0.0), "y": (np.float64, 0.0),
+                 "prev_x": (np.float64, 0.0), "prev_y": (np.float64, 0.0),
+                 "dir_x": (np.float64, 1.0), "dir_y": (np.float64, 0.0)},
+    "stats": {"health": (np.float64, 100.0), "max_health": (np.float64, 100.0),
+              "stamina": (np.float64, 100.0), "morale": (np.float64, 100.0),
+              "speed": (np.float64, 3.0)},
+    "inventory": {name: (np.float64, float(amount))
+                  for name, amount in zip(RESOURCE_NAMES, STARTING_AMOUNTS)},
+    "status": {"alive": (np.bool_, True), "sick": (np.bool_, False),
+               "injured": (np.bool_, False), "exhausted": (np.bool_, False)},
+}
+
+SURVIVOR = tuple(COMPONENTS)
+
+Selection = Union[slice, np.ndarray]
+
+
+class ComponentStore:
+    """Columns of one component, indexed by entity id"""
+
+    def __init__(self, name: str, columns: Dict[str, Tuple[type, object]], capacity: int):
+        self.name = name
+        self.columns = columns
+        self.capacity = 0
+        self.resize(capacity)
+
+    def resize(self, capacity: int):
+        for column, (dtype, default) in self.columns.items():
+            data = np.full(capacity, default, dtype=dtype)
+            if self.capacity:
+                data[:self.capacity] = getattr(self, column)
+            setattr(self, column, data)
+        self.capacity = capacity
+
+    def reset(self, ids: Selection, values: Optional[Dict] = None):
+        """Give entities the default values, then `values` (scalars or per-entity arrays)"""
+        for column, (dtype, default) in self.columns.items():
+            getattr(self, column)[ids] = default
+        for column, value in (values or {}).items():
+            getattr(self, column)[ids] = value
+
+
+class Entities:
+    """Entity ids with array-backed components
+
+    Stores are reachable by component name, e.g. entities.position.x.
+    Destroyed ids are reused by later create() calls.
+    """
+
+    def __init__(self, capacity: int = 1024, components: Dict = COMPONENTS):
+        self.capacity = capacity
+        # Ids below `size` have been handed out at least once
+        self.size = 0
+        self.exists = np.zeros(capacity, dtype=bool)
+        self.stores: Dict[str, ComponentStore] = {}
+        self.has: Dict[str, np.ndarray] = {}
+        for name, columns in components.items():
+            self.stores[name] = ComponentStore(name, columns, capacity)
+            self.has[name] = np.zeros(capacity, dtype=bool)
+            setattr(self, name, self.stores[name])
+        self._free: List[int] = []
+        # Query results stay valid until entities or components change
+        self._queries: Dict[Tuple[str, ...], Selection] = {}
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.exists[:self.size]))
+
+    def _grow(self, needed: int):
+        capacity = max(needed, self.capacity * 2)
+        for store in self.stores.values():
+            store.resize(capacity)
+        for name, mask in list(self.has.items()):
+            self.has[name] = np.concatenate([mask, np.zeros(capacity - self.capacity, dtype=bool)])
+        self.exists = np.concatenate([self.exists, np.zeros(capacity - self.capacity, dtype=bool)])
+        self.capacity = capacity
+
+    def create(self, count: int, components: Sequence[str] = SURVIVOR, **values) -> np.ndarray:
+        """Create `count` entities with `components` and return their ids
+
+        Keyword arguments set columns of those components, e.g. x=array.
+        """
+        reused = self._free[-count:] if count else []
+        del self._free[len(self._free) - len(reused):]
+        start = self.size
+        fresh = count - len(reused)
+        if start + fresh > self.capacity:
+            self._grow(start + fresh)
+        ids = np.concatenate([np.array(reused, dtype=np.int64),
+                              np.arange(start, start + fresh, dtype=np.int64)])
+        self.size += fresh
+
+        self.exists[ids] = True
+        for name in components:
+            store = self.stores[name]
+            self.has[name][ids] = True
+            store.reset(ids, {column: value for column, value in values.items()
+                              if column in store.columns})
+        self._queries.clear()
+        return ids
+
+    def destroy(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        self.exists[ids] = False
+        for mask in self.has.values():
+            mask[ids] = False
+        self._free.extend(ids.tolist())
+        self._queries.clear()
+
+    def add_component(self, ids, name: str, **values):
+        self.has[name][ids] = True
+        self.stores[name].reset(ids, values)
+        self._queries.clear()
+
+    def remove_component(self, ids, name: str):
+        self.has[name][ids] = False
+        self._queries.clear()
+
+    def clear(self):
+        self.destroy(np.flatnonzero(self.exists[:self.size]))
+        self._free.clear()
+        self.size = 0
+
+    def query(self, *names: str) -> Selection:
+        """Ids of the entities that have every named component
+
+        When those are exactly the ids 0..n-1 a slice is returned instead,
+        so systems work on views of the columns rather than copies.
+        """
+        selection = self._queries.get(names)
+        if selection is None:
+            size = self.size
+            mask = self.exists[:size].copy()
+            for name in names:
+                mask &= self.has[name][:size]
+            ids = np.flatnonzero(mask)
+            selection = slice(0, len(ids)) if len(ids) == 0 or ids[-1] == len(ids) - 1 else ids
+            self._queries[names] = selection
+        return selection
+
+
+class System:
+    """One batched pass over the entities
+
+    update() runs every simulation step, new_day() at each day boundary.
+    """
+
+    name = "system"
+
+    def update(self, entities: Entities, step_scale: float = 1.0):
+        pass
+
+    def new_day(self, entities: Entities):
+        pass
+
+
+class MovementSystem(System):
+    """Wandering movement slowed by terrain, injuries and exhaustion"""
+
+    name = "movement"
+
+    # Chance per frame of picking a new heading
+    TURN_CHANCE = 1 / 120
+    INJURED_SPEED = 0.6
+    # Stamina an exhausted survivor recovers per frame while resting, and
+    # the level at which it sets off again
+    REST_RECOVERY = 0.1
+    RESTED = 50.0
+
+    def __init__(self, world, rng: np.random.Generator):
+        self.world = world
+        self.rng = rng
+
+    def update(self, entities, step_scale=1.0):
+        ids = entities.query("position", "stats", "status")
+        position, stats, status = entities.position, entities.stats, entities.status
+        x, y = position.x[ids], position.y[ids]
+        position.prev_x[ids] = x
+        position.prev_y[ids] = y
+        count = len(x)
+        if not count:
+            return
+
+        dir_x, dir_y = position.dir_x[ids], position.dir_y[ids]
+        turning = np.flatnonzero(self.rng.random(count) < self.TURN_CHANCE * step_scale)
+        if len(turning):
+            angle = self.rng.uniform(0, 2 * np.pi, len(turning))
+            dir_x[turning] = np.cos(angle)
+            dir_y[turning] = np.sin(angle)
+
+        world = self.world
+        left, top, right, bottom = world.get_bounds()
+        rows, cols = world.terrain_grid.shape
+        col = np.clip(((x - left) // world.terrain_size).astype(np.intp), 0, cols - 1)
+        row = np.clip(((y - top) // world.terrain_size).astype(np.intp), 0, rows - 1)
+        speed = stats.speed[ids] / MOVEMENT_COST[world.terrain_grid[row, col]]
+        speed[status.injured[ids]] *= self.INJURED_SPEED
+
+        alive = status.alive[ids]
+        exhausted = status.exhausted[ids]
+        walking = alive & ~exhausted
+        step = np.where(walking, speed * step_scale, 0.0)
+        x = x + dir_x * step
+        y = y + dir_y * step
+
+        # Turn around at the edges of the world
+        outside = (x < left) | (x > right)
+        dir_x[outside] = -dir_x[outside]
+        outside = (y < top) | (y > bottom)
+        dir_y[outside] = -dir_y[outside]
+        position.x[ids] = np.clip(x, left, right)
+        position.y[ids] = np.clip(y, top, bottom)
+        position.dir_x[ids] = dir_x
+        position.dir_y[ids] = dir_y
+
+        # Walking costs 0.01 stamina per unit, as in GameState.move_player
+        stamina = stats.stamina[ids] - step * 0.01
+        stamina += (alive & exhausted) * (self.REST_RECOVERY * step_scale)
+        np.clip(stamina, 0, 100, out=stamina)
+        stats.stamina[ids] = stamina
+        status.exhausted[ids] = np.where(exhausted, stamina < self.RESTED, stamina <= 0) & alive
+
+
+class ForagingSystem(System):
+    """Survivors share the limited food of the tiles they stand on
+
+    Grass and dirt tiles hold a food stock that regrows every day; hungry
+    survivors on the same tile split it between them. Water tiles refill
+    water without limit.
+    """
+
+    name = "foraging"
+
+    # Frames between foraging passes
+    INTERVAL = 60
+    FOOD_PER_TILE = 20.0
+    REGROWTH = 5.0
+    # Most food or water one survivor gathers per pass
+    GATHER = 1.0
+    DRINK = 2.0
+    # Survivors stop gathering above this share of the maximum amounts
+    FULL = 0.8
+
+    def __init__(self, world):
+        self.world = world
+        self.reset_stock()
+        self.elapsed = 0.0
+        self.food_max = MAX_AMOUNTS[RESOURCE_NAMES.index("food")]
+        self.water_max = MAX_AMOUNTS[RESOURCE_NAMES.index("water")]
+
+    def reset_stock(self):
+        """Fill every tile"""
+        # Fertile tiles whose stock is below FOOD_PER_TILE, by absolute tile
+        # row and column; every other fertile tile is full, so a chunked
+        # world's moving window finds the stocks it left behind
+        self.depleted_rows = np.zeros(0, dtype=np.int64)
+        self.depleted_cols = np.zeros(0, dtype=np.int64)
+        self.depleted_stock = np.zeros(0)
+
+    def update(self, entities, step_scale=1.0):
+        self.elapsed += step_scale
+        if self.elapsed < self.INTERVAL:
+            return
+        self.elapsed -= self.INTERVAL
+
+        world = self.world
+        grid = world.terrain_grid
+        rows, cols = grid.shape
+        left, top = world.get_bounds()[:2]
+        # Absolute tile of the grid's first row and column
+        row0, col0 = int(top // world.terrain_size), int(left // world.terrain_size)
+        fertile = (grid == Terrain.GRASS) | (grid == Terrain.DIRT)
+        capacity = np.where(fertile, self.FOOD_PER_TILE, 0.0).ravel()
+        stock = capacity.copy()
+        row, col = self.depleted_rows - row0, self.depleted_cols - col0
+        inside = (row >= 0) & (row < rows) & (col >= 0) & (col < cols)
+        window = row[inside] * cols + col[inside]
+        # Edited tiles hold no more than their new terrain allows
+        stock[window] = np.minimum(self.depleted_stock[inside], capacity[window])
+
+        ids = entities.query("position", "inventory", "status")
+        position, inventory = entities.position, entities.inventory
+        tile_col = np.clip(((position.x[ids] - left) // world.terrain_size).astype(np.intp), 0, cols - 1)
+        tile_row = np.clip(((position.y[ids] - top) // world.terrain_size).astype(np.intp), 0, rows - 1)
+        tile = tile_row * cols + tile_col
+        alive = entities.status.alive[ids]
+
+        food = inventory.food[ids]
+        hungry = alive & (food < self.food_max * self.FULL)
+        gatherers = np.bincount(tile[hungry], minlength=stock.size)
+        share = np.minimum(self.GATHER, stock / np.maximum(gatherers, 1))
+        inventory.food[ids] = food + share[tile] * hungry
+        stock -= share * gatherers
+
+        water = inventory.water[ids]
+        drinking = alive & (grid.ravel()[tile] == Terrain.WATER)
+        inventory.water[ids] = np.minimum(self.water_max, water + self.DRINK * drinking)
+
+        # Replace the window's depleted tiles, keeping those outside it
+        below = np.flatnonzero(stock < capacity)
+        outside = ~inside
+        self.depleted_rows = np.concatenate([self.depleted_rows[outside], below // cols + row0])
+        self.depleted_cols = np.concatenate([self.depleted_cols[outside], below % cols + col0])
+        self.depleted_stock = np.concatenate([self.depleted_stock[outside], stock[below]])
+
+    def new_day(self, entities):
+        if self.depleted_stock.size:
+            self.depleted_stock += self.REGROWTH
+            # Tiles that grew back to full are no longer stored
+            keep = self.depleted_stock < self.FOOD_PER_TILE
+            self.depleted_rows = self.depleted_rows[keep]
+            self.depleted_cols = self.depleted_cols[keep]
+            self.depleted_stock = self.depleted_stock[keep]
+
+
+class ConsumptionSystem(System):
+    """Daily food, water and fuel use with the GameState shortage damage"""
+
+    name = "consumption"
+
+    # Chance per day of falling sick, while dehydrated and otherwise
+    SICK_CHANCE_DEHYDRATED = 0.5
+    SICK_CHANCE = 0.02
+
+    def __init__(self, rng: np.random.Generator):
+        self.rng = rng
+
+    def new_day(self, entities):
+        ids = entities.query("stats", "inventory", "status")
+        stats, inventory, status = entities.stats, entities.inventory, entities.status
+        alive = status.alive[ids]
+        count = len(alive)
+        if not count:
+            return
+        rng = self.rng
+
+        health = stats.health[ids]
+        for name, low, high, damage in (("food", 3, 7, 15), ("water", 5, 10, 20), ("fuel", 1, 3, 5)):
+            amount = getattr(inventory, name)[ids] - rng.integers(low, high + 1, count) * alive
+            short = alive & (amount <= 0)
+            health -= damage * short
+            getattr(inventory, name)[ids] = np.maximum(amount, 0)
+        stats.health[ids] = health
+        stats.stamina[ids] = np.minimum(100, stats.stamina[ids] + 20 * alive)
+
+        # Dehydration makes survivors sick; medicine cures them
+        sick = status.sick[ids]
+        chance = np.where(inventory.water[ids] <= 0, self.SICK_CHANCE_DEHYDRATED, self.SICK_CHANCE)
+        sick |= alive & (rng.random(count) < chance)
+        medicine = inventory.medicine[ids]
+        cured = sick & (medicine > 0)
+        inventory.medicine[ids] = medicine - cured
+        status.sick[ids] = sick & ~cured
+
+
+def _per_hazard(values: Dict[str, float]) -> np.ndarray:
+    """Table indexed by hazard type code"""
+    return np.array([values.get(name, 0.0) for name in HAZARD_TYPES])
+
+
+class HazardSystem(System):
+    """Damage, injuries and theft while inside active hazards
+
+    Survivors are matched to hazards with HazardSet.hit_pairs, which only
+    tests each one against the hazards of its own cell of the index.
+    """
+
+    name = "hazards"
+
+    # Per-frame effects of standing inside each kind of hazard
+    DAMAGE = _per_hazard({"storm": 0.05, "predator": 0.3, "bandit_camp": 0.1})
+    INJURY_CHANCE = _per_hazard({"predator": 0.01, "bandit_camp": 0.002})
+    FOOD_STOLEN = _per_hazard({"bandit_camp": 0.05})
+
+    def __init__(self, hazards: HazardSet, rng: np.random.Generator):
+        self.hazards = hazards
+        self.rng = rng
+
+    def update(self, entities, step_scale=1.0):
+        hazards = self.hazards
+        ids = entities.query("position", "stats", "inventory", "status")
+        alive = entities.status.alive[ids]
+        if not len(hazards) or not alive.any():
+            return
+        if isinstance(ids, slice):
+            ids = np.arange(ids.start, ids.stop)
+        if not alive.all():
+            ids = ids[alive]
+        point, hazard = hazards.hit_pairs(entities.position.x[ids], entities.position.y[ids])
+        if not len(point):
+            return
+
+        # Pairs come ordered by survivor; sum the effects of every hazard each is inside
+        exposed, slot = np.unique(point, return_inverse=True)
+        codes = hazards.type[hazard]
+        count = len(exposed)
+        damage = np.bincount(slot, self.DAMAGE[codes], count) * step_scale
+        theft = np.bincount(slot, self.FOOD_STOLEN[codes], count) * step_scale
+        injury = np.bincount(slot, self.INJURY_CHANCE[codes], count) * step_scale
+
+        hit = ids[exposed]
+        entities.stats.health[hit] -= damage
+        entities.inventory.food[hit] = np.maximum(0, entities.inventory.food[hit] - theft)
+        entities.status.injured[hit] |= self.rng.random(count) < injury
+
+
+class VitalsSystem(System):
+    """Sickness, healing and death"""
+
+    name = "vitals"
+
+    # Health lost per frame while sick, and chance per frame of an injury healing
+    SICK_DRAIN = 0.005
+    INJURY_HEALING = 1 / 3600
+
+    def __init__(self, rng: np.random.Generator):
+        self.rng = rng
+
+    def update(self, entities, step_scale=1.0):
+        ids = entities.query("stats", "status")
+        stats, status = entities.stats, entities.status
+        alive = status.alive[ids]
+        count = len(alive)
+        if not count:
+            return
+
+        health = stats.health[ids] - status.sick[ids] * (self.SICK_DRAIN * step_scale)
+        np.minimum(health, stats.max_health[ids], out=health)
+        alive &= health > 0
+        stats.health[ids] = np.maximum(health, 0)
+        status.alive[ids] = alive
+        healed = self.rng.random(count) < self.INJURY_HEALING * step_scale
+        status.injured[ids] &= ~healed & alive
+
+
+class RenderSystem(System):
+    """Draws every survivor as a small sprite coloured by health, in one blits() call"""
+
+    name = "render"
+
+    RADIUS = 4
+    # Sprites are grouped into screen tiles of this size for dirty rects
+    TILE = 64
+    # Health above each threshold gets the next colour, as for the Player
+    THRESHOLDS = (20, 40, 70)
+    COLORS = ((255, 0, 0), (255, 165, 0), (255, 255, 0), (0, 255, 0))
+    DEAD_COLOR = (120, 0, 0)
+
+    def __init__(self):
+        self.sprites = None
+
+    def build_sprites(self) -> np.ndarray:
+        size = self.RADIUS * 2 + 1
+        sprites = []
+        for color in self.COLORS + (None,):
+            sprite = pygame.Surface((size, size))
+            sprite.fill((0, 0, 0))
+            if color is None:
+                # Dead survivors are drawn as an X
+                pygame.draw.line(sprite, self.DEAD_COLOR, (0, 0), (size - 1, size - 1), 2)
+                pygame.draw.line(sprite, self.DEAD_COLOR, (size - 1, 0), (0, size - 1), 2)
+            else:
+                pygame.draw.circle(sprite, color, (self.RADIUS, self.RADIUS), self.RADIUS)
+            sprite.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            sprites.append(sprite)
+        # Object array so sprites can be picked per survivor by fancy indexing
+        table = np.empty(len(sprites), dtype=object)
+        table[:] = sprites
+        return table
+
+    def draw(self, entities, screen, alpha=1.0, offset=(0, 0)) -> List[pygame.Rect]:
+        """Draw between the last two steps and return one rect per occupied screen tile
+
+        Each rect bounds the sprites whose corner lies in that tile, so a
+        few survivors far apart do not dirty the whole screen between them.
+        """
+        ids = entities.query("position", "stats", "status")
+        position = entities.position
+        prev_x, prev_y = position.prev_x[ids], position.prev_y[ids]
+        if not len(prev_x):
+            return []
+        if self.sprites is None:
+            self.sprites = self.build_sprites()
+
+        x = (prev_x + (position.x[ids] - prev_x) * alpha + (offset[0] - self.RADIUS)).astype(np.int64)
+        y = (prev_y + (position.y[ids] - prev_y) * alpha + (offset[1] - self.RADIUS)).astype(np.int64)
+        looks = np.digitize(entities.stats.health[ids], self.THRESHOLDS, right=True)
+        looks[~entities.status.alive[ids]] = len(self.COLORS)
+
+        screen.blits(zip(self.sprites[looks].tolist(), zip(x.tolist(), y.tolist())), doreturn=False)
+        return self.tile_rects(x, y)
+
+    def tile_rects(self, x: np.ndarray, y: np.ndarray) -> List[pygame.Rect]:
+        """Bounding rects of the sprites at (x, y), one per tile, in tile order"""
+        tile_x, tile_y = x // self.TILE, y // self.TILE
+        low_x, low_y = tile_x.min(), tile_y.min()
+        keys = (tile_y - low_y) * (tile_x.max() - low_x + 1) + (tile_x - low_x)
+        if keys.max() < 1 << 16:
+            # Small keys get NumPy's much faster radix sort
+            keys = keys.astype(np.uint16)
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        x, y = x[order], y[order]
+        left, top = np.minimum.reduceat(x, starts), np.minimum.reduceat(y, starts)
+        size = self.RADIUS * 2 + 1
+        width = np.maximum.reduceat(x, starts) - left + size
+        height = np.maximum.reduceat(y, starts) - top + size
+        return [pygame.Rect(*rect) for rect in
+                zip(left.tolist(), top.tolist(), width.tolist(), height.tolist())]
+
+
+class Survivors:
+    """NPC survivors sharing one world: an entity store and its systems"""
+
+    def __init__(self, world, rng, capacity: int = 1024):
+        # rng is a GameRNG; the systems draw from its NumPy generator
+        self.world = world
+        self.rng = rng.numpy()
+        self.entities = Entities(capacity)
+        self.systems: List[System] = [
+            MovementSystem(world, self.rng),
+            ForagingSystem(world),
+            HazardSystem(world.hazards, self.rng),
+            VitalsSystem(self.rng),
+        ]
+        self.daily_systems: List[System] = [ConsumptionSystem(self.rng), self.systems[1]]
+        self.renderer = RenderSystem()
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def alive_count(self) -> int:
+        ids = self.entities.query("status")
+        return int(np.count_nonzero(self.entities.status.alive[ids]))
+
+    def spawn(self, count: int) -> np.ndarray:
+        """Create `count` survivors at random positions with random headings"""
+        angle = self.rng.uniform(0, 2 * np.pi, count)
+        left, top, right, bottom = self.world.get_bounds()
+        x = self.rng.uniform(left, right, count)
+        y = self.rng.uniform(top, bottom, count)
+        return self.entities.create(count, x=x, y=y, prev_x=x, prev_y=y,
+                                    dir_x=np.cos(angle), dir_y=np.sin(angle))
+
+    def reset(self, count: int):
+        """Start over with `count` fresh survivors and full food stocks"""
+        self.entities.clear()
+        self.systems[1].reset_stock()
+        self.spawn(count)
+
+    def update(self, step_scale: float = 1.0, new_day: bool = False, profiler=None):
+        entities = self.entities
+        if new_day:
+            for system in self.daily_systems:
+                system.new_day(entities)
+        for system in self.systems:
+            if profiler is None:
+                system.update(entities, step_scale)
+            else:
+                with profiler.section("update.npcs." + system.name):
+                    system.update(entities, step_scale)
+
+    def draw(self, screen, alpha: float = 1.0, offset=(0, 0)) -> List[pygame.Rect]:
+        return self.renderer.draw(self.entities, screen, alpha, offset)
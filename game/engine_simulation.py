@@ -0,0 +1,95 @@
+"""
+Headless simulation of the GameEngine component stack
+Plays the Player / ResourceManager / EventManager rules of GameEngine
+without opening a window, jumping from one day boundary or random
+event to the next instead of ticking every frame
+"""
+
+import time
+from typing import Dict, Optional
+
+from .game_engine import GameEngine
+from .simulation import BatchReport
+
+
+class HeadlessEngine(GameEngine):
+    """GameEngine without display, world or UI, driven in day-sized jumps"""
+
+    def __init__(self, fps: int = 60, max_days: int = 365,
+                 event_chance: float = GameEngine.EVENT_CHANCE,
+                 start_overrides: Optional[Dict] = None,
+                 seed: Optional[int] = None):
+        self._init_rules(1024, 768, fps, seed)
+        self.max_days = max_days
+        self.EVENT_CHANCE = event_chance
+        self.start_overrides = start_overrides or {}
+
+    def start_game(self):
+        super().start_game()
+        for name, value in self.start_overrides.items():
+            setattr(self.resource_manager, name, value)
+
+    def current_terrain(self):
+        # No world, so events use their terrain-independent weights
+        return None
+
+    def run_game(self) -> Dict:
+        """Play one game to death or max_days and return its result"""
+        self.start_game()
+        cause = None
+
+        while self.day <= self.max_days and not cause:
+            ticks = self.scheduler.ticks_until_next()
+            if ticks is None:
+                break
+            for name in self.scheduler.advance(ticks):
+                history = self.event_manager.events_recorded
+                if name == "day":
+                    self.day += 1
+                    self.time_passed = 0
+                    self.advance_day()
+                    if self.player.health <= 0:
+                        cause = self._day_death_cause(history)
+                        break
+                elif name == "encounter":
+                    self.event_manager.trigger_random_event(self.player, self.resource_manager,
+                                                            day=self.day)
+                    if self.player.health <= 0:
+                        cause = self._event_name(history) or "event"
+                        break
+
+        if cause:
+            self.player.alive = False
+            self.game_state = "game_over"
+
+        return {
+            "days": self.day,
+            "victory": False,
+            "alive": self.player.alive,
+            "cause": cause or "timeout",
+            "events_faced": self.event_manager.events_recorded,
+        }
+
+    def run_batch(self, runs: int) -> BatchReport:
+        """Play `runs` games and collect aggregate statistics"""
+        report = BatchReport()
+        start = time.perf_counter()
+        for _ in range(runs):
+            self.event_manager.clear_history()
+            report.add(self.run_game())
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _event_name(self, history_length: int) -> Optional[str]:
+        """Name of the latest event recorded after `history_length` entries"""
+        if self.event_manager.events_recorded > history_length:
+            return self.event_manager.last_event_name()
+        return None
+
+    def _day_death_cause(self, history_length: int) -> str:
+        """Attribute a death during advance_day"""
+        if self.resource_manager.water <= 0:
+            return "dehydration"
+        if self.resource_manager.food <= 0:
+            return "starvation"
+        return self._event_name(history_length) or "exposure"
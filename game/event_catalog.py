@@ -0,0 +1,196 @@
+"""
+Data-driven catalog of random encounters and daily events
+Events and the effects of their choices are plain data, compiled once
+into a dispatch table of choice id -> ChoiceRecord. Resolving a choice is
+one dict lookup followed by applying the record's constant deltas and
+random rolls, drawn in the same order as the hand-written handlers did
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class Roll:
+    """A random amount rng.randint(low, high), optionally negated"""
+
+    __slots__ = ("low", "high", "sign")
+
+    def __init__(self, low: int, high: int, sign: int = 1):
+        self.low = low
+        self.high = high
+        self.sign = sign
+
+    def __neg__(self) -> "Roll":
+        return Roll(self.low, self.high, -self.sign)
+
+    def __repr__(self):
+        return f"{'-' if self.sign < 0 else ''}Roll({self.low}, {self.high})"
+
+
+class Outcome:
+    """Compiled effect: constant deltas and random rolls per state attribute"""
+
+    __slots__ = ("deltas", "rolls")
+
+    def __init__(self, effect: Optional[Dict] = None):
+        deltas: List[Tuple[str, float]] = []
+        rolls: List[Tuple[str, int, int, int]] = []
+        for attribute, amount in (effect or {}).items():
+            if isinstance(amount, Roll):
+                rolls.append((attribute, amount.low, amount.high, amount.sign))
+            else:
+                deltas.append((attribute, amount))
+        self.deltas = tuple(deltas)
+        self.rolls = tuple(rolls)
+
+    def apply(self, state, rng):
+        for attribute, delta in self.deltas:
+            setattr(state, attribute, getattr(state, attribute) + delta)
+        for attribute, low, high, sign in self.rolls:
+            setattr(state, attribute, getattr(state, attribute) + sign * rng.randint(low, high))
+
+
+class ChoiceRecord:
+    """What one choice does
+
+    With `odds` the success outcome happens when rng.randint(1, odds) == 1;
+    with `requires` it happens when that attribute is above zero. Otherwise
+    the success outcome always applies.
+    """
+
+    __slots__ = ("choice_id", "success", "failure", "odds", "requires")
+
+    def __init__(self, choice_id: str, success: Outcome, failure: Outcome,
+                 odds: Optional[int] = None, requires: Optional[str] = None):
+        self.choice_id = choice_id
+        self.success = success
+        self.failure = failure
+        self.odds = odds
+        self.requires = requires
+
+    def outcome(self, state, rng) -> Outcome:
+        if self.odds is not None:
+            return self.success if rng.randint(1, self.odds) == 1 else self.failure
+        if self.requires is not None:
+            return self.success if getattr(state, self.requires) > 0 else self.failure
+        return self.success
+
+    def apply(self, state, rng):
+        self.outcome(state, rng).apply(state, rng)
+
+
+# Random encounters. Each choice has an "effect", or "success"/"failure"
+# effects gated by "odds" or "requires"; amounts are added to GameState
+# attributes
+ENCOUNTERS = [
+    {
+        "title": "Wild Animal Attack",
+        "description": "A hostile animal blocks your path!",
+        "choices": [
+            {"text": "Fight it (-health, +food if win)", "id": "fight_animal", "odds": 2,
+             "success": {"player_health": -Roll(10, 25), "food": Roll(5, 15)},
+             "failure": {"player_health": -Roll(20, 40)}},
+            {"text": "Run away (-stamina)", "id": "flee_animal",
+             "effect": {"player_stamina": -30}},
+            # No weapon available, fight with bare hands
+            {"text": "Use weapon (-weapon)", "id": "weapon_animal", "requires": "weapons",
+             "success": {"weapons": -1, "food": Roll(8, 20)},
+             "failure": {"player_health": -Roll(15, 35)}},
+        ]
+    },
+    {
+        "title": "Sick Traveler",
+        "description": "You encounter a sick traveler asking for help.",
+        "choices": [
+            {"text": "Help them (-medicine, +morale)", "id": "help_sick", "requires": "medicine",
+             "success": {"medicine": -1, "player_morale": 10},
+             "failure": {"player_morale": -5}},
+            {"text": "Ignore them (-morale)", "id": "ignore_sick",
+             "effect": {"player_morale": -15}},
+            {"text": "Rob them (+resources, -morale)", "id": "rob_sick",
+             "effect": {"food": Roll(1, 5), "water": Roll(1, 3), "player_morale": -25}},
+        ]
+    },
+    {
+        "title": "Resource Cache",
+        "description": "You found an abandoned supply cache!",
+        "choices": [
+            {"text": "Take everything (+resources)", "id": "take_all",
+             "effect": {"food": Roll(10, 20), "water": Roll(5, 15),
+                        "medicine": Roll(1, 5), "fuel": Roll(3, 10)}},
+            {"text": "Take only what you need (+some resources)", "id": "take_some",
+             "effect": {"food": Roll(3, 8), "water": Roll(2, 6), "medicine": Roll(0, 2)}},
+            {"text": "Leave it for others (+morale)", "id": "leave_cache",
+             "effect": {"player_morale": 20}},
+        ]
+    },
+]
+
+# Daily events: (description, effect)
+DAILY_EVENTS = [
+    ("Harsh weather slows your progress", {"player_health": -Roll(5, 15), "fuel": -Roll(1, 5)}),
+    ("You found some berries along the way", {"food": Roll(2, 8)}),
+    ("A storm damages your supplies", {"player_health": -Roll(5, 15), "fuel": -Roll(1, 5)}),
+    ("You met friendly travelers who shared food", {"food": Roll(2, 8)}),
+]
+
+
+def _merge(event: Dict, overrides: Dict) -> Dict:
+    """Copy of an encounter with per-title and per-choice-id overrides applied"""
+    merged = dict(event, **overrides.get(event["title"], {}))
+    merged["choices"] = [dict(choice, **overrides.get(choice["id"], {}))
+                         for choice in event["choices"]]
+    return merged
+
+
+def compile_choice(choice: Dict) -> ChoiceRecord:
+    if "effect" in choice:
+        return ChoiceRecord(choice["id"], Outcome(choice["effect"]), Outcome())
+    return ChoiceRecord(choice["id"], Outcome(choice.get("success")), Outcome(choice.get("failure")),
+                        choice.get("odds"), choice.get("requires"))
+
+
+class EventCatalog:
+    """Encounters and daily events compiled into dispatch tables"""
+
+    def __init__(self, encounters: Sequence[Dict] = ENCOUNTERS,
+                 daily_events: Sequence[Tuple[str, Dict]] = DAILY_EVENTS,
+                 overrides: Optional[Dict[str, Dict]] = None):
+        overrides = overrides or {}
+        encounters = [_merge(event, overrides) for event in encounters]
+
+        # What front ends show: title, description and choice texts and ids
+        self.encounters = [
+            {"title": event["title"], "description": event["description"],
+             "choices": [{"text": choice["text"], "id": choice["id"]} for choice in event["choices"]]}
+            for event in encounters
+        ]
+        self.choices: Dict[str, ChoiceRecord] = {
+            choice["id"]: compile_choice(choice)
+            for event in encounters for choice in event["choices"]
+        }
+        self.daily_events = [(text, Outcome(effect)) for text, effect in daily_events]
+
+    def choice_ids(self) -> List[Tuple[str, ...]]:
+        """Choice ids of each encounter, in catalog order"""
+        return [tuple(choice["id"] for choice in event["choices"]) for event in self.encounters]
+
+    def random_encounter(self, rng) -> Dict:
+        return rng.choice(self.encounters)
+
+    def daily_event(self, state, rng) -> str:
+        """Apply a random daily event to `state` and return its description"""
+        text, outcome = rng.choice(self.daily_events)
+        outcome.apply(state, rng)
+        return text
+
+    def resolve(self, state, choice_id: str, rng) -> bool:
+        """Apply a choice to `state`; False for unknown choice ids"""
+        record = self.choices.get(choice_id)
+        if record is None:
+            return False
+        record.apply(state, rng)
+        return True
+
+
+# Catalog shared by every GameState
+DEFAULT_CATALOG = EventCatalog()
@@ -1,9 +1,41 @@
-import random
+from collections import deque
+
+from .rng import GameRNG
+from .sampling import WeightedSampler
+from .terrain import Terrain
+
+# Weeks after which event weights stop changing with the day
+MAX_WEEK = 8
+
+
+def event_weight(event, bucket):
+    """Weight of an event in a (terrain, week, scarce resources) context bucket
+
+    An event's optional "weights" entry has a "base" weight, multipliers
+    per terrain and per critically low resource, and a relative increase
+    "per_week" of travel.
+    """
+    spec = event.get("weights", {})
+    terrain, week, scarce = bucket or (None, 0, ())
+    weight = spec.get("base", 1.0) * spec.get("terrain", {}).get(terrain, 1.0)
+    weight *= 1.0 + spec.get("per_week", 0.0) * week
+    for resource in scarce:
+        weight *= spec.get("scarce", {}).get(resource, 1.0)
+    return weight
+
 
 class EventManager:
-    def __init__(self):
+    # Chance that a day has an event, and the share of those that are encounters
+    DAILY_EVENT_CHANCE = 0.3
+    ENCOUNTER_SHARE = 0.6
+    
+    def __init__(self, rng=None, history_limit=100):
+        self.rng = rng or GameRNG()
         self.current_event = None
-        self.event_history = []
+        # Most recent events as compact (name, prevented, choice index)
+        # records; events_recorded counts every event since the last clear
+        self.history = deque(maxlen=history_limit)
+        self.events_recorded = 0
         
         # Define various event types
         self.random_events = [
@@ -13,7 +45,9 @@ class EventManager:
                 "effect": lambda player, resources: player.take_damage(15),
                 "can_prevent": True,
                 "prevention_resource": "medicine",
-                "prevention_amount": 2
+                "prevention_amount": 2,
+                # Gets likelier the longer the journey and without food
+                "weights": {"per_week": 0.1, "scarce": {"food": 1.5}}
             },
             {
                 "name": "Injury",
@@ -21,19 +55,22 @@ class EventManager:
                 "effect": lambda player, resources: player.take_damage(10),
                 "can_prevent": True,
                 "prevention_resource": "medicine",
-                "prevention_amount": 1
+                "prevention_amount": 1,
+                "weights": {"terrain": {Terrain.MOUNTAIN: 2.0}}
             },
             {
                 "name": "Equipment Loss",
                 "description": "Some of your equipment was lost or damaged.",
                 "effect": lambda player, resources: resources.consume_resource("weapons", 1),
-                "can_prevent": False
+                "can_prevent": False,
+                "weights": {"base": 0.6, "terrain": {Terrain.WATER: 1.5}}
             },
             {
                 "name": "Food Spoilage",
                 "description": "Some of your food has spoiled.",
-                "effect": lambda player, resources: resources.consume_resource("food", random.randint(3, 8)),
-                "can_prevent": False
+                "effect": lambda player, resources: resources.consume_resource("food", self.rng.randint(3, 8)),
+                "can_prevent": False,
+                "weights": {"base": 0.8, "terrain": {Terrain.DESERT: 1.5}}
             },
             {
                 "name": "Water Contamination",
@@ -41,7 +78,9 @@ class EventManager:
                 "effect": lambda player, resources: self.contaminated_water_effect(player, resources),
                 "can_prevent": True,
                 "prevention_resource": "medicine",
-                "prevention_amount": 1
+                "prevention_amount": 1,
+                # Short on water means drinking from doubtful sources
+                "weights": {"base": 0.8, "scarce": {"water": 2.0}}
             }
         ]
         
@@ -53,7 +92,8 @@ class EventManager:
                     {"text": "Trade food for medicine", "cost": ("food", 10), "gain": ("medicine", 5)},
                     {"text": "Trade weapons for food", "cost": ("weapons", 2), "gain": ("food", 15)},
                     {"text": "Continue without trading", "cost": None, "gain": None}
-                ]
+                ],
+                "weights": {"terrain": {Terrain.GRASS: 1.5, Terrain.DIRT: 1.5}}
             },
             {
                 "name": "Injured Traveler",
@@ -71,7 +111,8 @@ class EventManager:
                     {"text": "Search thoroughly", "cost": ("time", 1), "gain": ("random_resource", 1)},
                     {"text": "Take what's visible", "cost": None, "gain": ("food", 3)},
                     {"text": "Avoid it (might be dangerous)", "cost": None, "gain": None}
-                ]
+                ],
+                "weights": {"terrain": {Terrain.DESERT: 0.5}}
             },
             {
                 "name": "Wild Animal",
@@ -80,7 +121,8 @@ class EventManager:
                     {"text": "Fight with weapons", "cost": ("weapons", 1), "gain": ("food", 8)},
                     {"text": "Try to scare it away", "cost": None, "gain": None},
                     {"text": "Take a longer route", "cost": ("fuel", 3), "gain": None}
-                ]
+                ],
+                "weights": {"terrain": {Terrain.GRASS: 1.5, Terrain.MOUNTAIN: 1.5}}
             },
             {
                 "name": "Severe Weather",
@@ -89,16 +131,58 @@ class EventManager:
                     {"text": "Wait it out (use fuel for warmth)", "cost": ("fuel", 5), "gain": None},
                     {"text": "Push through the storm", "cost": ("health", 20), "gain": None},
                     {"text": "Find shelter", "cost": ("time", 2), "gain": None}
-                ]
+                ],
+                "weights": {"terrain": {Terrain.DESERT: 1.5, Terrain.MOUNTAIN: 2.0}}
             }
         ]
+        
+        # Only these resources being low changes any event weight
+        self.scarce_resources = tuple(sorted({
+            resource for event in self.random_events + self.encounter_events
+            for resource in event.get("weights", {}).get("scarce", {})
+        }))
+        
+        self.events_by_name = {event["name"]: event
+                               for event in self.random_events + self.encounter_events}
+        
+        # Alias-table samplers built once; weights are cached per context bucket
+        self.random_sampler = WeightedSampler(self.random_events, event_weight)
+        self.encounter_sampler = WeightedSampler(self.encounter_events, event_weight)
+        # All daily outcomes in one table: no event, a random event or an encounter
+        self.daily_sampler = WeightedSampler(
+            [(None, None)]
+            + [("random", event) for event in self.random_events]
+            + [("encounter", event) for event in self.encounter_events],
+            self.daily_weight)
     
-    def trigger_random_event(self, player, resource_manager):
+    def context_bucket(self, terrain=None, day=None, resource_manager=None):
+        """Quantized context that event weights depend on"""
+        week = min(MAX_WEEK, (day - 1) // 7) if day else 0
+        scarce = ()
+        if resource_manager is not None:
+            is_critical = resource_manager.is_critical
+            scarce = tuple([resource for resource in self.scarce_resources if is_critical(resource)])
+        return (None if terrain is None else int(terrain), week, scarce)
+    
+    def daily_weight(self, entry, bucket):
+        kind, event = entry
+        if kind is None:
+            return 1.0 - self.DAILY_EVENT_CHANCE
+        if kind == "encounter":
+            share, sampler = self.ENCOUNTER_SHARE, self.encounter_sampler
+        else:
+            share, sampler = 1.0 - self.ENCOUNTER_SHARE, self.random_sampler
+        total = sum(event_weight(other, bucket) for other in sampler.items)
+        return self.DAILY_EVENT_CHANCE * share * event_weight(event, bucket) / total
+    
+    def trigger_random_event(self, player, resource_manager, terrain=None, day=None, event=None):
         """Trigger a random negative event"""
         if self.current_event:
             return  # Already handling an event
         
-        event = random.choice(self.random_events)
+        if event is None:
+            bucket = self.context_bucket(terrain, day, resource_manager)
+            event = self.random_sampler.sample(self.rng, bucket)
         self.current_event = event
         
         # Check if event can be prevented
@@ -108,11 +192,7 @@ class EventManager:
             
             if resource_manager.consume_resource(prevention_resource, prevention_amount):
                 # Event prevented
-                self.event_history.append({
-                    "name": event["name"],
-                    "description": f"{event['description']} (Prevented with {prevention_resource})",
-                    "prevented": True
-                })
+                self.record_event(event["name"], True)
                 self.current_event = None
                 return
         
@@ -120,25 +200,35 @@ class EventManager:
         event["effect"](player, resource_manager)
         
         # Record event
-        self.event_history.append({
-            "name": event["name"],
-            "description": event["description"],
-            "prevented": False
-        })
+        self.record_event(event["name"])
         
         self.current_event = None
     
-    def trigger_daily_event(self, player, resource_manager):
+    def trigger_daily_event(self, player, resource_manager, terrain=None, day=None):
         """Trigger a daily event that might be positive or negative"""
-        if random.random() < 0.3:  # 30% chance of daily event
-            if random.random() < 0.6:  # 60% chance of encounter (potentially positive)
-                self.trigger_encounter_event(player, resource_manager)
-            else:  # 40% chance of random negative event
-                self.trigger_random_event(player, resource_manager)
+        # One draw decides between no event, an encounter (potentially
+        # positive) and a random negative event, and picks which one
+        bucket = self.context_bucket(terrain, day, resource_manager)
+        kind, event = self.daily_sampler.sample(self.rng, bucket)
+        if kind == "encounter":
+            self.trigger_encounter_event(player, resource_manager, encounter=event)
+        elif kind == "random":
+            self.trigger_random_event(player, resource_manager, event=event)
     
-    def trigger_encounter_event(self, player, resource_manager):
+    def sample_daily_events(self, count, generator, terrain=None, day=None, resource_manager=None):
+        """Draw `count` daily outcomes at once from a NumPy Generator
+
+        Returns (kind, event) pairs where kind is None, "random" or
+        "encounter", for headless simulators that resolve days in bulk.
+        """
+        bucket = self.context_bucket(terrain, day, resource_manager)
+        return self.daily_sampler.sample_many(count, generator, bucket)
+    
+    def trigger_encounter_event(self, player, resource_manager, terrain=None, day=None, encounter=None):
         """Trigger an encounter event that requires player choice"""
-        encounter = random.choice(self.encounter_events)
+        if encounter is None:
+            bucket = self.context_bucket(terrain, day, resource_manager)
+            encounter = self.encounter_sampler.sample(self.rng, bucket)
         # For now, automatically make a random choice
         # Later this can be expanded to present choices to the player
         self.auto_resolve_encounter(encounter, player, resource_manager)
@@ -146,7 +236,7 @@ class EventManager:
     def auto_resolve_encounter(self, encounter, player, resource_manager):
         """Automatically resolve an encounter (can be made interactive later)"""
         # Choose a random option
-        choice = random.choice(encounter["choices"])
+        choice = self.rng.choice(encounter["choices"])
         
         # Apply cost
         if choice["cost"]:
@@ -166,32 +256,53 @@ class EventManager:
             elif gain_type == "morale":
                 player.morale += gain_amount
             elif gain_type == "random_resource":
-                random_resource = random.choice(["food", "water", "medicine", "weapons"])
-                resource_manager.add_resource(random_resource, random.randint(1, 5))
+                random_resource = self.rng.choice(["food", "water", "medicine", "weapons"])
+                resource_manager.add_resource(random_resource, self.rng.randint(1, 5))
             else:
                 resource_manager.add_resource(gain_type, gain_amount)
         
         # Record the event
-        self.event_history.append({
-            "name": encounter["name"],
-            "description": f"{encounter['description']} - {choice['text']}",
-            "prevented": False
-        })
+        self.record_event(encounter["name"], choice=encounter["choices"].index(choice))
     
     def contaminated_water_effect(self, player, resource_manager):
         """Special effect for contaminated water"""
         # Lose some water
-        resource_manager.consume_resource("water", random.randint(5, 10))
+        resource_manager.consume_resource("water", self.rng.randint(5, 10))
         # Take damage
-        player.take_damage(random.randint(8, 15))
+        player.take_damage(self.rng.randint(8, 15))
         # Chance of getting sick
-        if random.random() < 0.3:
+        if self.rng.random() < 0.3:
             player.sick = True
     
+    def record_event(self, name, prevented=False, choice=None):
+        self.history.append((name, prevented, choice))
+        self.events_recorded += 1
+    
+    def describe(self, record):
+        """Expand a history record into the name/description/prevented dict"""
+        name, prevented, choice = record
+        event = self.events_by_name[name]
+        description = event["description"]
+        if prevented:
+            description = f"{description} (Prevented with {event['prevention_resource']})"
+        elif choice is not None:
+            description = f"{description} - {event['choices'][choice]['text']}"
+        return {"name": name, "description": description, "prevented": prevented}
+    
+    @property
+    def event_history(self):
+        """Retained history as dicts, oldest first"""
+        return [self.describe(record) for record in self.history]
+    
+    def last_event_name(self):
+        return self.history[-1][0] if self.history else None
+    
     def get_recent_events(self, count=5):
         """Get the most recent events"""
-        return self.event_history[-count:] if len(self.event_history) >= count else self.event_history
+        start = max(0, len(self.history) - count)
+        return [self.describe(self.history[i]) for i in range(start, len(self.history))]
     
     def clear_history(self):
         """Clear event history"""
-        self.event_history = []
\ No newline at end of file
+        self.history.clear()
+        self.events_recorded = 0
\ No newline at end of file
@@ -1,53 +1,154 @@
+import os
 import pygame
-import random
+from .rng import GameRNG
+from .scheduler import EventScheduler
 from .player import Player
 from .world import World
+from .chunked_world import ChunkedWorld
 from .resource_manager import ResourceManager
 from .event_manager import EventManager
+from .ecs import Survivors
 from .ui import UI
+from .text_cache import get_font, render_text
+from .profiler import FrameProfiler
+from .snapshot import save_engine, load_engine
 
 class GameEngine:
-    def __init__(self, width, height, fps):
-        self.width = width
-        self.height = height
-        self.fps = fps
+    # Chance of a random event on each frame at the nominal fps
+    EVENT_CHANCE = 1 / 300
+    
+    # Longest real frame time fed to the simulation; anything beyond is dropped
+    MAX_FRAME_TIME = 0.25
+    
+    # Where F4 writes the profiler's recorded frames
+    PROFILE_PATH = "profile"
+    
+    # Snapshot written by F5, at the end of every day with autosave, and
+    # loaded by F9
+    SAVE_PATH = "savegame.dgs"
+    
+    def __init__(self, width, height, fps, seed=None, sim_rate=None, render_rate=None,
+                 catch_up=False, dirty_rects=False, profile=False, autosave=False, npcs=0,
+                 chunked=False):
+        self._init_rules(width, height, fps, seed, sim_rate, autosave)
+        self.render_rate = render_rate or fps
+        
+        # Catch-up mode never drops simulation time: after a slow frame it
+        # runs as many simulation-only steps as needed before rendering again
+        self.catch_up = catch_up
+        self.max_steps_per_frame = self.sim_rate if catch_up else max(1, int(self.sim_rate * self.MAX_FRAME_TIME))
+        
+        # Dirty-rect mode pushes only the screen regions that changed
+        # instead of flipping the whole display every frame
+        self.dirty_rects = dirty_rects
+        self.drawn_state = None
+        self.drawn_offset = None
+        self.sprite_rects = []
+        
+        # Frame-time profiler; F3 toggles its overlay, F4 dumps the samples
+        self.profiler = FrameProfiler(enabled=profile)
         
         # Initialize Pygame components
         self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("Death Game Simulator")
         self.clock = pygame.time.Clock()
         
+        # A chunked world streams terrain in around the player instead of
+        # ending at the screen edges
+        world_class = ChunkedWorld if chunked else World
+        self.world = world_class(width, height, self.rng.stream("world"))
+        self.ui = UI(width, height)
+        
+        # NPCs live in an entity-component store updated in batched passes
+        self.npcs = npcs
+        if npcs:
+            self.survivors = Survivors(self.world, self.rng.stream("npcs"), capacity=npcs)
+        
+        # Colors
+        self.BLACK = (0, 0, 0)
+        self.WHITE = (255, 255, 255)
+        self.RED = (255, 0, 0)
+        self.GREEN = (0, 255, 0)
+        self.BLUE = (0, 0, 255)
+    
+    def _init_rules(self, width, height, fps, seed=None, sim_rate=None, autosave=False):
+        """Timing, RNG, game state and the components of the survival rules
+
+        Everything GameEngine needs besides the display, world, UI and NPCs,
+        so headless engines can share it.
+        """
+        self.width = width
+        self.height = height
+        self.fps = fps
+        
+        # Fixed-timestep simulation, decoupled from the render rate. Game
+        # rules are tuned per frame at `fps`, so per-step movement and odds
+        # are scaled by step_scale when the simulation runs at another rate
+        self.sim_rate = sim_rate or fps
+        self.step = 1.0 / self.sim_rate
+        self.step_scale = fps / self.sim_rate
+        self.accumulator = 0.0
+        self.autosave = autosave
+        
+        # One seeded stream per subsystem keeps sessions reproducible
+        self.rng = GameRNG(seed)
+        
         # Game state
         self.running = True
         self.game_state = "menu"  # menu, playing, game_over
         self.day = 1
         self.time_passed = 0
+        self.scheduler = EventScheduler(self.rng.stream("scheduler"))
         
         # Game components
         self.player = Player(width // 2, height // 2)
-        self.world = World(width, height)
-        self.resource_manager = ResourceManager()
-        self.event_manager = EventManager()
-        self.ui = UI(width, height)
+        self.resource_manager = ResourceManager(self.rng.stream("resources"))
+        self.event_manager = EventManager(self.rng.stream("events"))
         
-        # Colors
-        self.BLACK = (0, 0, 0)
-        self.WHITE = (255, 255, 255)
-        self.RED = (255, 0, 0)
-        self.GREEN = (0, 255, 0)
-        self.BLUE = (0, 0, 255)
+        # NPC survivors sharing the world, when the engine has any
+        self.npcs = 0
+        self.survivors = None
         
     def run(self):
+        self.clock.tick()
         while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(self.fps)
+            frame_time = self.clock.tick(self.render_rate) / 1000.0
+            if not self.catch_up:
+                frame_time = min(frame_time, self.MAX_FRAME_TIME)
+            self.accumulator += frame_time
+            
+            profiler = self.profiler
+            profiler.begin_frame()
+            with profiler.section("events"):
+                self.handle_events()
+            
+            # Run the simulation in fixed steps for the elapsed real time
+            steps = 0
+            with profiler.section("update"):
+                while self.accumulator >= self.step and steps < self.max_steps_per_frame:
+                    self.update()
+                    self.accumulator -= self.step
+                    steps += 1
+            
+            # Render between the last two simulation steps
+            with profiler.section("draw"):
+                self.draw(min(1.0, self.accumulator / self.step))
+            profiler.end_frame()
     
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle_overlay()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.profiler.dump_json(self.PROFILE_PATH + ".json")
+                self.profiler.dump_csv(self.PROFILE_PATH + ".csv")
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                if self.game_state == "playing":
+                    save_engine(self, self.SAVE_PATH)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+                self.load_game()
             elif event.type == pygame.KEYDOWN:
                 if self.game_state == "menu":
                     if event.key == pygame.K_SPACE:
@@ -63,44 +164,73 @@ class GameEngine:
     
     def update(self):
         if self.game_state == "playing":
+            profiler = self.profiler
+            
             # Update time
             self.time_passed += 1
-            if self.time_passed >= self.fps * 60:  # 60 seconds = 1 day
-                self.day += 1
-                self.time_passed = 0
-                self.advance_day()
+            with profiler.section("update.events"):
+                fired = self.scheduler.advance()
+                if "day" in fired:
+                    self.day += 1
+                    self.time_passed = 0
+                    self.advance_day()
             
             # Update game components
-            self.player.update()
-            self.world.update()
-            self.resource_manager.update()
+            with profiler.section("update.player"):
+                self.player.update(self.step_scale)
+            with profiler.section("update.world"):
+                self.world.update(self.step_scale, (self.player.x, self.player.y))
+            with profiler.section("update.resources"):
+                self.resource_manager.update()
+            if self.survivors is not None:
+                with profiler.section("update.npcs"):
+                    self.survivors.update(self.step_scale, "day" in fired, profiler)
             
             # Check for events
-            if random.randint(1, 300) == 1:  # Random event chance
-                self.event_manager.trigger_random_event(self.player, self.resource_manager)
+            if "encounter" in fired:
+                with profiler.section("update.events"):
+                    self.event_manager.trigger_random_event(self.player, self.resource_manager,
+                                                            self.current_terrain(), self.day)
             
             # Check for death conditions
             if self.player.health <= 0:
                 self.game_state = "game_over"
     
-    def draw(self):
+    def draw(self, alpha=1.0):
+        # The overlay is redrawn every frame, so it needs the full-screen path
+        overlay = self.profiler.overlay_visible
+        # A scrolled camera moves everything on screen
+        offset = self.world.screen_offset()
+        if (self.dirty_rects and not overlay and self.drawn_state == self.game_state
+                and self.drawn_offset == offset and not self.world.terrain_dirty):
+            # Menus are static; only the game screen changes between frames
+            if self.game_state == "playing":
+                self.draw_game_dirty(alpha)
+            return
+        
         self.screen.fill(self.BLACK)
         
         if self.game_state == "menu":
             self.draw_menu()
         elif self.game_state == "playing":
-            self.draw_game()
+            self.draw_game(alpha)
         elif self.game_state == "game_over":
             self.draw_game_over()
         
+        if overlay:
+            self.profiler.draw_overlay(self.screen, (self.width - 260, self.height - 200))
+        
         pygame.display.flip()
+        # Leaving overlay mode needs one more full frame to clear it
+        self.drawn_state = None if overlay else self.game_state
+        self.drawn_offset = offset
     
     def draw_menu(self):
-        title_font = pygame.font.Font(None, 72)
-        subtitle_font = pygame.font.Font(None, 36)
+        title_font = get_font(72)
+        subtitle_font = get_font(36)
         
-        title = title_font.render("DEATH GAME SIMULATOR", True, self.RED)
-        subtitle = subtitle_font.render("Press SPACE to start your journey", True, self.WHITE)
+        title = render_text(title_font, "DEATH GAME SIMULATOR", True, self.RED)
+        subtitle = render_text(subtitle_font, "Press SPACE to start your journey", True, self.WHITE)
         
         title_rect = title.get_rect(center=(self.width // 2, self.height // 2 - 100))
         subtitle_rect = subtitle.get_rect(center=(self.width // 2, self.height // 2))
@@ -108,23 +238,67 @@ class GameEngine:
         self.screen.blit(title, title_rect)
         self.screen.blit(subtitle, subtitle_rect)
     
-    def draw_game(self):
+    def draw_game(self, alpha=1.0):
+        profiler = self.profiler
+        offset = self.world.screen_offset()
+        
         # Draw world
-        self.world.draw(self.screen)
+        with profiler.section("draw.world"):
+            self.sprite_rects = self.world.draw(self.screen)
+        
+        # Draw NPCs
+        if self.survivors is not None:
+            with profiler.section("draw.npcs"):
+                self.sprite_rects += self.survivors.draw(self.screen, alpha, offset)
         
         # Draw player
-        self.player.draw(self.screen)
+        with profiler.section("draw.player"):
+            self.sprite_rects.append(self.player.draw(self.screen, alpha, offset))
         
         # Draw UI
-        self.ui.draw(self.screen, self.player, self.resource_manager, self.day)
+        with profiler.section("draw.ui"):
+            self.ui.invalidate()
+            self.ui.draw(self.screen, self.player, self.resource_manager, self.day)
+    
+    def draw_game_dirty(self, alpha=1.0):
+        """Redraw sprites and panels over the cached background, updating only changed regions"""
+        profiler = self.profiler
+        offset = self.world.screen_offset()
+        
+        # Put the background back wherever sprites or panels were last drawn
+        previous = self.sprite_rects
+        with profiler.section("draw.world"):
+            for rect in previous + self.ui.panel_rects():
+                self.world.restore(self.screen, rect)
+            
+            # Everything is redrawn in the same order, so a sprite that did not
+            # move produces the same pixels and its rect need not be pushed
+            self.sprite_rects = self.world.draw_hazards(self.screen, self.world.hazards, offset)
+        if self.survivors is not None:
+            with profiler.section("draw.npcs"):
+                self.sprite_rects += self.survivors.draw(self.screen, alpha, offset)
+        with profiler.section("draw.player"):
+            self.sprite_rects.append(self.player.draw(self.screen, alpha, offset))
+        with profiler.section("draw.ui"):
+            dirty = self.ui.draw(self.screen, self.player, self.resource_manager, self.day)
+        
+        if len(previous) != len(self.sprite_rects):
+            dirty += previous + self.sprite_rects
+        else:
+            for old, new in zip(previous, self.sprite_rects):
+                if old != new:
+                    dirty += [old, new]
+        
+        if dirty:
+            pygame.display.update(dirty)
     
     def draw_game_over(self):
-        game_over_font = pygame.font.Font(None, 72)
-        info_font = pygame.font.Font(None, 36)
+        game_over_font = get_font(72)
+        info_font = get_font(36)
         
-        game_over_text = game_over_font.render("YOU DIED", True, self.RED)
-        survival_text = info_font.render(f"You survived {self.day} days", True, self.WHITE)
-        restart_text = info_font.render("Press R to restart or ESC for menu", True, self.WHITE)
+        game_over_text = render_text(game_over_font, "YOU DIED", True, self.RED)
+        survival_text = render_text(info_font, f"You survived {self.day} days", True, self.WHITE)
+        restart_text = render_text(info_font, "Press R to restart or ESC for menu", True, self.WHITE)
         
         game_over_rect = game_over_text.get_rect(center=(self.width // 2, self.height // 2 - 100))
         survival_rect = survival_text.get_rect(center=(self.width // 2, self.height // 2))
@@ -140,10 +314,32 @@ class GameEngine:
         self.time_passed = 0
         self.player.reset()
         self.resource_manager.reset()
+        if self.survivors is not None:
+            self.survivors.reset(self.npcs)
+        
+        # Days last 60 seconds; random events are sampled ahead of time
+        self.accumulator = 0.0
+        self.scheduler.clear()
+        self.scheduler.schedule_every("day", self.sim_rate * 60)
+        self.scheduler.schedule_chance("encounter", self.EVENT_CHANCE * self.step_scale)
     
     def restart_game(self):
         self.start_game()
     
+    def load_game(self, path=None):
+        """Continue the session stored in a snapshot, if there is one"""
+        path = path or self.SAVE_PATH
+        if not os.path.exists(path):
+            return False
+        load_engine(path, self)
+        # Everything on screen may have changed
+        self.drawn_state = None
+        return True
+    
+    def current_terrain(self):
+        """Terrain code under the player, which event weights depend on"""
+        return self.world.get_terrain_code_at(self.player.x, self.player.y)
+    
     def advance_day(self):
         # Daily resource consumption
         self.resource_manager.consume_daily_resources()
@@ -155,5 +351,10 @@ class GameEngine:
             self.player.health -= 15
         
         # Random daily events
-        if random.randint(1, 3) == 1:
-            self.event_manager.trigger_daily_event(self.player, self.resource_manager)
\ No newline at end of file
+        if self.rng.randint(1, 3) == 1:
+            self.event_manager.trigger_daily_event(self.player, self.resource_manager,
+                                                   self.current_terrain(), self.day)
+        
+        # A snapshot a day for crash recovery
+        if self.autosave:
+            save_engine(self, self.SAVE_PATH)
\ No newline at end of file
@@ -0,0 +1,298 @@
+"""
+Structure-of-arrays hazard store
+Hazards live in NumPy columns (x, y, radius, type code, active) so storm
+drift, clamping and activation are single vectorized operations. A
+spatial hash narrows collision queries to nearby hazards and is only
+touched for the hazards whose grid cells changed. HazardView gives the
+old per-hazard dict interface on top of the columns
+"""
+
+from collections.abc import MutableMapping
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .spatial import SpatialHash
+
+HAZARD_TYPES = ["storm", "predator", "bandit_camp"]
+HAZARD_CODES = {name: code for code, name in enumerate(HAZARD_TYPES)}
+STORM = HAZARD_CODES["storm"]
+PREDATOR = HAZARD_CODES["predator"]
+BANDIT_CAMP = HAZARD_CODES["bandit_camp"]
+
+HAZARD_KEYS = ("x", "y", "type", "active", "radius")
+
+
+class HazardView(MutableMapping):
+    """Dict-like view of one row of a HazardSet"""
+
+    __slots__ = ("hazards", "index")
+
+    def __init__(self, hazards: "HazardSet", index: int):
+        self.hazards = hazards
+        self.index = index
+
+    def __getitem__(self, key):
+        hazards, i = self.hazards, self.index
+        if key == "x":
+            return float(hazards.x[i])
+        if key == "y":
+            return float(hazards.y[i])
+        if key == "radius":
+            return float(hazards.radius[i])
+        if key == "type":
+            return HAZARD_TYPES[hazards.type[i]]
+        if key == "active":
+            return bool(hazards.active[i])
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        hazards, i = self.hazards, self.index
+        if key == "type":
+            hazards.type[i] = HAZARD_CODES[value]
+            hazards.types_changed()
+        elif key == "active":
+            hazards.active[i] = value
+        elif key in ("x", "y", "radius"):
+            getattr(hazards, key)[i] = value
+            hazards.reindex([i])
+        else:
+            raise KeyError(key)
+
+    def __delitem__(self, key):
+        raise TypeError("Hazard fields cannot be deleted")
+
+    def __iter__(self):
+        return iter(HAZARD_KEYS)
+
+    def __len__(self):
+        return len(HAZARD_KEYS)
+
+    def __repr__(self):
+        return f"HazardView({dict(self)})"
+
+
+class HazardSet:
+    """Hazards stored column-wise with a spatial index"""
+
+    # Largest point x hazard test done densely instead of through the index
+    DENSE_PAIRS = 1 << 17
+
+    def __init__(self, cell_size: float = 80, capacity: int = 16):
+        self.index = SpatialHash(cell_size)
+        self.size = 0
+        self._allocate(capacity)
+        self._storms = np.zeros(0, dtype=np.int64)
+
+    def _allocate(self, capacity: int):
+        old = self.size
+        columns = {
+            "_x": np.float64, "_y": np.float64, "_radius": np.float64,
+            "_type": np.uint8, "_active": np.bool_,
+            # Grid cell range each hazard is registered under
+            "_cell_x0": np.int64, "_cell_x1": np.int64,
+            "_cell_y0": np.int64, "_cell_y1": np.int64,
+        }
+        for name, dtype in columns.items():
+            column = np.zeros(capacity, dtype=dtype)
+            if old:
+                column[:old] = getattr(self, name)[:old]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    # Columns trimmed to the hazards in use
+    x = property(lambda self: self._x[:self.size])
+    y = property(lambda self: self._y[:self.size])
+    radius = property(lambda self: self._radius[:self.size])
+    type = property(lambda self: self._type[:self.size])
+    active = property(lambda self: self._active[:self.size])
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> HazardView:
+        if not -self.size <= index < self.size:
+            raise IndexError(index)
+        return HazardView(self, index % self.size)
+
+    def __iter__(self) -> Iterator[HazardView]:
+        return (HazardView(self, i) for i in range(self.size))
+
+    def clear(self):
+        self.size = 0
+        self.index.clear()
+        self._storms = np.zeros(0, dtype=np.int64)
+
+    def add(self, x: float, y: float, hazard_type: str, radius: float, active: bool = True) -> int:
+        """Append one hazard and return its index"""
+        return int(self.add_many([x], [y], [hazard_type], [radius], [active])[0])
+
+    def add_many(self, x: Sequence[float], y: Sequence[float], types: Sequence,
+                 radius: Sequence[float], active: Optional[Sequence[bool]] = None) -> np.ndarray:
+        """Append hazards column-wise; types may be names or codes"""
+        count = len(x)
+        start, end = self.size, self.size + count
+        if end > self.capacity:
+            self._allocate(max(end, self.capacity * 2))
+
+        codes = [HAZARD_CODES[t] if isinstance(t, str) else t for t in types]
+        self._x[start:end] = x
+        self._y[start:end] = y
+        self._type[start:end] = codes
+        self._radius[start:end] = radius
+        self._active[start:end] = True if active is None else active
+        self.size = end
+
+        indices = np.arange(start, end)
+        self.reindex(indices, force=True)
+        self.types_changed()
+        return indices
+
+    def types_changed(self):
+        self._storms = np.flatnonzero(self.type == STORM)
+
+    def _cell_ranges(self, indices) -> Tuple[np.ndarray, ...]:
+        size = self.index.cell_size
+        x, y, radius = self._x[indices], self._y[indices], self._radius[indices]
+        return (np.floor((x - radius) / size).astype(np.int64),
+                np.floor((x + radius) / size).astype(np.int64),
+                np.floor((y - radius) / size).astype(np.int64),
+                np.floor((y + radius) / size).astype(np.int64))
+
+    def reindex(self, indices=None, force: bool = False):
+        """Re-bucket hazards whose grid cells changed; all hazards if indices is None"""
+        if indices is None:
+            self.index.clear()
+            indices = np.arange(self.size)
+            force = True
+        indices = np.asarray(indices, dtype=np.int64)
+
+        x0, x1, y0, y1 = self._cell_ranges(indices)
+        if force:
+            changed = indices
+        else:
+            changed = indices[(x0 != self._cell_x0[indices]) | (x1 != self._cell_x1[indices])
+                              | (y0 != self._cell_y0[indices]) | (y1 != self._cell_y1[indices])]
+
+        self._cell_x0[indices] = x0
+        self._cell_x1[indices] = x1
+        self._cell_y0[indices] = y0
+        self._cell_y1[indices] = y1
+
+        # Distances are always tested against the columns, so the index
+        # only needs to know about hazards that crossed a cell boundary
+        x, y, radius = self._x, self._y, self._radius
+        for i in changed.tolist():
+            self.index.insert(i, x[i], y[i], radius[i])
+
+    def drift_storms(self, rng, step_scale: float = 1.0, bounds: Tuple[float, float, float, float] = None):
+        """Move every storm by a random step of -2..2 per axis, clamped to (left, top, right, bottom)"""
+        storms = self._storms
+        if not len(storms):
+            return
+        steps = rng.integers(-2, 3, size=(2, len(storms))) * step_scale
+        x = self._x[storms] + steps[0]
+        y = self._y[storms] + steps[1]
+        if bounds is not None:
+            left, top, right, bottom = bounds
+            np.clip(x, left, right, out=x)
+            np.clip(y, top, bottom, out=y)
+        self._x[storms] = x
+        self._y[storms] = y
+        self.reindex(storms)
+
+    def set_active(self, selection, active: bool = True):
+        """Activate or deactivate hazards selected by index array or boolean mask"""
+        self.active[selection] = active
+
+    def _hits(self, candidates, x: float, y: float) -> np.ndarray:
+        """Active candidate hazards whose circles contain (x, y)"""
+        candidates = np.fromiter(candidates, np.int64)
+        if not len(candidates):
+            return candidates
+        dx = self._x[candidates] - x
+        dy = self._y[candidates] - y
+        radius = self._radius[candidates]
+        inside = (dx * dx + dy * dy < radius * radius) & self._active[candidates]
+        return candidates[inside]
+
+    def first_hit(self, x: float, y: float) -> Optional[int]:
+        """Lowest index of an active hazard containing (x, y)"""
+        hits = self._hits(self.index.members_at(x, y), x, y)
+        return int(hits.min()) if len(hits) else None
+
+    def hit_pairs(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(point, hazard) index pairs where an active hazard contains the point
+
+        Points are bucketed by grid cell, so each point is only tested
+        against the hazards registered in its own cell. Pairs are ordered
+        by point.
+        """
+        count = len(x)
+        if not count or not self.size:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        active = np.flatnonzero(self.active)
+        if count * len(active) <= self.DENSE_PAIRS:
+            # With few hazards one dense test is cheaper than bucketing;
+            # hazards along the first axis keep the long point axis contiguous
+            dx = self._x[active, None] - x
+            dy = self._y[active, None] - y
+            dx *= dx
+            dy *= dy
+            dx += dy
+            hit, point = np.divmod(np.flatnonzero(dx < self._radius[active, None] ** 2), count)
+            order = np.argsort(point, kind="stable")
+            return point[order], active[hit[order]]
+
+        # Candidates are gathered once per distinct cell, not once per point
+        size = self.index.cell_size
+        cell_x = np.floor(x / size).astype(np.int64)
+        cell_y = np.floor(y / size).astype(np.int64)
+        low_x, low_y = cell_x.min(), cell_y.min()
+        keys = (cell_x - low_x) * (cell_y.max() - low_y + 1) + (cell_y - low_y)
+        _, first_point, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        cells = self.index.cells
+        members = [np.fromiter(cells.get(cell, ()), np.int64)
+                   for cell in zip(cell_x[first_point].tolist(), cell_y[first_point].tolist())]
+        sizes = np.array([len(candidates) for candidates in members], dtype=np.int64)
+        starts = np.cumsum(sizes) - sizes
+        candidates = np.concatenate(members)
+        if not len(candidates):
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        # One (point, candidate) pair per candidate of the point's cell
+        pair_sizes = sizes[inverse]
+        ends = np.cumsum(pair_sizes)
+        pairs = np.arange(ends[-1]) + np.repeat(starts[inverse] - (ends - pair_sizes), pair_sizes)
+        hazards = candidates[pairs]
+        dx = self._x[hazards] - np.repeat(x, pair_sizes)
+        dy = self._y[hazards] - np.repeat(y, pair_sizes)
+        dx *= dx
+        dy *= dy
+        dx += dy
+        hits = np.flatnonzero((dx < self._radius[hazards] ** 2) & self._active[hazards])
+        return np.searchsorted(ends, hits, side="right"), hazards[hits]
+
+    def first_hits(self, points) -> List[Optional[int]]:
+        """first_hit for many entities at once, as one batched distance test"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        count = len(points)
+        point, hazard = self.hit_pairs(points[:, 0], points[:, 1])
+
+        # Lowest hitting index per point; `size` marks a miss
+        first = np.full(count, self.size, dtype=np.int64)
+        np.minimum.at(first, point, hazard)
+        return [None if i == self.size else i for i in first.tolist()]
+
+    def query_radius(self, x: float, y: float, radius: float) -> np.ndarray:
+        """Sorted indices of active hazards whose centers lie within radius of (x, y)"""
+        candidates = np.fromiter(self.index.members_near(x, y, radius), np.int64)
+        if not len(candidates):
+            return candidates
+        dx = self._x[candidates] - x
+        dy = self._y[candidates] - y
+        inside = (dx * dx + dy * dy <= radius * radius) & self._active[candidates]
+        return np.sort(candidates[inside])
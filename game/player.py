@@ -28,7 +28,13 @@ class Player:
         self.dx = 0
         self.dy = 0
         
-    def update(self):
+        # Position at the start of the last update, for interpolated drawing
+        self.prev_x = x
+        self.prev_y = y
+        
+    def update(self, step_scale=1.0):
+        self.prev_x = self.x
+        self.prev_y = self.y
         if not self.alive:
             return
             
@@ -51,9 +57,9 @@ class Player:
             self.dx *= 0.707  # 1/sqrt(2)
             self.dy *= 0.707
         
-        # Update position
-        self.x += self.dx
-        self.y += self.dy
+        # Update position (speed is per frame at the nominal fps)
+        self.x += self.dx * step_scale
+        self.y += self.dy * step_scale
         
         # Update color based on health
         if self.health > 70:
@@ -69,33 +75,39 @@ class Player:
         if self.health <= 0:
             self.alive = False
     
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0, offset=(0, 0)):
+        """Draw the player and return the rect of the screen it covered"""
+        # Interpolate between the last two simulation steps
+        x = self.prev_x + (self.x - self.prev_x) * alpha + offset[0]
+        y = self.prev_y + (self.y - self.prev_y) * alpha + offset[1]
+        
         if not self.alive:
             # Draw as a skull or X
-            pygame.draw.line(screen, (255, 0, 0), 
-                           (self.x - self.size//2, self.y - self.size//2),
-                           (self.x + self.size//2, self.y + self.size//2), 3)
-            pygame.draw.line(screen, (255, 0, 0), 
-                           (self.x + self.size//2, self.y - self.size//2),
-                           (self.x - self.size//2, self.y + self.size//2), 3)
+            rect = pygame.draw.line(screen, (255, 0, 0), 
+                           (x - self.size//2, y - self.size//2),
+                           (x + self.size//2, y + self.size//2), 3)
+            return rect.union(pygame.draw.line(screen, (255, 0, 0), 
+                           (x + self.size//2, y - self.size//2),
+                           (x - self.size//2, y + self.size//2), 3))
         else:
             # Draw player as a circle
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
+            rect = pygame.draw.circle(screen, self.color, (int(x), int(y)), self.size)
             
             # Draw health bar above player
             bar_width = 30
             bar_height = 5
-            bar_x = self.x - bar_width // 2
-            bar_y = self.y - self.size - 10
+            bar_x = x - bar_width // 2
+            bar_y = y - self.size - 10
             
             # Background bar
-            pygame.draw.rect(screen, (100, 100, 100), 
-                           (bar_x, bar_y, bar_width, bar_height))
+            rect.union_ip(pygame.draw.rect(screen, (100, 100, 100), 
+                           (bar_x, bar_y, bar_width, bar_height)))
             
             # Health bar
             health_width = int((self.health / self.max_health) * bar_width)
             pygame.draw.rect(screen, self.health_color, 
                            (bar_x, bar_y, health_width, bar_height))
+            return rect
     
     def take_damage(self, damage):
         self.health -= damage
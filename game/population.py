@@ -0,0 +1,309 @@
+"""
+Vectorized population simulator mirroring the GameState rules
+Holds N independent games as NumPy columns and applies the daily
+consumption, daily events and random encounter choices of
+core_game.GameState to all of them at once with masked array operations
+"""
+
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from .core_game import GameState
+from .event_catalog import Outcome
+from .rng import GameRNG
+from .simulation import BatchReport, DEFAULT_DT, DEFAULT_EVENT_CHANCE, frames_per_day
+
+# Random encounters of GameState.trigger_random_event and their choices, in order
+CATALOG = GameState.CATALOG
+EVENT_TITLES = tuple(event["title"] for event in CATALOG.encounters)
+EVENT_CHOICE_IDS = tuple(CATALOG.choice_ids())
+# Choices of all encounters are numbered consecutively; an encounter's
+# codes start at its offset
+CHOICE_COUNTS = np.array([len(choices) for choices in EVENT_CHOICE_IDS], dtype=np.int64)
+CHOICE_OFFSETS = np.concatenate([[0], np.cumsum(CHOICE_COUNTS)[:-1]])
+CHOICE_CODES = {choice_id: int(CHOICE_OFFSETS[event]) + index
+                for event, choices in enumerate(EVENT_CHOICE_IDS)
+                for index, choice_id in enumerate(choices)}
+CHOICE_RECORDS = tuple(CATALOG.choices[choice_id]
+                       for choices in EVENT_CHOICE_IDS for choice_id in choices)
+assert len(CHOICE_CODES) == len(CHOICE_RECORDS), "Choice ids must be unique across encounters"
+assert all(CHOICE_RECORDS[code].choice_id == choice_id for choice_id, code in CHOICE_CODES.items())
+
+# Daily events of GameState.trigger_daily_event, in catalog order
+DAILY_OUTCOMES = tuple(outcome for _, outcome in CATALOG.daily_events)
+
+# GameState attributes that are stored under a different column name
+ATTRIBUTE_COLUMNS = {"player_health": "health", "player_stamina": "stamina",
+                     "player_morale": "morale"}
+
+# Cause of death codes
+CAUSE_NONE = 0
+CAUSE_VICTORY = 1
+CAUSE_EXHAUSTION = 2
+CAUSE_DEHYDRATION = 3
+CAUSE_STARVATION = 4
+CAUSE_EXPOSURE = 5
+CAUSE_WEATHER = 6
+CAUSE_EVENT = 7  # + event index
+CAUSE_NAMES = ("timeout", "victory", "exhaustion", "dehydration", "starvation",
+               "exposure", "weather") + EVENT_TITLES
+
+
+class PopulationState:
+    """N parallel GameState games stored as structure-of-arrays columns"""
+
+    COLUMNS = ("health", "stamina", "morale", "food", "water", "medicine",
+               "fuel", "weapons", "distance")
+
+    def __init__(self, size: int, seed: Optional[int] = None,
+                 start_overrides: Optional[Dict] = None):
+        self.size = size
+        self.rng = GameRNG(seed).numpy()
+
+        # Starting values come from a reference GameState so the two never drift
+        reference = GameState()
+        for name, value in (start_overrides or {}).items():
+            setattr(reference, name, value)
+        start = {
+            "health": reference.player_health,
+            "stamina": reference.player_stamina,
+            "morale": reference.player_morale,
+            "food": reference.food,
+            "water": reference.water,
+            "medicine": reference.medicine,
+            "fuel": reference.fuel,
+            "weapons": reference.weapons,
+            "distance": reference.distance_traveled,
+        }
+        for name in self.COLUMNS:
+            setattr(self, name, np.full(size, start[name], dtype=np.float64))
+        self.target_distance = reference.target_distance
+
+        self.day = np.full(size, reference.day, dtype=np.int32)
+        self.alive = np.ones(size, dtype=bool)
+        self.victory = np.zeros(size, dtype=bool)
+        self.cause = np.zeros(size, dtype=np.int8)
+        self.events_faced = np.zeros(size, dtype=np.int32)
+
+    @property
+    def active(self) -> np.ndarray:
+        """Mask of games that are still being played"""
+        return self.alive & ~self.victory
+
+    def _select(self, games: Optional[np.ndarray]) -> np.ndarray:
+        """Normalize a boolean mask (or None for all active games) to indices"""
+        if games is None:
+            games = self.active
+        return np.flatnonzero(games) if games.dtype == bool else games
+
+    def _add_random(self, column: np.ndarray, index: np.ndarray, low: int, high: int, sign: int = 1):
+        """column[index] += sign * random.randint(low, high), one draw per game"""
+        column[index] += sign * self.rng.integers(low, high + 1, index.size)
+
+    def walk(self, frames, speed: float, min_stamina: float = 0.0,
+             games: Optional[np.ndarray] = None):
+        """Apply up to `frames` move_player(speed, 0) calls per game in closed form
+
+        Mirrors simulation.make_walk_policy: games stop walking once stamina
+        reaches `min_stamina` and games that reach the target are won.
+        `frames` is a scalar or one value per selected game.
+        """
+        if speed <= 0:
+            return
+        index = self._select(games)
+        frames = np.broadcast_to(frames, index.shape)
+        walking = self.stamina[index] > min_stamina
+        index, frames = index[walking], frames[walking]
+
+        drain = speed * 0.01
+        stamina = self.stamina[index]
+        steps = np.minimum(frames, np.ceil((stamina - min_stamina) / drain))
+
+        # Stop at the frame the target distance is reached
+        to_target = np.maximum(1, np.ceil((self.target_distance - self.distance[index]) / (speed * 0.1)))
+        won = to_target <= steps
+        steps = np.where(won, to_target, steps)
+
+        # Frames after stamina runs out cost 0.5 health each
+        exhausted_from = np.maximum(1, np.floor(stamina / drain) + 1)
+        exhausted = np.maximum(0, steps - exhausted_from + 1)
+        self.distance[index] += steps * speed * 0.1
+        self.stamina[index] = np.where(exhausted > 0, 0, stamina - steps * drain)
+        self.health[index] -= 0.5 * exhausted
+
+        died = self.health[index] <= 0
+        self.alive[index[died]] = False
+        self.cause[index[died]] = CAUSE_EXHAUSTION
+        won = index[won & ~died]
+        self.victory[won] = True
+        self.cause[won] = CAUSE_VICTORY
+
+    def advance_day(self, games: Optional[np.ndarray] = None):
+        """GameState.advance_day for every selected game"""
+        index = self._select(games)
+        self.day[index] += 1
+
+        # Daily resource consumption
+        self._add_random(self.food, index, 3, 7, -1)
+        self._add_random(self.water, index, 5, 10, -1)
+        self._add_random(self.fuel, index, 1, 3, -1)
+
+        # Apply effects of resource shortage
+        for column, damage in ((self.food, 15), (self.water, 20), (self.fuel, 5)):
+            short = index[column[index] <= 0]
+            self.health[short] -= damage
+            column[short] = 0
+
+        # Restore some stamina each day
+        self.stamina[index] = np.minimum(100, self.stamina[index] + 20)
+
+        # Random daily events
+        self.trigger_daily_event(index[self.rng.integers(1, 4, index.size) == 1])
+
+        # Attribute deaths the same way the headless simulator does
+        died = index[self.health[index] <= 0]
+        self.cause[died] = np.select(
+            [self.water[died] == 0, self.food[died] == 0, self.fuel[died] == 0],
+            [CAUSE_DEHYDRATION, CAUSE_STARVATION, CAUSE_EXPOSURE],
+            CAUSE_WEATHER,
+        )
+        self.alive[died] = False
+
+    def trigger_daily_event(self, games: np.ndarray):
+        """GameState.trigger_daily_event for every selected game"""
+        index = self._select(games)
+        event = self.rng.integers(0, len(DAILY_OUTCOMES), index.size)
+        for code, outcome in enumerate(DAILY_OUTCOMES):
+            self.apply_outcome(outcome, index[event == code])
+
+    def trigger_random_event(self, games: np.ndarray) -> np.ndarray:
+        """Draw a random encounter index for every selected game"""
+        index = self._select(games)
+        self.events_faced[index] += 1
+        return self.rng.integers(0, len(EVENT_TITLES), index.size).astype(np.int8)
+
+    def column(self, attribute: str) -> np.ndarray:
+        """Column holding a GameState attribute"""
+        return getattr(self, ATTRIBUTE_COLUMNS.get(attribute, attribute))
+
+    def apply_outcome(self, outcome: Outcome, index: np.ndarray):
+        """Outcome.apply for every selected game"""
+        for attribute, delta in outcome.deltas:
+            self.column(attribute)[index] += delta
+        for attribute, low, high, sign in outcome.rolls:
+            self._add_random(self.column(attribute), index, low, high, sign)
+
+    def handle_event_choice(self, choices: np.ndarray, games: np.ndarray):
+        """GameState.handle_event_choice for every selected game
+
+        `choices` holds one CHOICE_CODES value per selected game.
+        """
+        index = self._select(games)
+        for code, record in enumerate(CHOICE_RECORDS):
+            chosen = index[choices == code]
+            if record.odds is not None:
+                success = self.rng.integers(1, record.odds + 1, chosen.size) == 1
+            elif record.requires is not None:
+                success = self.column(record.requires)[chosen] > 0
+            else:
+                self.apply_outcome(record.success, chosen)
+                continue
+            self.apply_outcome(record.success, chosen[success])
+            self.apply_outcome(record.failure, chosen[~success])
+
+
+class PopulationSimulator:
+    """Plays N GameState games side by side, one day per vectorized step"""
+
+    def __init__(self, size: int, speed: float = 0.0, min_stamina: float = 0.0,
+                 choice_policy: str = "random", dt: float = DEFAULT_DT,
+                 max_days: int = 365, event_chance: float = DEFAULT_EVENT_CHANCE,
+                 start_overrides: Optional[Dict] = None, seed: Optional[int] = None):
+        if choice_policy not in ("random", "first"):
+            raise ValueError(f"Unknown choice policy: {choice_policy}")
+        self.size = size
+        self.speed = speed
+        self.min_stamina = min_stamina
+        self.choice_policy = choice_policy
+        self.max_days = max_days
+        self.event_chance = event_chance
+        self.start_overrides = start_overrides
+        self.seed = seed
+        self.frames_per_day = frames_per_day(dt)
+        self.elapsed = 0.0
+
+    def choose(self, state: PopulationState, events: np.ndarray) -> np.ndarray:
+        """Vectorized counterpart of the headless choice policies"""
+        offsets = CHOICE_OFFSETS[events]
+        if self.choice_policy == "first":
+            return offsets
+        return offsets + state.rng.integers(0, CHOICE_COUNTS[events])
+
+    def run(self) -> PopulationState:
+        """Play every game to death, victory or max_days"""
+        start = time.perf_counter()
+        state = PopulationState(self.size, self.seed, self.start_overrides)
+        to_event = np.zeros(state.size, dtype=np.int64)
+        self.schedule_encounters(state, np.arange(state.size), to_event)
+
+        while True:
+            playing = np.flatnonzero(state.active & (state.day <= self.max_days))
+            if not playing.size:
+                break
+
+            # Walk each game up to its next encounter or the end of the day,
+            # like the headless simulator's boundary jumps
+            day_left = np.zeros(state.size, dtype=np.int64)
+            day_left[playing] = self.frames_per_day
+            index = playing
+            while index.size:
+                frames = np.minimum(to_event[index], day_left[index])
+                state.walk(frames, self.speed, self.min_stamina, index)
+                day_left[index] -= frames
+                to_event[index] -= frames
+                index = index[state.alive[index] & ~state.victory[index] & (day_left[index] > 0)]
+                self.resolve_encounters(state, index[to_event[index] == 0], to_event)
+                index = index[state.alive[index]]
+
+            # Encounters rolled on the last frame of the day come after advance_day
+            ending = playing[state.alive[playing] & ~state.victory[playing]]
+            state.advance_day(ending)
+            ending = ending[state.alive[ending]]
+            self.resolve_encounters(state, ending[to_event[ending] == 0], to_event)
+
+        self.elapsed = time.perf_counter() - start
+        return state
+
+    def schedule_encounters(self, state: PopulationState, index: np.ndarray, to_event: np.ndarray):
+        """Sample frames until the next random encounter of the selected games"""
+        if self.event_chance > 0:
+            to_event[index] = state.rng.geometric(min(1.0, self.event_chance), index.size)
+        else:
+            to_event[index] = np.iinfo(np.int64).max
+
+    def resolve_encounters(self, state: PopulationState, index: np.ndarray, to_event: np.ndarray):
+        """Trigger, resolve and reschedule the encounters of the selected games"""
+        if not index.size:
+            return
+        events = state.trigger_random_event(index)
+        state.handle_event_choice(self.choose(state, events), index)
+        died = state.health[index] <= 0
+        state.alive[index[died]] = False
+        state.cause[index[died]] = CAUSE_EVENT + events[died]
+        self.schedule_encounters(state, index, to_event)
+
+    def report(self, state: PopulationState) -> BatchReport:
+        """Summarize a finished population as a headless BatchReport"""
+        report = BatchReport()
+        report.runs = state.size
+        report.victories = int(state.victory.sum())
+        report.total_days = int(state.day.sum())
+        days, counts = np.unique(state.day, return_counts=True)
+        report.day_histogram = {int(day): int(count) for day, count in zip(days, counts)}
+        causes = np.bincount(state.cause, minlength=len(CAUSE_NAMES))
+        report.causes = {CAUSE_NAMES[code]: int(count)
+                         for code, count in enumerate(causes) if count}
+        report.elapsed = self.elapsed
+        return report
@@ -0,0 +1,164 @@
+"""
+Opt-in frame-time profiler
+Game loops wrap their phases in named sections; the time spent in each
+section during a frame is kept in a fixed-size ring buffer of recent
+frames. Percentiles can be shown in an on-screen overlay or dumped as
+JSON or CSV. While disabled every call returns immediately, so the
+instrumentation can stay in the hot paths
+"""
+
+import csv
+import json
+import time
+from typing import Dict, List, Optional
+
+
+class _NullSection:
+    """Context manager that does nothing, shared by every disabled section"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    __slots__ = ("frame", "name", "start")
+
+    def __init__(self, frame: Dict[str, float], name: str):
+        self.frame = frame
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.frame[self.name] = self.frame.get(self.name, 0.0) + elapsed
+        return False
+
+
+class FrameProfiler:
+    """Per-section frame timings over the last `capacity` frames"""
+
+    def __init__(self, capacity: int = 600, enabled: bool = False):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.overlay_visible = False
+        self.clear()
+
+    def clear(self):
+        # Ring buffer of {section: seconds} dicts, one per frame
+        self.frames: List[Optional[Dict[str, float]]] = [None] * self.capacity
+        self.position = 0
+        self.frame_count = 0
+        self._frame: Dict[str, float] = {}
+        self._frame_start = 0.0
+
+    def toggle_overlay(self):
+        """Show or hide the overlay; showing it also turns recording on"""
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.enabled = True
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._frame = {}
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        frame = self._frame
+        frame["frame"] = time.perf_counter() - self._frame_start
+        self.frames[self.position] = frame
+        self.position = (self.position + 1) % self.capacity
+        self.frame_count += 1
+
+    def section(self, name: str):
+        """Context manager adding the time spent inside it to `name` for this frame"""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self._frame, name)
+
+    def recorded_frames(self) -> List[Dict[str, float]]:
+        """Recorded frames, oldest first"""
+        if self.frame_count < self.capacity:
+            return self.frames[:self.frame_count]
+        return self.frames[self.position:] + self.frames[:self.position]
+
+    def section_names(self) -> List[str]:
+        names = {}
+        for frame in self.recorded_frames():
+            names.update(dict.fromkeys(frame))
+        return sorted(names, key=lambda name: (name != "frame", name))
+
+    def stats(self, name: str) -> Dict[str, float]:
+        """Percentiles in milliseconds of one section over the frames it ran in"""
+        samples = sorted(frame[name] * 1000.0 for frame in self.recorded_frames() if name in frame)
+        if not samples:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+        def percentile(p):
+            return samples[min(len(samples) - 1, int(p / 100.0 * len(samples)))]
+
+        return {
+            "count": len(samples),
+            "mean": sum(samples) / len(samples),
+            "p50": percentile(50),
+            "p95": percentile(95),
+            "p99": percentile(99),
+            "max": samples[-1],
+        }
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {name: self.stats(name) for name in self.section_names()}
+
+    def dump_json(self, path: str):
+        """Write the summary and the raw frames for offline analysis"""
+        with open(path, "w") as f:
+            json.dump({"summary": self.summary(), "frames": self.recorded_frames()}, f, indent=2)
+
+    def dump_csv(self, path: str):
+        """Write one row per recorded frame, one column per section, in milliseconds"""
+        names = self.section_names()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            for frame in self.recorded_frames():
+                writer.writerow([f"{frame[name] * 1000.0:.4f}" if name in frame else ""
+                                 for name in names])
+
+    def overlay_lines(self) -> List[str]:
+        lines = [f"{'section':<18}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<18}{stats['p50']:>7.2f}{stats['p95']:>7.2f}{stats['p99']:>7.2f}")
+        return lines
+
+    def draw_overlay(self, screen, position=(10, 10)):
+        """Draw the percentile table onto a pygame surface and return its rect"""
+        import pygame
+        from .text_cache import get_font, render_text
+
+        font = get_font(18)
+        lines = [render_text(font, line, True, (255, 255, 0)) for line in self.overlay_lines()]
+        width = max(line.get_width() for line in lines) + 10
+        height = sum(line.get_height() for line in lines) + 10
+
+        rect = pygame.Rect(position[0], position[1], width, height)
+        background = pygame.Surface(rect.size)
+        background.set_alpha(200)
+        background.fill((0, 0, 0))
+        screen.blit(background, rect)
+
+        y = rect.y + 5
+        for line in lines:
+            screen.blit(line, (rect.x + 5, y))
+            y += line.get_height()
+        return rect
@@ -0,0 +1,302 @@
+"""
+Input logs and deterministic replay of GameState sessions
+A session is fully determined by its RNG seed and the inputs fed to
+GameState: movement deltas, rests, event choices and the dt of every
+update() tick. InputLog stores the inputs and the dts as two separate run-length
+encoded streams, so idle or held-key frames collapse into one run even
+when the frame time varies, and packs them with struct. Replay re-runs a
+log without rendering to any tick, keeping periodic keyframes so seeking
+back only replays from the nearest one
+"""
+
+import bisect
+import json
+import struct
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .rng import GameRNG
+
+MAGIC = b"DGIL"
+VERSION = 2
+
+# Input operations of one tick, in the order they were made
+MOVE = 0
+CHOICE = 1
+REST = 2
+
+Frame = Tuple[Optional[float], Tuple]
+
+# Seeds may be any Python int (unseeded sessions use 64 unsigned bits,
+# callers may pass negative ones), so they are stored as decimal text
+_HEADER = struct.Struct("<4sHII")
+_DT_RUN = struct.Struct("<Id")
+_RUN = struct.Struct("<IH")
+_MOVE = struct.Struct("<Bdd")
+_CHOICE = struct.Struct("<BB")
+_REST = struct.Struct("<B")
+_LENGTH = struct.Struct("<I")
+
+
+def _random_state(state):
+    """random.Random state with the tuples JSON turned into lists restored"""
+    version, internal, gauss = state
+    return version, tuple(internal), gauss
+
+
+def _rng_state_from_json(state: Dict) -> Dict:
+    state = dict(state)
+    state["random"] = _random_state(state["random"])
+    if state["buffer"] is not None:
+        refill, position = state["buffer"]
+        state["buffer"] = (None if refill is None else _random_state(refill), position)
+    state["streams"] = {name: _rng_state_from_json(child) for name, child in state["streams"].items()}
+    return state
+
+
+class InputLog:
+    """Append-only, run-length encoded log of the inputs of one session"""
+
+    def __init__(self, seed: int, rng_state: Optional[Dict] = None):
+        self.seed = seed
+        # Only needed when the session did not start from a freshly seeded RNG
+        self.rng_state = rng_state
+        # [count, ops] runs of ticks with identical inputs, and [count, dt]
+        # runs of ticks with identical frame times
+        self.runs: List[List] = []
+        self.dt_runs: List[List] = []
+        self.ticks = 0
+        self._ops: List[Tuple] = []
+        # Tick at which each run starts, for seeking
+        self._starts: List[int] = []
+        self._dt_starts: List[int] = []
+
+    @classmethod
+    def start(cls, rng: GameRNG) -> "InputLog":
+        """Log for a session starting at the current position of `rng`"""
+        state = rng.get_state()
+        fresh = GameRNG(rng.seed, rng.buffer_size).get_state()
+        return cls(rng.seed, None if state == fresh else state)
+
+    def __len__(self) -> int:
+        return self.ticks
+
+    def move(self, dx: float, dy: float):
+        self._ops.append((MOVE, dx, dy))
+
+    def choice(self, choice_id: str):
+        self._ops.append((CHOICE, choice_id))
+
+    def rest(self):
+        self._ops.append((REST,))
+
+    def tick(self, dt: float):
+        """Close the current tick, folding it into the last runs when identical"""
+        ops = tuple(self._ops)
+        self._ops = []
+        for runs, starts, value in ((self.runs, self._starts, ops), (self.dt_runs, self._dt_starts, dt)):
+            if runs and runs[-1][1] == value:
+                runs[-1][0] += 1
+            else:
+                runs.append([1, value])
+                starts.append(self.ticks)
+        self.ticks += 1
+
+    def pending(self) -> Tuple:
+        """Inputs made since the last tick"""
+        return tuple(self._ops)
+
+    def frame(self, tick: int) -> Frame:
+        """The (dt, ops) of one tick"""
+        if not 0 <= tick < self.ticks:
+            raise IndexError(tick)
+        return (self.dt_runs[bisect.bisect_right(self._dt_starts, tick) - 1][1],
+                self.runs[bisect.bisect_right(self._starts, tick) - 1][1])
+
+    def frames(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Frame]:
+        """(dt, ops) of every tick from `start` up to `stop`"""
+        stop = self.ticks if stop is None else min(stop, self.ticks)
+        if start >= stop:
+            return
+        run = bisect.bisect_right(self._starts, start) - 1
+        dt_run = bisect.bisect_right(self._dt_starts, start) - 1
+        tick = start
+        while tick < stop:
+            # Step to whichever of the two runs ends first
+            ops_end = self._starts[run] + self.runs[run][0]
+            dt_end = self._dt_starts[dt_run] + self.dt_runs[dt_run][0]
+            end = min(stop, ops_end, dt_end)
+            frame = (self.dt_runs[dt_run][1], self.runs[run][1])
+            for _ in range(end - tick):
+                yield frame
+            tick = end
+            if end == ops_end:
+                run += 1
+            if end == dt_end:
+                dt_run += 1
+
+    def to_bytes(self) -> bytes:
+        rng_state = b"" if self.rng_state is None else json.dumps(self.rng_state).encode()
+        seed = str(self.seed).encode()
+        runs = list(self.runs)
+        if self._ops:
+            # Inputs after the last tick are kept as a run of no ticks
+            runs.append([0, tuple(self._ops)])
+
+        parts = [_HEADER.pack(MAGIC, VERSION, len(self.dt_runs), len(runs)),
+                 _LENGTH.pack(len(seed)), seed, _LENGTH.pack(len(rng_state)), rng_state]
+        parts.extend(_DT_RUN.pack(count, dt) for count, dt in self.dt_runs)
+        for count, ops in runs:
+            parts.append(_RUN.pack(count, len(ops)))
+            for op in ops:
+                if op[0] == MOVE:
+                    parts.append(_MOVE.pack(MOVE, op[1], op[2]))
+                elif op[0] == REST:
+                    parts.append(_REST.pack(REST))
+                else:
+                    name = op[1].encode()
+                    parts.append(_CHOICE.pack(CHOICE, len(name)))
+                    parts.append(name)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "InputLog":
+        view = memoryview(data)
+        magic, version, dt_run_count, run_count = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an input log")
+        if version != VERSION:
+            raise ValueError(f"Unsupported input log version {version}")
+        offset = _HEADER.size
+        (length,) = _LENGTH.unpack_from(view, offset)
+        offset += _LENGTH.size
+        seed = int(bytes(view[offset:offset + length]))
+        offset += length
+        (length,) = _LENGTH.unpack_from(view, offset)
+        offset += _LENGTH.size
+        rng_state = None
+        if length:
+            rng_state = _rng_state_from_json(json.loads(bytes(view[offset:offset + length])))
+        offset += length
+
+        log = cls(seed, rng_state)
+        ticks = 0
+        for _ in range(dt_run_count):
+            count, dt = _DT_RUN.unpack_from(view, offset)
+            offset += _DT_RUN.size
+            log._dt_starts.append(ticks)
+            log.dt_runs.append([count, dt])
+            ticks += count
+        for _ in range(run_count):
+            count, op_count = _RUN.unpack_from(view, offset)
+            offset += _RUN.size
+            ops = []
+            for _ in range(op_count):
+                if view[offset] == MOVE:
+                    _, dx, dy = _MOVE.unpack_from(view, offset)
+                    offset += _MOVE.size
+                    ops.append((MOVE, dx, dy))
+                elif view[offset] == REST:
+                    offset += _REST.size
+                    ops.append((REST,))
+                else:
+                    _, size = _CHOICE.unpack_from(view, offset)
+                    offset += _CHOICE.size
+                    ops.append((CHOICE, bytes(view[offset:offset + size]).decode()))
+                    offset += size
+            if count:
+                log._starts.append(log.ticks)
+                log.runs.append([count, tuple(ops)])
+                log.ticks += count
+            else:
+                log._ops = ops
+        return log
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "InputLog":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def apply_ops(state, ops: Tuple):
+    for op in ops:
+        if op[0] == MOVE:
+            state.move_player(op[1], op[2])
+        elif op[0] == REST:
+            state.rest()
+        else:
+            state.handle_event_choice(op[1])
+
+
+class Replay:
+    """Re-runs an InputLog without rendering, with keyframes for seeking
+
+    `state_factory(rng)` builds the game to replay into; pass a GameState
+    subclass with changed rules to re-score old sessions.
+    """
+
+    def __init__(self, log: InputLog, keyframe_interval: int = 600,
+                 state_factory: Optional[Callable] = None):
+        from .core_game import GameState
+
+        self.log = log
+        self.keyframe_interval = keyframe_interval
+        self.state_factory = state_factory or GameState
+        # tick -> fork of the state before that tick's inputs
+        self.keyframes: Dict[int, object] = {}
+        self.state = self.initial_state()
+        self.tick = 0
+
+    def initial_state(self):
+        rng = GameRNG(self.log.seed)
+        state = self.state_factory(rng)
+        if self.log.rng_state is not None:
+            # The state was captured at the start of the recorded reset_game
+            rng.set_state(self.log.rng_state)
+            state.reset_game()
+        return state
+
+    def _keyframe(self):
+        if self.keyframe_interval and self.tick % self.keyframe_interval == 0 \
+                and self.tick not in self.keyframes:
+            self.keyframes[self.tick] = self.state.fork()
+
+    def seek(self, tick: int):
+        """State after `tick` ticks, fast-forwarding from the nearest keyframe"""
+        tick = max(0, min(tick, self.log.ticks))
+        if tick < self.tick:
+            keyframe = max((k for k in self.keyframes if k <= tick), default=None)
+            if keyframe is None:
+                self.state, self.tick = self.initial_state(), 0
+            else:
+                self.state.restore(self.keyframes[keyframe])
+                self.tick = keyframe
+
+        state = self.state
+        for dt, ops in self.log.frames(self.tick, tick):
+            self._keyframe()
+            apply_ops(state, ops)
+            state.update(dt)
+            self.tick += 1
+        return state
+
+    def run(self):
+        """State at the end of the session, including inputs after the last tick"""
+        state = self.seek(self.log.ticks)
+        apply_ops(state, self.log.pending())
+        return state
+
+    def find(self, predicate: Callable[[object], bool], start: int = 0) -> Optional[int]:
+        """First tick after which predicate(state) holds, e.g. the player died"""
+        self.seek(start)
+        while self.tick < self.log.ticks:
+            if predicate(self.state):
+                return self.tick
+            self.seek(self.tick + 1)
+        return self.tick if predicate(self.state) else None
+
+    def death_tick(self) -> Optional[int]:
+        return self.find(lambda state: not state.player_alive)
@@ -0,0 +1,83 @@
+"""
+Fixed-capacity history of resource levels
+Samples are written into a preallocated NumPy ring buffer with one column
+per resource, so recording never allocates and windowed statistics over
+recent samples are single vectorized operations
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class ResourceHistory:
+    """Ring buffer of resource level samples taken every `cadence` ticks"""
+
+    def __init__(self, names: Sequence[str], capacity: int = 64, cadence: int = 1):
+        self.names = tuple(names)
+        self.capacity = capacity
+        self.cadence = cadence
+        self.data = np.zeros((capacity, len(self.names)))
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        self.position = 0
+        self.ticks = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def tick(self, values: Sequence[float]) -> bool:
+        """Count one tick and record `values` if a sample is due"""
+        self.ticks += 1
+        if self.ticks % self.cadence:
+            return False
+        self.record(values)
+        return True
+
+    def record(self, values: Sequence[float]):
+        self.data[self.position] = values
+        self.position = (self.position + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def window(self, size: Optional[int] = None) -> np.ndarray:
+        """The last `size` samples (all if None), oldest first, one row per sample"""
+        size = self.count if size is None else min(size, self.count)
+        indices = np.arange(self.position - size, self.position) % self.capacity
+        return self.data[indices]
+
+    def latest(self) -> np.ndarray:
+        return self.data[(self.position - 1) % self.capacity]
+
+    def rate(self, size: Optional[int] = None) -> np.ndarray:
+        """Average change per sample over the window; negative while consuming"""
+        samples = self.window(size)
+        if len(samples) < 2:
+            return np.zeros(len(self.names))
+        return (samples[-1] - samples[0]) / (len(samples) - 1)
+
+    def trend(self, size: Optional[int] = None) -> np.ndarray:
+        """Least-squares slope per sample over the window, less sensitive to one-off finds"""
+        samples = self.window(size)
+        if len(samples) < 2:
+            return np.zeros(len(self.names))
+        x = np.arange(len(samples)) - (len(samples) - 1) / 2.0
+        return x @ (samples - samples.mean(axis=0)) / (x @ x)
+
+    def minimum(self, size: Optional[int] = None) -> np.ndarray:
+        samples = self.window(size)
+        return samples.min(axis=0) if len(samples) else np.zeros(len(self.names))
+
+    def maximum(self, size: Optional[int] = None) -> np.ndarray:
+        samples = self.window(size)
+        return samples.max(axis=0) if len(samples) else np.zeros(len(self.names))
+
+    def as_dict(self, values: np.ndarray) -> Dict[str, float]:
+        """Label one value per resource with its name"""
+        return dict(zip(self.names, values.tolist()))
+
+    def records(self, size: Optional[int] = None) -> List[Dict[str, float]]:
+        """The last samples as {resource: level} dicts, oldest first"""
+        return [self.as_dict(row) for row in self.window(size)]
@@ -1,183 +1,200 @@
-import random
+from .rng import GameRNG
+from .terrain import Terrain, terrain_code
+from .resource_history import ResourceHistory
+
+RESOURCE_NAMES = ("food", "water", "medicine", "weapons", "fuel")
+RESOURCE_INDEX = {name: index for index, name in enumerate(RESOURCE_NAMES)}
+FOOD, WATER, MEDICINE, WEAPONS, FUEL = range(len(RESOURCE_NAMES))
+
+# Starting amount, maximum and daily consumption per resource id
+STARTING_AMOUNTS = (50, 40, 10, 5, 20)
+MAX_AMOUNTS = (100, 100, 50, 20, 100)
+DAILY_CONSUMPTION = (3, 5, 0, 0, 2)
+
+# Status labels by fill fraction: the first label whose bound the fraction
+# exceeds, "Empty" otherwise
+STATUS_LEVELS = ((0.7, "Good"), (0.4, "Moderate"), (0.2, "Low"), (0, "Critical"))
+CRITICAL_FRACTION = 0.2
+
+# What foraging can turn up on each terrain code: the chance of finding
+# anything (None for always) and the (resource, min, max) finds, one of
+# which is picked uniformly
+FORAGE_TABLE = {
+    Terrain.WATER: (None, (("water", 5, 15),)),         # Can refill water
+    Terrain.GRASS: (0.3, (("food", 2, 8),)),            # Berries, small game
+    Terrain.MOUNTAIN: (0.2, (("medicine", 1, 3),        # Herbs
+                             ("weapons", 1, 2))),       # Materials
+}
+
+def _slot(column, index):
+    """Property exposing one entry of a per-resource list as an attribute"""
+    def get(self):
+        return getattr(self, column)[index]
+
+    def set(self, value):
+        getattr(self, column)[index] = value
+    return property(get, set)
+
 
 class ResourceManager:
-    def __init__(self):
-        # Starting resources
-        self.food = 50
-        self.water = 40
-        self.medicine = 10
-        self.weapons = 5
-        self.fuel = 20
-        
-        # Maximum resources
-        self.max_food = 100
-        self.max_water = 100
-        self.max_medicine = 50
-        self.max_weapons = 20
-        self.max_fuel = 100
-        
-        # Daily consumption rates
-        self.food_consumption = 3
-        self.water_consumption = 5
-        self.fuel_consumption = 2
+    __slots__ = ("rng", "amounts", "maximums", "consumption", "history_cadence", "history")
+
+    def __init__(self, rng=None, history_cadence=None, history_capacity=64):
+        self.rng = rng or GameRNG()
+        # Amounts, maximums and daily consumption, indexed by resource id
+        self.amounts = list(STARTING_AMOUNTS)
+        self.maximums = list(MAX_AMOUNTS)
+        self.consumption = list(DAILY_CONSUMPTION)
         
-        # Resource history for tracking
-        self.resource_history = []
+        # Resource history for tracking, sampled at the end of every day by
+        # default or every `history_cadence` calls to update()
+        self.history_cadence = history_cadence
+        self.history = ResourceHistory(RESOURCE_NAMES, history_capacity, history_cadence or 1)
+    
+    # Named access to the resource vectors
+    food = _slot("amounts", FOOD)
+    water = _slot("amounts", WATER)
+    medicine = _slot("amounts", MEDICINE)
+    weapons = _slot("amounts", WEAPONS)
+    fuel = _slot("amounts", FUEL)
+    max_food = _slot("maximums", FOOD)
+    max_water = _slot("maximums", WATER)
+    max_medicine = _slot("maximums", MEDICINE)
+    max_weapons = _slot("maximums", WEAPONS)
+    max_fuel = _slot("maximums", FUEL)
+    food_consumption = _slot("consumption", FOOD)
+    water_consumption = _slot("consumption", WATER)
+    fuel_consumption = _slot("consumption", FUEL)
+    
+    @property
+    def resource_history(self):
+        """Last 7 samples as dicts, oldest first"""
+        return self.history.records(7)
+    
+    def levels(self):
+        return tuple(self.amounts)
         
     def update(self):
-        # Record current state
-        self.resource_history.append({
-            "food": self.food,
-            "water": self.water,
-            "medicine": self.medicine,
-            "weapons": self.weapons,
-            "fuel": self.fuel
-        })
-        
-        # Keep only last 7 days of history
-        if len(self.resource_history) > 7:
-            self.resource_history.pop(0)
+        # Called every frame; only records when a frame-cadence sample is due
+        if self.history_cadence:
+            self.history.tick(self.levels())
     
     def consume_daily_resources(self):
         """Called once per day to consume resources"""
-        self.food -= self.food_consumption
-        self.water -= self.water_consumption
-        self.fuel -= self.fuel_consumption
+        amounts = self.amounts
+        for index, rate in enumerate(self.consumption):
+            if rate:
+                # Prevent negative values
+                amounts[index] = max(0, amounts[index] - rate)
         
-        # Prevent negative values
-        self.food = max(0, self.food)
-        self.water = max(0, self.water)
-        self.fuel = max(0, self.fuel)
+        if not self.history_cadence:
+            self.history.record(self.levels())
+    
+    def get_consumption_rates(self, window=7):
+        """Net resources used per history sample over recent samples; negative while stocking up"""
+        return self.history.as_dict(-self.history.rate(window))
     
     def add_resource(self, resource_type, amount):
         """Add resources with maximum limits"""
-        if resource_type == "food":
-            self.food = min(self.max_food, self.food + amount)
-        elif resource_type == "water":
-            self.water = min(self.max_water, self.water + amount)
-        elif resource_type == "medicine":
-            self.medicine = min(self.max_medicine, self.medicine + amount)
-        elif resource_type == "weapons":
-            self.weapons = min(self.max_weapons, self.weapons + amount)
-        elif resource_type == "fuel":
-            self.fuel = min(self.max_fuel, self.fuel + amount)
+        index = RESOURCE_INDEX.get(resource_type)
+        if index is not None:
+            self.amounts[index] = min(self.maximums[index], self.amounts[index] + amount)
     
     def consume_resource(self, resource_type, amount):
         """Consume a specific resource and return if successful"""
-        if resource_type == "food" and self.food >= amount:
-            self.food -= amount
-            return True
-        elif resource_type == "water" and self.water >= amount:
-            self.water -= amount
-            return True
-        elif resource_type == "medicine" and self.medicine >= amount:
-            self.medicine -= amount
-            return True
-        elif resource_type == "weapons" and self.weapons >= amount:
-            self.weapons -= amount
-            return True
-        elif resource_type == "fuel" and self.fuel >= amount:
-            self.fuel -= amount
-            return True
-        return False
+        index = RESOURCE_INDEX.get(resource_type)
+        if index is None or self.amounts[index] < amount:
+            return False
+        self.amounts[index] -= amount
+        return True
+    
+    def apply_transaction(self, changes):
+        """Apply {resource: delta} all at once, or nothing if any resource would go negative"""
+        indexed = []
+        for resource_type, delta in changes.items():
+            index = RESOURCE_INDEX.get(resource_type)
+            if index is None or self.amounts[index] + delta < 0:
+                return False
+            indexed.append((index, delta))
+        
+        amounts, maximums = self.amounts, self.maximums
+        for index, delta in indexed:
+            amounts[index] = min(maximums[index], amounts[index] + delta)
+        return True
     
     def get_resource_status(self):
         """Return a dict of resource statuses"""
         return {
-            "food": {
-                "current": self.food,
-                "max": self.max_food,
-                "status": self.get_resource_level_status(self.food, self.max_food)
-            },
-            "water": {
-                "current": self.water,
-                "max": self.max_water,
-                "status": self.get_resource_level_status(self.water, self.max_water)
-            },
-            "medicine": {
-                "current": self.medicine,
-                "max": self.max_medicine,
-                "status": self.get_resource_level_status(self.medicine, self.max_medicine)
-            },
-            "weapons": {
-                "current": self.weapons,
-                "max": self.max_weapons,
-                "status": self.get_resource_level_status(self.weapons, self.max_weapons)
-            },
-            "fuel": {
-                "current": self.fuel,
-                "max": self.max_fuel,
-                "status": self.get_resource_level_status(self.fuel, self.max_fuel)
-            }
+            name: {"current": current, "max": maximum,
+                   "status": self.get_resource_level_status(current, maximum)}
+            for name, current, maximum in zip(RESOURCE_NAMES, self.amounts, self.maximums)
         }
     
+    def get_status(self, resource_type):
+        """Status string of a single resource"""
+        index = RESOURCE_INDEX[resource_type]
+        return self.get_resource_level_status(self.amounts[index], self.maximums[index])
+    
     def get_resource_level_status(self, current, maximum):
         """Return status string based on resource level"""
         percentage = current / maximum if maximum > 0 else 0
         
-        if percentage > 0.7:
-            return "Good"
-        elif percentage > 0.4:
-            return "Moderate"
-        elif percentage > 0.2:
-            return "Low"
-        elif percentage > 0:
-            return "Critical"
-        else:
-            return "Empty"
+        for bound, status in STATUS_LEVELS:
+            if percentage > bound:
+                return status
+        return "Empty"
+    
+    def is_critical(self, resource_type):
+        """Whether one resource is critically low or empty"""
+        index = RESOURCE_INDEX[resource_type]
+        maximum = self.maximums[index]
+        return maximum <= 0 or self.amounts[index] / maximum <= CRITICAL_FRACTION
     
     def get_critical_resources(self):
         """Return list of critically low resources"""
-        critical = []
-        status = self.get_resource_status()
-        
-        for resource, data in status.items():
-            if data["status"] in ["Critical", "Empty"]:
-                critical.append(resource)
-        
-        return critical
+        return [name for name, current, maximum in zip(RESOURCE_NAMES, self.amounts, self.maximums)
+                if maximum <= 0 or current / maximum <= CRITICAL_FRACTION]
     
-    def can_survive_days(self, days):
+    def can_survive_days(self, days, window=7):
         """Calculate if current resources can sustain for given days"""
-        food_days = self.food / self.food_consumption if self.food_consumption > 0 else float('inf')
-        water_days = self.water / self.water_consumption if self.water_consumption > 0 else float('inf')
-        fuel_days = self.fuel / self.fuel_consumption if self.fuel_consumption > 0 else float('inf')
+        # Forecast from the net daily use actually observed (consumption,
+        # finds and events) once there are at least two daily samples
+        if not self.history_cadence and len(self.history) >= 2:
+            rates = self.get_consumption_rates(window)
+            usage = {name: rates[name] for name in ("food", "water", "fuel")}
+        else:
+            usage = {"food": self.food_consumption, "water": self.water_consumption,
+                     "fuel": self.fuel_consumption}
         
-        min_days = min(food_days, water_days, fuel_days)
+        min_days = float('inf')
+        for name, used in usage.items():
+            amount = getattr(self, name)
+            if amount <= 0:
+                min_days = 0
+            elif used > 0:
+                min_days = min(min_days, amount / used)
         return min_days >= days
     
     def reset(self):
         """Reset to starting resources"""
-        self.food = 50
-        self.water = 40
-        self.medicine = 10
-        self.weapons = 5
-        self.fuel = 20
-        self.resource_history = []
+        self.amounts[:] = STARTING_AMOUNTS
+        self.history.clear()
     
     def find_resources(self, terrain_type):
-        """Find resources based on terrain type"""
+        """Find resources based on a terrain code or terrain type string"""
         resources_found = {}
         
-        if terrain_type == "water":
-            # Can refill water
-            water_found = random.randint(5, 15)
-            resources_found["water"] = water_found
-        
-        elif terrain_type == "grass":
-            # Can find food (berries, small game)
-            if random.random() < 0.3:  # 30% chance
-                food_found = random.randint(2, 8)
-                resources_found["food"] = food_found
+        entry = FORAGE_TABLE.get(terrain_code(terrain_type))
+        if entry is None:
+            return resources_found
         
-        elif terrain_type == "mountain":
-            # Can find medicine (herbs) or weapons (materials)
-            if random.random() < 0.2:  # 20% chance
-                if random.random() < 0.5:
-                    medicine_found = random.randint(1, 3)
-                    resources_found["medicine"] = medicine_found
-                else:
-                    weapons_found = random.randint(1, 2)
-                    resources_found["weapons"] = weapons_found
+        chance, finds = entry
+        if chance is not None and self.rng.random() >= chance:
+            return resources_found
         
+        if len(finds) > 1:
+            resource, low, high = finds[int(self.rng.random() * len(finds))]
+        else:
+            resource, low, high = finds[0]
+        resources_found[resource] = self.rng.randint(low, high)
         return resources_found
\ No newline at end of file
@@ -0,0 +1,237 @@
+"""
+Deterministic random number streams for the game modules
+Every game class takes a GameRNG instead of calling the global random
+module, so a whole session can be reproduced from one seed, parallel
+simulations never share hidden state and the full generator state can be
+captured and restored
+"""
+
+import hashlib
+import random
+from typing import Any, Dict, List, MutableSequence, Optional, Sequence
+
+
+def derive_seed(seed: int, name: str) -> int:
+    """Stable 64-bit seed for the substream `name` of `seed`"""
+    digest = hashlib.blake2b(f"{seed}/{name}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class GameRNG:
+    """Seeded random stream with named substreams and a pre-drawn buffer"""
+
+    def __init__(self, seed: Optional[int] = None, buffer_size: int = 1024):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self.buffer_size = buffer_size
+        self._random = random.Random(seed)
+        self._streams: Dict[str, "GameRNG"] = {}
+        self._numpy = None
+
+        # Floats drawn in bulk for hot-path rolls; the buffer has its own
+        # generator so its state is just (state at refill, read position)
+        self._buffer_random = random.Random(derive_seed(seed, "buffer"))
+        self._buffer: List[float] = []
+        self._buffer_pos = 0
+        self._buffer_state = None
+
+        # Bind the hot methods directly to skip a Python-level call
+        self._bind(self._random)
+
+    def _bind(self, generator: random.Random):
+        self._random = generator
+        self._frozen = None
+        self.random = generator.random
+        self.randint = generator.randint
+        self.choice = generator.choice
+        self.uniform = generator.uniform
+
+    def _freeze(self, state):
+        """Share an immutable generator state until the first draw (copy-on-write)"""
+        self._random = None
+        self._frozen = state
+        self.random = self._thawing_random
+        self.randint = self._thawing_randint
+        self.choice = self._thawing_choice
+        self.uniform = self._thawing_uniform
+
+    def _generator(self) -> random.Random:
+        """The generator of this stream, created from the shared state if frozen"""
+        if self._random is None:
+            generator = random.Random.__new__(random.Random)
+            generator.setstate(self._frozen)
+            self._bind(generator)
+        return self._random
+
+    def _thawing_random(self):
+        return self._generator().random()
+
+    def _thawing_randint(self, a, b):
+        return self._generator().randint(a, b)
+
+    def _thawing_choice(self, seq):
+        return self._generator().choice(seq)
+
+    def _thawing_uniform(self, a, b):
+        return self._generator().uniform(a, b)
+
+    def _random_state(self):
+        return self._frozen if self._random is None else self._random.getstate()
+
+    def stream(self, name: str) -> "GameRNG":
+        """Independent substream for one subsystem, created on first use"""
+        child = self._streams.get(name)
+        if child is None:
+            child = GameRNG(derive_seed(self.seed, name), self.buffer_size)
+            self._streams[name] = child
+        return child
+
+    def numpy(self):
+        """NumPy Generator seeded from this stream, for vectorized code"""
+        if self._numpy is None:
+            import numpy as np
+            self._numpy = np.random.default_rng(derive_seed(self.seed, "numpy"))
+        return self._numpy
+
+    def _rewind_numpy(self):
+        """Move an existing NumPy generator back to the start of this stream"""
+        if self._numpy is not None:
+            import numpy as np
+            fresh = np.random.default_rng(derive_seed(self.seed, "numpy"))
+            self._numpy.bit_generator.state = fresh.bit_generator.state
+
+    def shuffle(self, items: MutableSequence):
+        self._generator().shuffle(items)
+
+    def sample(self, population: Sequence, k: int) -> List:
+        return self._generator().sample(population, k)
+
+    def buffered(self) -> float:
+        """Next float in [0, 1) from the pre-drawn buffer"""
+        if self._buffer_pos >= len(self._buffer):
+            self._refill()
+        value = self._buffer[self._buffer_pos]
+        self._buffer_pos += 1
+        return value
+
+    def chance(self, one_in: int) -> bool:
+        """Buffered equivalent of random.randint(1, one_in) == 1"""
+        if self._buffer_pos >= len(self._buffer):
+            self._refill()
+        value = self._buffer[self._buffer_pos]
+        self._buffer_pos += 1
+        return value * one_in < 1
+
+    def _refill(self):
+        if self._buffer_random is None:
+            # Forks of streams that never used the buffer create it here
+            self._buffer_random = random.Random(derive_seed(self.seed, "buffer"))
+        self._buffer_state = self._buffer_random.getstate()
+        draw = self._buffer_random.random
+        self._buffer = [draw() for _ in range(self.buffer_size)]
+        self._buffer_pos = 0
+
+    def get_state(self) -> Dict[str, Any]:
+        """Capture the position of this stream and all of its substreams"""
+        state = {
+            "seed": self.seed,
+            "random": self._random_state(),
+            "buffer": (self._buffer_state, self._buffer_pos) if self._buffer else None,
+            "streams": {name: child.get_state() for name, child in self._streams.items()},
+        }
+        if self._numpy is not None:
+            state["numpy"] = self._numpy.bit_generator.state
+        return state
+
+    def set_state(self, state: Dict[str, Any]):
+        """Restore a position captured with get_state"""
+        if state["seed"] != self.seed:
+            # Components hold on to their substreams and NumPy generators,
+            # so keep the same objects
+            streams, generator = self._streams, self._numpy
+            self.__init__(state["seed"], self.buffer_size)
+            self._streams, self._numpy = streams, generator
+        self._generator().setstate(state["random"])
+
+        if state["buffer"] is None:
+            self._buffer_random = random.Random(derive_seed(self.seed, "buffer"))
+            self._buffer = []
+            self._buffer_pos = 0
+            self._buffer_state = None
+        else:
+            refill_state, position = state["buffer"]
+            self._buffer_random = random.Random.__new__(random.Random)
+            self._buffer_random.setstate(refill_state)
+            self._refill()
+            self._buffer_pos = position
+
+        for name, child_state in state["streams"].items():
+            self.stream(name).set_state(child_state)
+        if "numpy" in state:
+            self.numpy().bit_generator.state = state["numpy"]
+        else:
+            self._rewind_numpy()
+
+    def clone(self) -> "GameRNG":
+        """Independent copy positioned at the same point of every stream"""
+        copy = GameRNG(self.seed, self.buffer_size)
+        copy.set_state(self.get_state())
+        return copy
+
+    def forks(self, count: int) -> List["GameRNG"]:
+        """`count` copies positioned at the same point of every stream
+
+        The copies share one captured generator state and only build
+        their own generator on their first draw, so forking is cheap.
+        """
+        state = self._random_state()
+        buffer_state = self._buffer_random.getstate() if self._buffer_state is not None else None
+        numpy_state = self._numpy.bit_generator.state if self._numpy is not None else None
+        streams = {name: child.forks(count) for name, child in self._streams.items()}
+
+        copies = []
+        for index in range(count):
+            copy = GameRNG.__new__(GameRNG)
+            copy.seed = self.seed
+            copy.buffer_size = self.buffer_size
+            copy._freeze(state)
+            copy._streams = {name: children[index] for name, children in streams.items()}
+            copy._numpy = None
+            if numpy_state is not None:
+                copy.numpy().bit_generator.state = numpy_state
+
+            # The buffer list is never modified in place, so it is shared
+            copy._buffer = self._buffer
+            copy._buffer_pos = self._buffer_pos
+            copy._buffer_state = self._buffer_state
+            copy._buffer_random = None
+            if buffer_state is not None:
+                copy._buffer_random = random.Random.__new__(random.Random)
+                copy._buffer_random.setstate(buffer_state)
+            copies.append(copy)
+        return copies
+
+    def fork(self) -> "GameRNG":
+        return self.forks(1)[0]
+
+    def restore(self, other: "GameRNG"):
+        """Move to the position of `other`, sharing its state until the next draw"""
+        if other._random is None:
+            self._freeze(other._frozen)
+        else:
+            self._generator().setstate(other._random.getstate())
+        self.seed = other.seed
+        self._buffer = other._buffer
+        self._buffer_pos = other._buffer_pos
+        self._buffer_state = other._buffer_state
+        self._buffer_random = None
+        if other._buffer_state is not None:
+            self._buffer_random = random.Random.__new__(random.Random)
+            self._buffer_random.setstate(other._buffer_random.getstate())
+        for name, child in other._streams.items():
+            self.stream(name).restore(child)
+        if other._numpy is not None:
+            self.numpy().bit_generator.state = other._numpy.bit_generator.state
+        else:
+            self._rewind_numpy()
@@ -0,0 +1,106 @@
+"""
+Weighted sampling with Walker alias tables
+An alias table is built once in O(n) from a list of weights and then
+draws an index in O(1) from a single uniform number. WeightedSampler
+keeps one table per context bucket (terrain, week, scarce resources...)
+so context-dependent weights are only computed the first time a bucket
+is seen
+"""
+
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class AliasTable:
+    """Walker/Vose alias table over indices 0..n-1"""
+
+    __slots__ = ("size", "prob", "alias", "_arrays")
+
+    def __init__(self, weights: Sequence[float]):
+        size = len(weights)
+        total = float(sum(weights))
+        if size == 0 or total <= 0 or any(w < 0 for w in weights):
+            raise ValueError("Alias table needs non-negative weights with a positive sum")
+
+        scaled = [w * size / total for w in weights]
+        prob = [1.0] * size
+        alias = list(range(size))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left over is 1 up to rounding and keeps prob 1
+
+        self.size = size
+        self.prob = prob
+        self.alias = alias
+        self._arrays = None
+
+    def sample(self, rng) -> int:
+        """One index, using a single rng.random() draw"""
+        u = rng.random() * self.size
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+    def sample_many(self, count: int, generator):
+        """`count` indices at once from a NumPy Generator"""
+        import numpy as np
+
+        if self._arrays is None:
+            self._arrays = (np.array(self.prob), np.array(self.alias, dtype=np.int64))
+        prob, alias = self._arrays
+        u = generator.random(count) * self.size
+        i = u.astype(np.int64)
+        return np.where(u - i < prob[i], i, alias[i])
+
+    def probabilities(self) -> List[float]:
+        """The distribution the table samples from"""
+        result = [p / self.size for p in self.prob]
+        for i, p in enumerate(self.prob):
+            result[self.alias[i]] += (1.0 - p) / self.size
+        return result
+
+
+class WeightedSampler(Generic[T]):
+    """Items drawn with weight(item, bucket), one cached alias table per bucket"""
+
+    def __init__(self, items: Sequence[T], weight: Callable[[T, Hashable], float],
+                 max_tables: int = 256):
+        self.items = list(items)
+        self.weight = weight
+        self.max_tables = max_tables
+        self.tables: "OrderedDict[Hashable, AliasTable]" = OrderedDict()
+
+    def table(self, bucket: Hashable = None) -> AliasTable:
+        table = self.tables.get(bucket)
+        if table is not None:
+            self.tables.move_to_end(bucket)
+            return table
+
+        table = AliasTable([self.weight(item, bucket) for item in self.items])
+        self.tables[bucket] = table
+        if len(self.tables) > self.max_tables:
+            self.tables.popitem(last=False)
+        return table
+
+    def sample(self, rng, bucket: Hashable = None) -> T:
+        table = self.table(bucket)
+        return self.items[table.sample(rng)]
+
+    def sample_many(self, count: int, generator, bucket: Hashable = None) -> List[T]:
+        """`count` items drawn at once from a NumPy Generator"""
+        items = self.items
+        return [items[i] for i in self.table(bucket).sample_many(count, generator).tolist()]
+
+    def probabilities(self, bucket: Hashable = None) -> List[float]:
+        return self.table(bucket).probabilities()
+
+    def invalidate(self):
+        """Drop cached tables, e.g. after the items or weights changed"""
+        self.tables.clear()
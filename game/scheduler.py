@@ -0,0 +1,156 @@
+"""
+Tick-based scheduler for timed game events
+Keeps day advances, random encounters and other timed events in one
+priority queue. Per-tick 1-in-N rolls are geometric processes, so the
+tick of the next occurrence is sampled once instead of rolling every
+frame, and loops without rendering can jump straight to the next event
+"""
+
+import heapq
+import itertools
+import math
+from typing import Dict, List, Optional, Tuple
+
+from .rng import GameRNG
+
+# Events firing on the same tick are handled in this order; unknown names go last
+DEFAULT_PRIORITIES = {
+    "day": 0,
+    "encounter": 1,
+}
+
+
+class EventScheduler:
+    """Priority queue of named events keyed on the tick they fire"""
+
+    def __init__(self, rng: Optional[GameRNG] = None, priorities: Optional[Dict[str, int]] = None):
+        self.rng = rng or GameRNG()
+        self.priorities = dict(DEFAULT_PRIORITIES if priorities is None else priorities)
+        self.clear()
+
+    def clear(self):
+        """Drop every scheduled event and restart at tick 0"""
+        self.tick = 0
+        self._queue: List[Tuple[int, int, int, str, int]] = []
+        self._counter = itertools.count()
+        self._generation: Dict[str, int] = {}
+        self._intervals: Dict[str, int] = {}
+        self._chances: Dict[str, float] = {}
+        self._next_tick = math.inf
+
+    def _push(self, name: str, fire_tick: int):
+        generation = self._generation.get(name, 0)
+        entry = (fire_tick, self.priorities.get(name, len(self.priorities)),
+                 next(self._counter), name, generation)
+        heapq.heappush(self._queue, entry)
+        self._next_tick = self._queue[0][0]
+
+    def _replace(self, name: str):
+        """Invalidate any pending occurrence of `name`"""
+        self._generation[name] = self._generation.get(name, 0) + 1
+        self._intervals.pop(name, None)
+        self._chances.pop(name, None)
+
+    def schedule(self, name: str, delay: int):
+        """Fire `name` once, `delay` ticks from now"""
+        self._replace(name)
+        self._push(name, self.tick + max(1, delay))
+
+    def schedule_every(self, name: str, interval: int, delay: Optional[int] = None):
+        """Fire `name` every `interval` ticks"""
+        self._replace(name)
+        self._intervals[name] = interval
+        self._push(name, self.tick + (interval if delay is None else max(1, delay)))
+
+    def schedule_chance(self, name: str, chance: float):
+        """Fire `name` as if it were rolled with probability `chance` every tick"""
+        self._replace(name)
+        if chance <= 0:
+            return
+        self._chances[name] = chance
+        self._push(name, self.tick + self.sample_gap(chance))
+
+    def cancel(self, name: str):
+        """Stop `name` from firing again"""
+        self._replace(name)
+
+    def sample_gap(self, chance: float) -> int:
+        """Ticks until the first success of a per-tick Bernoulli(chance) roll"""
+        if chance >= 1:
+            return 1
+        return int(math.log(1.0 - self.rng.random()) / math.log(1.0 - chance)) + 1
+
+    def ticks_until_next(self) -> Optional[int]:
+        """Ticks until the earliest scheduled event, or None if nothing is pending"""
+        self._discard_stale()
+        if not self._queue:
+            return None
+        return self._queue[0][0] - self.tick
+
+    def _discard_stale(self):
+        queue = self._queue
+        while queue and queue[0][4] != self._generation.get(queue[0][3], 0):
+            heapq.heappop(queue)
+        self._next_tick = queue[0][0] if queue else math.inf
+
+    def advance(self, ticks: int = 1) -> Tuple[str, ...]:
+        """Move time forward and return the events that fired, in firing order"""
+        self.tick += ticks
+        if self.tick < self._next_tick:
+            return ()
+
+        fired = []
+        queue = self._queue
+        while queue and queue[0][0] <= self.tick:
+            fire_tick, _, _, name, generation = heapq.heappop(queue)
+            if generation != self._generation.get(name, 0):
+                continue
+            fired.append(name)
+
+            # Re-arm recurring and random events from their fire tick
+            if name in self._intervals:
+                self._push(name, fire_tick + self._intervals[name])
+            elif name in self._chances:
+                self._push(name, fire_tick + self.sample_gap(self._chances[name]))
+        self._discard_stale()
+        return tuple(fired)
+
+    def get_state(self) -> Dict:
+        """Capture the queue so it can be restored with set_state"""
+        self._discard_stale()
+        return {
+            "tick": self.tick,
+            "pending": [(fire_tick, name) for fire_tick, _, _, name, _ in sorted(self._queue)],
+            "intervals": dict(self._intervals),
+            "chances": dict(self._chances),
+        }
+
+    def set_state(self, state: Dict):
+        """Restore a queue captured with get_state"""
+        self.clear()
+        self.tick = state["tick"]
+        self._intervals.update(state["intervals"])
+        self._chances.update(state["chances"])
+        for fire_tick, name in state["pending"]:
+            self._push(name, fire_tick)
+
+    def fork(self, rng: Optional[GameRNG] = None) -> "EventScheduler":
+        """Copy of the queue that fires the same events, drawing from `rng`"""
+        copy = EventScheduler.__new__(EventScheduler)
+        copy.rng = rng or self.rng
+        copy.priorities = self.priorities
+        copy.restore(self)
+        return copy
+
+    def restore(self, other: "EventScheduler"):
+        """Take over the queue of `other` (a fork), keeping this scheduler's rng"""
+        # Both counters continue from the same value so ties break alike
+        position = next(other._counter)
+        other._counter = itertools.count(position)
+        self._counter = itertools.count(position)
+        self.tick = other.tick
+        self._queue = list(other._queue)
+        self._generation = dict(other._generation)
+        self._intervals = dict(other._intervals)
+        self._chances = dict(other._chances)
+        self._next_tick = other._next_tick
@@ -0,0 +1,300 @@
+"""
+Headless batch simulation of the core game rules
+Runs complete GameState games without a UI loop by jumping straight
+from one day boundary or random encounter to the next instead of
+ticking every frame, so balance passes can play thousands of games
+per second
+"""
+
+import math
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .core_game import GameState
+from .rng import GameRNG
+
+# Frame rate the front-ends feed into GameState.update
+DEFAULT_DT = 1 / 60
+
+# Per-frame chance of GameState.update triggering a random encounter
+DEFAULT_EVENT_CHANCE = 1 / 1000
+
+# Movement policies return a per-frame (dx, dy), optionally followed by the
+# number of frames it stays valid; otherwise it is held until the next
+# day boundary or encounter
+MovementPolicy = Callable[[GameState, GameRNG], Tuple]
+ChoicePolicy = Callable[[GameState, Dict, GameRNG], str]
+
+
+def idle_policy(state: GameState, rng: GameRNG) -> Tuple[float, float]:
+    """Never move - the survivor waits for days to pass"""
+    return 0.0, 0.0
+
+
+def make_walk_policy(speed: float = 3.0, min_stamina: float = 0.0) -> MovementPolicy:
+    """Walk east at `speed` per frame while stamina stays above `min_stamina`"""
+    def walk_policy(state: GameState, rng: GameRNG) -> Tuple[float, float, int]:
+        if state.player_stamina <= min_stamina:
+            return 0.0, 0.0
+        # Keep walking until the frame stamina would drop to the threshold
+        hold = math.ceil((state.player_stamina - min_stamina) / (speed * 0.01))
+        return speed, 0.0, hold
+    return walk_policy
+
+
+def first_choice_policy(state: GameState, event: Dict, rng: GameRNG) -> str:
+    """Always pick the first option of an event popup"""
+    return event["choices"][0]["id"]
+
+
+def random_choice_policy(state: GameState, event: Dict, rng: GameRNG) -> str:
+    """Pick a uniformly random option of an event popup"""
+    return rng.choice(event["choices"])["id"]
+
+
+def frames_per_day(dt: float = DEFAULT_DT) -> int:
+    """Number of update(dt) calls GameState needs to roll over one day"""
+    # Mirror the float accumulation in GameState.update exactly
+    frames = 0
+    time_passed = 0
+    while time_passed < 60:
+        time_passed += dt
+        frames += 1
+    return frames
+
+
+class HeadlessSimulator:
+    """Plays GameState games to completion without a frame loop"""
+
+    def __init__(self, movement_policy: Optional[MovementPolicy] = None,
+                 choice_policy: Optional[ChoicePolicy] = None,
+                 dt: float = DEFAULT_DT, max_days: int = 365,
+                 event_chance: float = DEFAULT_EVENT_CHANCE,
+                 start_overrides: Optional[Dict] = None,
+                 seed: Optional[int] = None):
+        self.movement_policy = movement_policy or idle_policy
+        self.choice_policy = choice_policy or random_choice_policy
+        self.dt = dt
+        self.max_days = max_days
+        self.event_chance = event_chance
+        self.start_overrides = start_overrides or {}
+        self.rng = GameRNG(seed)
+
+        self.frames_per_day = frames_per_day(dt)
+
+    def new_game(self) -> GameState:
+        """Create a fresh GameState with the configured starting values"""
+        state = GameState(self.rng.stream("game"))
+        for name, value in self.start_overrides.items():
+            setattr(state, name, value)
+
+        # update() advances days by accumulated time; here the day boundary
+        # goes into the same queue as the encounters so both can be skipped to
+        if self.event_chance != state.ENCOUNTER_CHANCE:
+            state.ENCOUNTER_CHANCE = self.event_chance
+            state.scheduler.schedule_chance("encounter", self.event_chance)
+        state.scheduler.schedule_every("day", self.frames_per_day)
+        return state
+
+    def run_game(self) -> Dict:
+        """Play one game to death, victory or max_days and return its result"""
+        state = self.new_game()
+        scheduler = state.scheduler
+        cause = None
+
+        while state.day <= self.max_days and not cause:
+            move = self.movement_policy(state, self.rng)
+            dx, dy = move[0], move[1]
+
+            # Jump to whichever boundary comes first
+            frames = scheduler.ticks_until_next()
+            if len(move) > 2:
+                frames = min(frames, max(1, move[2]))
+            end = self._frames_until_end(state, dx, dy, frames)
+            if end is not None:
+                frames, cause = end
+            self._apply_moves(state, dx, dy, frames)
+            state.time_passed += frames * self.dt
+            if cause:
+                scheduler.tick += frames
+                break
+
+            for name in scheduler.advance(frames):
+                if name == "day":
+                    state.advance_day()
+                    state.time_passed = 0
+                    if state.player_health <= 0:
+                        cause = self._day_death_cause(state)
+                        break
+                elif name == "encounter":
+                    state.trigger_random_event()
+                    event = state.current_event
+                    state.handle_event_choice(self.choice_policy(state, event, self.rng))
+                    if state.player_health <= 0:
+                        cause = event["title"]
+                        break
+
+        if cause == "victory":
+            state.victory = True
+        elif cause:
+            state.player_alive = False
+            state.game_over = True
+
+        return {
+            "days": state.day,
+            "frames": scheduler.tick,
+            "victory": state.victory,
+            "alive": state.player_alive,
+            "cause": cause or "timeout",
+            "distance_traveled": state.distance_traveled,
+            "events_faced": state.total_events_faced,
+        }
+
+    def run_batch(self, runs: int) -> "BatchReport":
+        """Play `runs` games and collect aggregate statistics"""
+        report = BatchReport()
+        start = time.perf_counter()
+        for _ in range(runs):
+            report.add(self.run_game())
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _frames_until_end(self, state: GameState, dx: float, dy: float,
+                          frames: int) -> Optional[Tuple[int, str]]:
+        """Return (frame, cause) if moving for `frames` frames ends the game"""
+        step = (dx**2 + dy**2)**0.5
+        if step == 0:
+            return None
+
+        death_frame = None
+        drain = step * 0.01
+        if state.player_stamina - frames * drain < 0:
+            # Every frame after stamina runs out costs 0.5 health
+            exhausted_from = max(1, int(state.player_stamina // drain) + 1)
+            death_frame = exhausted_from - 1 + max(1, math.ceil(state.player_health / 0.5))
+
+        victory_frame = None
+        remaining = state.target_distance - state.distance_traveled
+        if remaining <= frames * step * 0.1:
+            victory_frame = max(1, math.ceil(remaining / (step * 0.1)))
+
+        # Death is checked before victory in GameState.update
+        if death_frame is not None and death_frame <= frames and (
+                victory_frame is None or death_frame <= victory_frame):
+            return death_frame, "exhaustion"
+        if victory_frame is not None and victory_frame <= frames:
+            return victory_frame, "victory"
+        return None
+
+    def _apply_moves(self, state: GameState, dx: float, dy: float, frames: int):
+        """Apply `frames` identical move_player calls in closed form"""
+        step = (dx**2 + dy**2)**0.5
+        if step == 0 or frames <= 0:
+            return
+
+        state.player_x += dx * frames
+        state.player_y += dy * frames
+        state.distance_traveled += step * 0.1 * frames
+
+        drain = step * 0.01
+        if state.player_stamina - frames * drain >= 0:
+            state.player_stamina -= frames * drain
+        else:
+            exhausted_from = max(1, int(state.player_stamina // drain) + 1)
+            state.player_stamina = 0
+            state.player_health -= 0.5 * (frames - exhausted_from + 1)
+
+    def _day_death_cause(self, state: GameState) -> str:
+        """Attribute a death during advance_day to its most severe shortage"""
+        if state.water == 0:
+            return "dehydration"
+        if state.food == 0:
+            return "starvation"
+        if state.fuel == 0:
+            return "exposure"
+        return "weather"
+
+
+class BatchReport:
+    """Aggregated statistics of a batch of headless runs"""
+
+    def __init__(self):
+        self.runs = 0
+        self.victories = 0
+        self.total_days = 0
+        self.day_histogram: Dict[int, int] = {}
+        self.causes: Dict[str, int] = {}
+        self.elapsed = 0.0
+
+    def add(self, result: Dict):
+        """Fold a single run_game result into the report"""
+        self.runs += 1
+        self.total_days += result["days"]
+        if result["victory"]:
+            self.victories += 1
+        self.day_histogram[result["days"]] = self.day_histogram.get(result["days"], 0) + 1
+        self.causes[result["cause"]] = self.causes.get(result["cause"], 0) + 1
+
+    def merge(self, other: "BatchReport"):
+        """Fold another report into this one"""
+        self.runs += other.runs
+        self.victories += other.victories
+        self.total_days += other.total_days
+        for day, count in other.day_histogram.items():
+            self.day_histogram[day] = self.day_histogram.get(day, 0) + count
+        for cause, count in other.causes.items():
+            self.causes[cause] = self.causes.get(cause, 0) + count
+        self.elapsed += other.elapsed
+
+    @property
+    def runs_per_second(self) -> float:
+        return self.runs / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> Dict:
+        """Get the headline numbers of the batch"""
+        return {
+            "runs": self.runs,
+            "victory_rate": self.victories / self.runs if self.runs else 0.0,
+            "mean_days": self.total_days / self.runs if self.runs else 0.0,
+            "causes": dict(sorted(self.causes.items(), key=lambda item: -item[1])),
+            "runs_per_second": self.runs_per_second,
+        }
+
+
+POLICIES = {
+    "idle": idle_policy,
+    "walk": make_walk_policy(),
+    "walk_rested": make_walk_policy(min_stamina=10),
+}
+
+CHOICE_POLICIES = {
+    "random": random_choice_policy,
+    "first": first_choice_policy,
+}
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run headless Death Game simulations")
+    parser.add_argument("--runs", type=int, default=10000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="idle")
+    parser.add_argument("--choices", choices=sorted(CHOICE_POLICIES), default="random")
+    parser.add_argument("--max-days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    simulator = HeadlessSimulator(POLICIES[args.policy], CHOICE_POLICIES[args.choices],
+                                  max_days=args.max_days, seed=args.seed)
+    summary = simulator.run_batch(args.runs).summary()
+
+    print(f"Runs:         {summary['runs']}")
+    print(f"Victory rate: {summary['victory_rate']:.1%}")
+    print(f"Mean days:    {summary['mean_days']:.2f}")
+    for cause, count in summary["causes"].items():
+        print(f"  {cause:<20} {count}")
+    print(f"Runs/second:  {summary['runs_per_second']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
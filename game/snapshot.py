@@ -0,0 +1,551 @@
+"""
+Versioned binary snapshots of GameState and the GameEngine components
+A snapshot is a small header followed by tagged sections packed with
+struct. Numbers keep their int/float type, RNG and scheduler positions
+are stored exactly, and array data (hazard columns, resource history,
+NPC components) is written as raw bytes. The terrain grid is stored
+page-aligned so loading copies it out of the file mapping in one call
+instead of parsing it.
+Files are written to a temporary name and renamed into place, so a
+crash while saving never leaves a half-written snapshot behind
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b"DGSV"
+VERSION = 3
+
+# The terrain grid starts on this boundary so loading copies whole mapped pages
+ALIGNMENT = 4096
+
+_HEADER = struct.Struct("<4sHH")
+_SECTION = struct.Struct("<4sQ")
+_COUNT = struct.Struct("<I")
+_INT = struct.Struct("<Bq")
+_FLOAT = struct.Struct("<Bd")
+_MT_STATE = struct.Struct("<B625I?d")
+_TERRAIN = struct.Struct("<IIQ")
+
+# Type tags of packed scalars; ints beyond 64 bits (such as derived
+# seeds) are stored as decimal text
+_TAG_INT, _TAG_FLOAT, _TAG_BOOL, _TAG_NONE, _TAG_BIG_INT = range(5)
+_INT64 = 2**63
+
+GAME_STATE_FIELDS = (
+    "day", "time_passed", "game_over", "victory",
+    "player_health", "player_stamina", "player_morale", "player_x", "player_y", "player_alive",
+    "food", "water", "medicine", "fuel", "weapons",
+    "distance_traveled", "target_distance",
+    "deaths_from_starvation", "deaths_from_disease", "deaths_from_violence", "total_events_faced",
+)
+PLAYER_FIELDS = (
+    "x", "y", "speed", "size", "max_health", "health", "stamina", "morale",
+    "alive", "sick", "injured", "exhausted", "dx", "dy", "prev_x", "prev_y",
+)
+ENGINE_FIELDS = ("day", "time_passed", "accumulator")
+
+
+class _Writer:
+    """Accumulates packed parts and tracks the absolute offset"""
+
+    def __init__(self, start: int = 0):
+        self.parts: List[bytes] = []
+        self.offset = start
+
+    def write(self, data: bytes):
+        self.parts.append(data)
+        self.offset += len(data)
+
+    def pack(self, fmt: struct.Struct, *values):
+        self.write(fmt.pack(*values))
+
+    def string(self, text: str):
+        data = text.encode()
+        self.pack(_COUNT, len(data))
+        self.write(data)
+
+    def scalars(self, values: Sequence):
+        self.pack(_COUNT, len(values))
+        for value in values:
+            if value is None:
+                self.pack(_INT, _TAG_NONE, 0)
+            elif isinstance(value, (bool, np.bool_)):
+                self.pack(_INT, _TAG_BOOL, int(value))
+            elif isinstance(value, (int, np.integer)):
+                if -_INT64 <= value < _INT64:
+                    self.pack(_INT, _TAG_INT, int(value))
+                else:
+                    text = str(int(value)).encode()
+                    self.pack(_INT, _TAG_BIG_INT, len(text))
+                    self.write(text)
+            else:
+                self.pack(_FLOAT, _TAG_FLOAT, float(value))
+
+    def array(self, values: np.ndarray):
+        self.pack(_COUNT, values.nbytes)
+        self.write(np.ascontiguousarray(values).tobytes())
+
+    def getvalue(self) -> bytes:
+        return b"".join(self.parts)
+
+
+class _Reader:
+    def __init__(self, view: memoryview, offset: int = 0):
+        self.view = view
+        self.offset = offset
+
+    def unpack(self, fmt: struct.Struct) -> Tuple:
+        values = fmt.unpack_from(self.view, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def count(self) -> int:
+        return self.unpack(_COUNT)[0]
+
+    def bytes(self, size: int) -> memoryview:
+        data = self.view[self.offset:self.offset + size]
+        self.offset += size
+        return data
+
+    def string(self) -> str:
+        return bytes(self.bytes(self.count())).decode()
+
+    def scalars(self) -> List:
+        values = []
+        for _ in range(self.count()):
+            tag = self.view[self.offset]
+            if tag == _TAG_FLOAT:
+                values.append(self.unpack(_FLOAT)[1])
+                continue
+            value = self.unpack(_INT)[1]
+            if tag == _TAG_BIG_INT:
+                value = int(bytes(self.bytes(value)))
+            values.append(None if tag == _TAG_NONE else bool(value) if tag == _TAG_BOOL else value)
+        return values
+
+    def array(self, dtype) -> np.ndarray:
+        return np.frombuffer(self.bytes(self.count()), dtype=dtype).copy()
+
+
+def _write_fields(writer: _Writer, obj, fields: Sequence[str]):
+    writer.scalars([getattr(obj, name) for name in fields])
+
+
+def _read_fields(reader: _Reader, obj, fields: Sequence[str]):
+    values = reader.scalars()
+    if len(values) != len(fields):
+        raise ValueError("Snapshot fields do not match this version")
+    for name, value in zip(fields, values):
+        setattr(obj, name, value)
+
+
+def _write_random_state(writer: _Writer, state):
+    version, internal, gauss = state
+    writer.pack(_MT_STATE, version, *internal, gauss is not None, gauss or 0.0)
+
+
+def _read_random_state(reader: _Reader):
+    values = reader.unpack(_MT_STATE)
+    return values[0], tuple(values[1:626]), values[627] if values[626] else None
+
+
+def _write_rng_state(writer: _Writer, state: Dict):
+    """GameRNG.get_state() including every substream"""
+    writer.scalars([state["seed"]])
+    _write_random_state(writer, state["random"])
+    buffer = state["buffer"]
+    writer.scalars([buffer is not None])
+    if buffer is not None:
+        _write_random_state(writer, buffer[0])
+        writer.scalars([buffer[1]])
+    # NumPy bit generator states are small dicts of (big) ints
+    writer.string(json.dumps(state.get("numpy")))
+    writer.pack(_COUNT, len(state["streams"]))
+    for name, child in state["streams"].items():
+        writer.string(name)
+        _write_rng_state(writer, child)
+
+
+def _read_rng_state(reader: _Reader) -> Dict:
+    (seed,) = reader.scalars()
+    state = {"seed": seed, "random": _read_random_state(reader), "buffer": None}
+    (has_buffer,) = reader.scalars()
+    if has_buffer:
+        refill = _read_random_state(reader)
+        (position,) = reader.scalars()
+        state["buffer"] = (refill, position)
+    numpy_state = json.loads(reader.string())
+    if numpy_state is not None:
+        state["numpy"] = numpy_state
+    state["streams"] = {}
+    for _ in range(reader.count()):
+        name = reader.string()
+        state["streams"][name] = _read_rng_state(reader)
+    return state
+
+
+def _write_scheduler(writer: _Writer, scheduler):
+    state = scheduler.get_state()
+    writer.scalars([state["tick"]])
+    pending = [(name, fire_tick) for fire_tick, name in state["pending"]]
+    # (name, value) lists: pending fire ticks, intervals and chances
+    for entries in (pending, list(state["intervals"].items()), list(state["chances"].items())):
+        writer.pack(_COUNT, len(entries))
+        for name, value in entries:
+            writer.string(name)
+            writer.scalars([value])
+
+
+def _read_scheduler(reader: _Reader, scheduler):
+    (tick,) = reader.scalars()
+    lists = []
+    for _ in range(3):
+        entries = []
+        for _ in range(reader.count()):
+            name = reader.string()
+            entries.append((name, reader.scalars()[0]))
+        lists.append(entries)
+    pending, intervals, chances = lists
+    scheduler.set_state({
+        "tick": tick,
+        "pending": [(fire_tick, name) for name, fire_tick in pending],
+        "intervals": dict(intervals),
+        "chances": dict(chances),
+    })
+
+
+class Snapshot:
+    """Tagged sections of one snapshot file or buffer"""
+
+    def __init__(self, data, path: Optional[str] = None):
+        self.view = memoryview(data)
+        self.path = path
+        magic, version, count = _HEADER.unpack_from(self.view, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        self.sections: Dict[bytes, int] = {}
+        offset = _HEADER.size
+        for _ in range(count):
+            tag, length = _SECTION.unpack_from(self.view, offset)
+            offset += _SECTION.size
+            self.sections[tag] = offset
+            offset += length
+
+    @classmethod
+    def open(cls, path: str) -> "Snapshot":
+        """Map a snapshot file; sections are only read when restored"""
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), path)
+
+    def close(self):
+        """Release the file mapping, so the file can be replaced (required on Windows)"""
+        data = self.view.obj
+        self.view.release()
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def reader(self, tag: bytes) -> _Reader:
+        if tag not in self.sections:
+            raise KeyError(f"Snapshot has no {tag.decode()} section")
+        return _Reader(self.view, self.sections[tag])
+
+    def __contains__(self, tag: bytes) -> bool:
+        return tag in self.sections
+
+
+def _pack_sections(sections: Sequence[Tuple[bytes, "callable"]]) -> bytes:
+    """Write (tag, fill(writer)) sections after the header"""
+    writer = _Writer()
+    writer.pack(_HEADER, MAGIC, VERSION, len(sections))
+    for tag, fill in sections:
+        body = _Writer(writer.offset + _SECTION.size)
+        fill(body)
+        data = body.getvalue()
+        writer.pack(_SECTION, tag, len(data))
+        writer.write(data)
+    return writer.getvalue()
+
+
+def write_atomic(path: str, data: bytes):
+    """Replace `path` with `data` so readers see the old or the new file, never a mix"""
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+# GameState
+
+def game_state_to_bytes(state) -> bytes:
+    def game(writer):
+        _write_fields(writer, state, GAME_STATE_FIELDS)
+        event = state.current_event
+        writer.scalars([None if event is None else state.CATALOG.encounters.index(event)])
+
+    return _pack_sections([
+        (b"GAME", game),
+        (b"RNG ", lambda writer: _write_rng_state(writer, state.rng.get_state())),
+        (b"SCHD", lambda writer: _write_scheduler(writer, state.scheduler)),
+    ])
+
+
+def game_state_from_bytes(data, state=None):
+    """Restore into `state`, or into a new GameState"""
+    from .core_game import GameState
+    from .rng import GameRNG
+
+    snapshot = data if isinstance(data, Snapshot) else Snapshot(data)
+    reader = snapshot.reader(b"GAME")
+    if state is None:
+        state = GameState(GameRNG(0))
+    _read_fields(reader, state, GAME_STATE_FIELDS)
+    (event,) = reader.scalars()
+    state.current_event = None if event is None else state.CATALOG.encounters[event]
+    state.rng.set_state(_read_rng_state(snapshot.reader(b"RNG ")))
+    _read_scheduler(snapshot.reader(b"SCHD"), state.scheduler)
+    return state
+
+
+def save_game_state(state, path: str):
+    write_atomic(path, game_state_to_bytes(state))
+
+
+def load_game_state(path: str, state=None):
+    with Snapshot.open(path) as snapshot:
+        return game_state_from_bytes(snapshot, state)
+
+
+# GameEngine component stack
+
+def _write_world(writer: _Writer, world):
+    writer.scalars([world.width, world.height, world.terrain_size, world.terrain_seed])
+    hazards = world.hazards
+    writer.pack(_COUNT, len(hazards))
+    for column in (hazards.x, hazards.y, hazards.radius, hazards.type, hazards.active):
+        writer.array(column)
+
+
+def _read_world(reader: _Reader, world):
+    width, height, terrain_size, terrain_seed = reader.scalars()
+    if (width, height, terrain_size) != (world.width, world.height, world.terrain_size):
+        raise ValueError("Snapshot world size does not match this world")
+    world.terrain_seed = terrain_seed
+    reader.count()
+    x, y, radius = (reader.array(np.float64) for _ in range(3))
+    types = reader.array(np.uint8)
+    active = reader.array(np.bool_)
+    world.hazards.clear()
+    if len(x):
+        world.hazards.add_many(x, y, types, radius, active)
+
+
+def _write_terrain(writer: _Writer, grid: np.ndarray):
+    rows, cols = grid.shape
+    start = writer.offset + _TERRAIN.size
+    data_offset = -(-start // ALIGNMENT) * ALIGNMENT
+    writer.pack(_TERRAIN, rows, cols, data_offset)
+    writer.write(b"\0" * (data_offset - start))
+    writer.write(np.ascontiguousarray(grid, dtype=np.uint8).tobytes())
+
+
+def _read_terrain(snapshot: Snapshot) -> np.ndarray:
+    rows, cols, data_offset = snapshot.reader(b"TERR").unpack(_TERRAIN)
+    # A copy, not a view: the file mapping is closed once loading finishes
+    return np.frombuffer(snapshot.view[data_offset:data_offset + rows * cols],
+                         dtype=np.uint8).reshape(rows, cols).copy()
+
+
+def _write_chunks(writer: _Writer, world):
+    """Camera, cached chunks in LRU order and parked chunks of a ChunkedWorld"""
+    writer.scalars([world.camera_x, world.camera_y, world.chunk_tiles])
+    for chunks in world.chunk_state():
+        writer.pack(_COUNT, len(chunks))
+        for chunk in chunks:
+            writer.scalars([chunk.cx, chunk.cy, chunk.modified])
+            writer.array(chunk.terrain_grid)
+            for column in chunk.hazards:
+                writer.array(column)
+
+
+def _read_chunks(reader: _Reader, world):
+    from .chunked_world import Chunk
+
+    world.camera_x, world.camera_y, chunk_tiles = reader.scalars()
+    if chunk_tiles != world.chunk_tiles:
+        raise ValueError("Snapshot chunk size does not match this world")
+    state = []
+    for _ in range(2):
+        chunks = []
+        for _ in range(reader.count()):
+            cx, cy, modified = reader.scalars()
+            terrain_grid = reader.array(np.uint8).reshape(chunk_tiles, chunk_tiles)
+            hazards = tuple(reader.array(dtype) for dtype in
+                            (np.float64, np.float64, np.uint8, np.float64, np.bool_))
+            chunk = Chunk(cx, cy, terrain_grid, hazards)
+            chunk.modified = modified
+            chunks.append(chunk)
+        state.append(chunks)
+    world.restore_chunks(*state)
+
+
+def _write_resources(writer: _Writer, resources):
+    writer.scalars(resources.amounts)
+    writer.scalars(resources.maximums)
+    writer.scalars(resources.consumption)
+    history = resources.history
+    writer.scalars([resources.history_cadence, history.count, history.position, history.ticks])
+    writer.array(history.data)
+
+
+def _read_resources(reader: _Reader, resources):
+    resources.amounts[:] = reader.scalars()
+    resources.maximums[:] = reader.scalars()
+    resources.consumption[:] = reader.scalars()
+    history = resources.history
+    resources.history_cadence, count, position, ticks = reader.scalars()
+    data = reader.array(np.float64)
+    if data.size != history.data.size:
+        raise ValueError("Snapshot resource history does not match this history capacity")
+    history.data[:] = data.reshape(history.data.shape)
+    history.count, history.position, history.ticks = count, position, ticks
+
+
+def _write_events(writer: _Writer, events):
+    writer.scalars([events.events_recorded])
+    writer.pack(_COUNT, len(events.history))
+    for name, prevented, choice in events.history:
+        writer.string(name)
+        writer.scalars([prevented, choice])
+
+
+def _read_events(reader: _Reader, events):
+    (events.events_recorded,) = reader.scalars()
+    events.history.clear()
+    for _ in range(reader.count()):
+        name = reader.string()
+        prevented, choice = reader.scalars()
+        events.history.append((name, prevented, choice))
+    events.current_event = None
+
+
+def _write_survivors(writer: _Writer, survivors):
+    """Entity ids, component columns and food stocks of the NPC survivors"""
+    entities = survivors.entities
+    size = entities.size
+    writer.scalars([size])
+    writer.array(entities.exists[:size])
+    writer.array(np.array(entities._free, dtype=np.int64))
+    writer.pack(_COUNT, len(entities.stores))
+    for name, store in entities.stores.items():
+        writer.string(name)
+        writer.array(entities.has[name][:size])
+        for column in store.columns:
+            writer.array(getattr(store, column)[:size])
+
+    foraging = survivors.systems[1]
+    writer.scalars([foraging.elapsed])
+    writer.array(foraging.depleted_rows)
+    writer.array(foraging.depleted_cols)
+    writer.array(foraging.depleted_stock)
+
+
+def _read_survivors(reader: _Reader, survivors):
+    entities = survivors.entities
+    (size,) = reader.scalars()
+    if size > entities.capacity:
+        entities._grow(size)
+    entities.exists[:] = False
+    entities.exists[:size] = reader.array(np.bool_)
+    entities._free = reader.array(np.int64).tolist()
+    entities.size = size
+    for _ in range(reader.count()):
+        name = reader.string()
+        store = entities.stores.get(name)
+        if store is None:
+            raise ValueError(f"Snapshot has unknown NPC component {name}")
+        entities.has[name][:] = False
+        entities.has[name][:size] = reader.array(np.bool_)
+        for column, (dtype, _) in store.columns.items():
+            getattr(store, column)[:size] = reader.array(dtype)
+    entities._queries.clear()
+
+    foraging = survivors.systems[1]
+    (foraging.elapsed,) = reader.scalars()
+    foraging.depleted_rows = reader.array(np.int64)
+    foraging.depleted_cols = reader.array(np.int64)
+    foraging.depleted_stock = reader.array(np.float64)
+
+
+def engine_to_bytes(engine) -> bytes:
+    def state(writer):
+        _write_fields(writer, engine, ENGINE_FIELDS)
+        writer.string(engine.game_state)
+
+    sections = [
+        (b"ENGN", state),
+        (b"RNG ", lambda writer: _write_rng_state(writer, engine.rng.get_state())),
+        (b"SCHD", lambda writer: _write_scheduler(writer, engine.scheduler)),
+        (b"PLYR", lambda writer: _write_fields(writer, engine.player, PLAYER_FIELDS)),
+        (b"RSRC", lambda writer: _write_resources(writer, engine.resource_manager)),
+        (b"EVNT", lambda writer: _write_events(writer, engine.event_manager)),
+        (b"WRLD", lambda writer: _write_world(writer, engine.world)),
+        (b"TERR", lambda writer: _write_terrain(writer, engine.world.terrain_grid)),
+    ]
+    # A chunked world only holds its active window in the sections above
+    if hasattr(engine.world, "chunks"):
+        sections.append((b"CHNK", lambda writer: _write_chunks(writer, engine.world)))
+    if engine.survivors is not None:
+        sections.append((b"NPCS", lambda writer: _write_survivors(writer, engine.survivors)))
+    return _pack_sections(sections)
+
+
+def engine_from_bytes(data, engine):
+    """Restore a snapshot into an existing GameEngine"""
+    snapshot = data if isinstance(data, Snapshot) else Snapshot(data)
+    if (b"CHNK" in snapshot) != hasattr(engine.world, "chunks"):
+        raise ValueError("Snapshot world type does not match this world")
+    if (b"NPCS" in snapshot) != (engine.survivors is not None):
+        raise ValueError("Snapshot NPCs do not match this engine")
+    reader = snapshot.reader(b"ENGN")
+    _read_fields(reader, engine, ENGINE_FIELDS)
+    engine.game_state = reader.string()
+    engine.rng.set_state(_read_rng_state(snapshot.reader(b"RNG ")))
+    _read_scheduler(snapshot.reader(b"SCHD"), engine.scheduler)
+    _read_fields(snapshot.reader(b"PLYR"), engine.player, PLAYER_FIELDS)
+    _read_resources(snapshot.reader(b"RSRC"), engine.resource_manager)
+    _read_events(snapshot.reader(b"EVNT"), engine.event_manager)
+
+    world = engine.world
+    _read_world(snapshot.reader(b"WRLD"), world)
+    world.terrain_grid = _read_terrain(snapshot)
+    world.terrain_dirty = True
+    if b"CHNK" in snapshot:
+        _read_chunks(snapshot.reader(b"CHNK"), world)
+    if b"NPCS" in snapshot:
+        _read_survivors(snapshot.reader(b"NPCS"), engine.survivors)
+    return engine
+
+
+def save_engine(engine, path: str):
+    write_atomic(path, engine_to_bytes(engine))
+
+
+def load_engine(path: str, engine):
+    with Snapshot.open(path) as snapshot:
+        return engine_from_bytes(snapshot, engine)
@@ -0,0 +1,75 @@
+"""
+Uniform-grid spatial hash for circular objects
+Every object is registered in each grid cell its bounding box overlaps,
+so a point query only has to look at the objects of a single cell.
+Moving an object only touches the hash when it crosses into a different
+set of cells. The hash keeps no coordinates of its own: queries return
+candidate keys, and the owner tests exact distances against its data
+"""
+
+import math
+from typing import Dict, Hashable, Iterable, Set, Tuple
+
+Cell = Tuple[int, int]
+
+
+class SpatialHash:
+    """Broadphase index of circles keyed by sortable ids"""
+
+    def __init__(self, cell_size: float = 160):
+        self.cell_size = cell_size
+        self.clear()
+
+    def clear(self):
+        # Cells map to dicts used as insertion-ordered sets of keys
+        self.cells: Dict[Cell, Dict[Hashable, None]] = {}
+        # key -> covered cells
+        self.entries: Dict[Hashable, Tuple[Cell, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def _cells_for(self, x: float, y: float, radius: float) -> Tuple[Cell, ...]:
+        size = self.cell_size
+        cx0, cx1 = math.floor((x - radius) / size), math.floor((x + radius) / size)
+        cy0, cy1 = math.floor((y - radius) / size), math.floor((y + radius) / size)
+        if cx0 == cx1 and cy0 == cy1:
+            return ((cx0, cy0),)
+        return tuple((cx, cy) for cy in range(cy0, cy1 + 1) for cx in range(cx0, cx1 + 1))
+
+    def insert(self, key: Hashable, x: float, y: float, radius: float = 0):
+        if key in self.entries:
+            self.remove(key)
+        cells = self._cells_for(x, y, radius)
+        self.entries[key] = cells
+        for cell in cells:
+            self.cells.setdefault(cell, {})[key] = None
+
+    def remove(self, key: Hashable):
+        cells = self.entries.pop(key, None)
+        if cells is None:
+            return
+        for cell in cells:
+            members = self.cells[cell]
+            del members[key]
+            if not members:
+                del self.cells[cell]
+
+    def move(self, key: Hashable, x: float, y: float, radius: float = 0):
+        """Update an object's position, re-bucketing it only if its cells changed"""
+        if self._cells_for(x, y, radius) != self.entries[key]:
+            self.insert(key, x, y, radius)
+
+    def members_at(self, x: float, y: float) -> Iterable[Hashable]:
+        """Keys registered in the cell containing (x, y), unfiltered"""
+        return self.cells.get((math.floor(x / self.cell_size), math.floor(y / self.cell_size)), ())
+
+    def members_near(self, x: float, y: float, radius: float) -> Set[Hashable]:
+        """Keys registered in any cell overlapping the box around a circle, unfiltered"""
+        members = set()
+        for cell in self._cells_for(x, y, radius):
+            members.update(self.cells.get(cell, ()))
+        return members
@@ -0,0 +1,164 @@
+"""
+Multi-process Monte Carlo parameter sweeps
+Shards headless simulations of GameState, the vectorized population or
+the GameEngine component stack over a grid of starting resources and
+event odds, runs the shards on a ProcessPoolExecutor and streams the
+aggregated statistics back to the parent process
+"""
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .simulation import BatchReport, HeadlessSimulator, CHOICE_POLICIES, POLICIES
+
+ENGINES = ("state", "population", "components")
+
+
+def shard_seed(base_seed: int, config_index: int, shard_index: int) -> int:
+    """Deterministic seed of one shard, independent of scheduling order"""
+    return (base_seed << 32) | (config_index << 16) | shard_index
+
+
+def build_grid(start_values: Dict[str, Sequence], event_chances: Sequence[Optional[float]]) -> List[Dict]:
+    """Expand value lists into one sweep configuration per combination"""
+    names = sorted(start_values)
+    configs = []
+    for values in itertools.product(*(start_values[name] for name in names)):
+        for event_chance in event_chances:
+            configs.append({
+                "start": dict(zip(names, values)),
+                "event_chance": event_chance,
+            })
+    return configs
+
+
+def run_shard(task: Tuple) -> Tuple[int, int, BatchReport]:
+    """Worker entry point: play one shard of one configuration"""
+    engine, config_index, shard_index, config, runs, seed, options = task
+    kwargs = {"start_overrides": config["start"], "max_days": options["max_days"], "seed": seed}
+    if config["event_chance"] is not None:
+        kwargs["event_chance"] = config["event_chance"]
+
+    if engine == "state":
+        simulator = HeadlessSimulator(POLICIES[options["policy"]],
+                                      CHOICE_POLICIES[options["choices"]], **kwargs)
+        report = simulator.run_batch(runs)
+    elif engine == "population":
+        from .population import PopulationSimulator
+        simulator = PopulationSimulator(runs, choice_policy=options["choices"],
+                                        speed=options["speed"],
+                                        min_stamina=options["min_stamina"], **kwargs)
+        report = simulator.report(simulator.run())
+    elif engine == "components":
+        from .engine_simulation import HeadlessEngine
+        report = HeadlessEngine(**kwargs).run_batch(runs)
+    else:
+        raise ValueError(f"Unknown engine: {engine}")
+
+    return config_index, shard_index, report
+
+
+class SweepDriver:
+    """Runs a grid of configurations across worker processes"""
+
+    def __init__(self, configs: List[Dict], runs_per_config: int, shards_per_config: int = 4,
+                 engine: str = "state", workers: Optional[int] = None, base_seed: int = 0,
+                 policy: str = "idle", choices: str = "random", max_days: int = 365):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        self.configs = configs
+        self.runs_per_config = runs_per_config
+        self.shards_per_config = max(1, min(shards_per_config, runs_per_config))
+        self.engine = engine
+        self.workers = workers or os.cpu_count() or 1
+        self.base_seed = base_seed
+
+        walk = {"walk": (3.0, 0.0), "walk_rested": (3.0, 10.0)}.get(policy, (0.0, 0.0))
+        self.options = {
+            "policy": policy,
+            "choices": choices,
+            "max_days": max_days,
+            "speed": walk[0],
+            "min_stamina": walk[1],
+        }
+        self.reports = [BatchReport() for _ in configs]
+
+    def tasks(self) -> Iterator[Tuple]:
+        """One task per (configuration, shard), with runs split evenly"""
+        for config_index, config in enumerate(self.configs):
+            base, extra = divmod(self.runs_per_config, self.shards_per_config)
+            for shard_index in range(self.shards_per_config):
+                runs = base + (1 if shard_index < extra else 0)
+                seed = shard_seed(self.base_seed, config_index, shard_index)
+                yield (self.engine, config_index, shard_index, config, runs, seed, self.options)
+
+    def stream(self) -> Iterator[Tuple[int, BatchReport]]:
+        """Run every shard and yield (config index, merged report) as shards finish"""
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(run_shard, task) for task in self.tasks()]
+            for future in as_completed(futures):
+                config_index, _, report = future.result()
+                self.reports[config_index].merge(report)
+                yield config_index, self.reports[config_index]
+
+    def run(self) -> List[BatchReport]:
+        """Run the whole sweep and return one report per configuration"""
+        for _ in self.stream():
+            pass
+        return self.reports
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sweep starting resources and event odds")
+    parser.add_argument("--engine", choices=ENGINES, default="state")
+    parser.add_argument("--food", type=int, nargs="+")
+    parser.add_argument("--water", type=int, nargs="+")
+    parser.add_argument("--medicine", type=int, nargs="+")
+    parser.add_argument("--fuel", type=int, nargs="+")
+    parser.add_argument("--weapons", type=int, nargs="+")
+    parser.add_argument("--event-chance", type=float, nargs="+", default=[None])
+    parser.add_argument("--runs", type=int, default=10000, help="runs per configuration")
+    parser.add_argument("--shards", type=int, default=4, help="shards per configuration")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="idle")
+    parser.add_argument("--choices", choices=sorted(CHOICE_POLICIES), default="random")
+    parser.add_argument("--max-days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Options left out keep each engine's own starting value
+    start_values = {name: getattr(args, name)
+                    for name in ("food", "water", "medicine", "fuel", "weapons")
+                    if getattr(args, name) is not None}
+    configs = build_grid(start_values, args.event_chance)
+    driver = SweepDriver(configs, args.runs, args.shards, args.engine, args.workers,
+                         args.seed, args.policy, args.choices, args.max_days)
+
+    start = time.perf_counter()
+    finished = 0
+    total = len(configs) * driver.shards_per_config
+    for config_index, report in driver.stream():
+        finished += 1
+        print(f"[{finished}/{total}] config {config_index}: {report.runs} runs, "
+              f"victory {report.summary()['victory_rate']:.1%}")
+    elapsed = time.perf_counter() - start
+
+    print()
+    for config, report in zip(configs, driver.reports):
+        summary = report.summary()
+        chance = config["event_chance"] if config["event_chance"] is not None else "default"
+        print(f"{config['start']} event_chance={chance}")
+        print(f"  victory {summary['victory_rate']:.1%}, mean days {summary['mean_days']:.2f}")
+        for cause, count in summary["causes"].items():
+            print(f"    {cause:<20} {count}")
+    runs = sum(report.runs for report in driver.reports)
+    print(f"{runs} runs in {elapsed:.1f}s ({runs / elapsed:.0f} runs/second)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Terrain codes and vectorized terrain generation
+Tiles are stored as uint8 terrain codes; colors, movement costs and
+other per-terrain properties are tables indexed by code. Terrain is
+generated from fractal value noise evaluated on whole arrays of tiles
+at once. Lattice values come from a hash of the lattice coordinates
+and the seed, so any rectangle of an unbounded map can be generated
+independently and neighbouring chunks line up seamlessly
+"""
+
+from enum import IntEnum
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+class Terrain(IntEnum):
+    """Terrain codes, ordered from the lowest noise value to the highest"""
+    WATER = 0
+    MOUNTAIN = 1
+    DESERT = 2
+    DIRT = 3
+    GRASS = 4
+
+
+TERRAIN_NAMES = tuple(terrain.name.lower() for terrain in Terrain)
+TERRAIN_CODES = {name: Terrain(code) for code, name in enumerate(TERRAIN_NAMES)}
+
+# Per-code lookup tables, indexed by a terrain code or a whole code array
+TERRAIN_COLORS = np.array([
+    (0, 191, 255),    # water
+    (105, 105, 105),  # mountain
+    (238, 203, 173),  # desert
+    (139, 69, 19),    # dirt
+    (34, 139, 34),    # grass
+], dtype=np.uint8)
+
+# Relative cost of crossing one tile
+MOVEMENT_COST = np.array([
+    3.0,  # water
+    2.5,  # mountain
+    1.5,  # desert
+    1.0,  # dirt
+    1.0,  # grass
+])
+
+# Cumulative share of tiles below each biome boundary: 10% water, 10%
+# mountain, 10% desert, 10% dirt and the remaining 60% grass
+BIOME_SPLIT = (0.1, 0.2, 0.3, 0.4)
+
+DEFAULT_SCALE = 8.0
+DEFAULT_OCTAVES = 3
+
+_MASK = (1 << 64) - 1
+_thresholds: Dict[Tuple[float, int], np.ndarray] = {}
+
+
+def terrain_code(terrain: Union[int, str]) -> Optional[Terrain]:
+    """Terrain code of a code or terrain type string, None for unknown names"""
+    if isinstance(terrain, str):
+        return TERRAIN_CODES.get(terrain)
+    return Terrain(int(terrain))
+
+
+def _lattice(ix: np.ndarray, iy: np.ndarray, seed: int) -> np.ndarray:
+    """Hash lattice coordinates to floats in [0, 1)"""
+    h = (ix.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+         ^ iy.astype(np.uint64) * np.uint64(0xC2B2AE3D27D4EB4F)
+         ^ np.uint64(seed & _MASK))
+    # splitmix64 finalizer
+    h ^= h >> np.uint64(30)
+    h *= np.uint64(0xBF58476D1CE4E5B9)
+    h ^= h >> np.uint64(27)
+    h *= np.uint64(0x94D049BB133111EB)
+    h ^= h >> np.uint64(31)
+    return (h >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+def _smooth_axis(start: int, count: int, frequency: float) -> Tuple[np.ndarray, np.ndarray, int, int]:
+    """Lattice cell index and smoothstep weight of every tile along one axis"""
+    position = (np.arange(start, start + count) + 0.5) * frequency
+    cell = np.floor(position)
+    t = position - cell
+    cell = cell.astype(np.int64)
+    first = int(cell[0])
+    return cell - first, t * t * (3.0 - 2.0 * t), first, int(cell[-1]) - first + 2
+
+
+def value_noise(cols: int, rows: int, seed: int, col0: int = 0, row0: int = 0,
+                scale: float = DEFAULT_SCALE, octaves: int = DEFAULT_OCTAVES) -> np.ndarray:
+    """Fractal value noise in [0, 1) for a rows x cols block of tiles starting at (col0, row0)"""
+    noise = np.zeros((rows, cols))
+    amplitude = 1.0
+    total = 0.0
+    for octave in range(octaves):
+        frequency = (2 ** octave) / scale
+        xi, sx, x_first, x_cells = _smooth_axis(col0, cols, frequency)
+        yi, sy, y_first, y_cells = _smooth_axis(row0, rows, frequency)
+
+        # Hash only the lattice points covering the block, then interpolate
+        # along x for every lattice row and along y for every tile row
+        lattice = _lattice(np.arange(x_first, x_first + x_cells)[None, :],
+                           np.arange(y_first, y_first + y_cells)[:, None],
+                           seed + octave * 0x632BE59BD9B4E019)
+        along_x = lattice[:, xi] * (1.0 - sx) + lattice[:, xi + 1] * sx
+        sy = sy[:, None]
+        noise += amplitude * (along_x[yi] * (1.0 - sy) + along_x[yi + 1] * sy)
+
+        total += amplitude
+        amplitude *= 0.5
+    return noise / total
+
+
+def biome_thresholds(scale: float = DEFAULT_SCALE, octaves: int = DEFAULT_OCTAVES) -> np.ndarray:
+    """Noise values splitting tiles into BIOME_SPLIT shares, measured once on a reference map"""
+    key = (scale, octaves)
+    thresholds = _thresholds.get(key)
+    if thresholds is None:
+        sample = value_noise(512, 512, 0, scale=scale, octaves=octaves)
+        thresholds = np.quantile(sample, BIOME_SPLIT)
+        _thresholds[key] = thresholds
+    return thresholds
+
+
+def generate_terrain_codes(cols: int, rows: int, seed: int, col0: int = 0, row0: int = 0,
+                           scale: float = DEFAULT_SCALE, octaves: int = DEFAULT_OCTAVES) -> np.ndarray:
+    """Terrain codes of a rows x cols block of tiles as a uint8 array"""
+    noise = value_noise(cols, rows, seed, col0, row0, scale, octaves)
+    return np.searchsorted(biome_thresholds(scale, octaves), noise, side="right").astype(np.uint8)
+
+
+def terrain_names(codes: np.ndarray) -> List[List[str]]:
+    """Convert a code array to rows of terrain type strings"""
+    return [[TERRAIN_NAMES[code] for code in row] for row in codes.tolist()]
+
+
+def terrain_shares(codes: np.ndarray) -> Sequence[float]:
+    """Fraction of tiles of each terrain code"""
+    return np.bincount(codes.ravel(), minlength=len(Terrain)) / codes.size
@@ -0,0 +1,57 @@
+"""
+Shared font registry and rendered-text cache
+Fonts are loaded once per (name, size) and rendered labels are kept in an
+LRU cache keyed by (font, text, color, antialias), so a label is only
+rasterized again when its text changes
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+_fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+
+
+def get_font(size: int, name: Optional[str] = None) -> pygame.font.Font:
+    """Font of the given size, loaded on first request and shared afterwards"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(name, size)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, antialias: bool, color) -> pygame.Surface:
+        """Drop-in for font.render(text, antialias, color) that reuses earlier surfaces"""
+        key = (font, text, tuple(color), antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+
+
+# Cache shared by every screen of the game
+text_cache = TextCache()
+render_text = text_cache.render
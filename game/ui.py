@@ -1,4 +1,5 @@
 import pygame
+from .text_cache import get_font, render_text
 
 class UI:
     def __init__(self, screen_width, screen_height):
@@ -6,9 +7,9 @@ class UI:
         self.screen_height = screen_height
         
         # Fonts
-        self.font_large = pygame.font.Font(None, 36)
-        self.font_medium = pygame.font.Font(None, 24)
-        self.font_small = pygame.font.Font(None, 18)
+        self.font_large = get_font(36)
+        self.font_medium = get_font(24)
+        self.font_small = get_font(18)
         
         # Colors
         self.WHITE = (255, 255, 255)
@@ -25,18 +26,45 @@ class UI:
         self.panel_width = 300
         self.margin = 10
         
-    def draw(self, screen, player, resource_manager, day):
-        # Draw main UI panel
-        self.draw_main_panel(screen, player, resource_manager, day)
-        
-        # Draw resource bars
-        self.draw_resource_bars(screen, resource_manager)
+        # Values each panel showed when last drawn, to tell which changed
+        self.panel_state = {}
         
-        # Draw player status
-        self.draw_player_status(screen, player)
-        
-        # Draw controls help
-        self.draw_controls(screen)
+    def draw(self, screen, player, resource_manager, day):
+        """Draw every panel and return the rects of panels whose contents changed"""
+        resources = (resource_manager.food, resource_manager.water, resource_manager.medicine,
+                     resource_manager.weapons, resource_manager.fuel)
+        panels = (
+            # Draw main UI panel
+            ("main", self.draw_main_panel(screen, player, resource_manager, day),
+             (day, player.health, player.sick, player.injured, player.exhausted)),
+            
+            # Draw resource bars
+            ("resources", self.draw_resource_bars(screen, resource_manager), resources),
+            
+            # Draw player status
+            ("status", self.draw_player_status(screen, player),
+             (player.health, player.stamina, player.morale, player.alive)),
+            
+            # Draw controls help
+            ("controls", self.draw_controls(screen), ()),
+        )
+        
+        changed = []
+        for name, rect, state in panels:
+            previous = self.panel_state.get(name)
+            if previous != (state, rect):
+                # Cover what the panel drew before as well as now
+                changed.append(rect if previous is None else rect.union(previous[1]))
+                self.panel_state[name] = (state, rect)
+        return changed
+    
+    def panel_rects(self):
+        """Screen areas covered by the panels when they were last drawn"""
+        return [rect for _, rect in self.panel_state.values()]
+    
+    def invalidate(self):
+        """Report every panel as changed on the next draw"""
+        self.panel_state = {}
     
     def draw_main_panel(self, screen, player, resource_manager, day):
         # Background panel
@@ -44,28 +72,31 @@ class UI:
                                 self.panel_width, self.panel_height)
         pygame.draw.rect(screen, self.DARK_GRAY, panel_rect)
         pygame.draw.rect(screen, self.WHITE, panel_rect, 2)
+        rects = []
         
         # Day counter
-        day_text = self.font_large.render(f"Day {day}", True, self.WHITE)
-        screen.blit(day_text, (self.margin + 10, self.margin + 10))
+        day_text = render_text(self.font_large, f"Day {day}", True, self.WHITE)
+        rects.append(screen.blit(day_text, (self.margin + 10, self.margin + 10)))
         
         # Health display
-        health_text = self.font_medium.render(f"Health: {player.health}/100", True, self.WHITE)
-        screen.blit(health_text, (self.margin + 10, self.margin + 50))
+        health_text = render_text(self.font_medium, f"Health: {player.health}/100", True, self.WHITE)
+        rects.append(screen.blit(health_text, (self.margin + 10, self.margin + 50)))
         
         # Status indicators
         status_y = self.margin + 75
         if player.sick:
-            sick_text = self.font_small.render("SICK", True, self.RED)
-            screen.blit(sick_text, (self.margin + 10, status_y))
+            sick_text = render_text(self.font_small, "SICK", True, self.RED)
+            rects.append(screen.blit(sick_text, (self.margin + 10, status_y)))
         
         if player.injured:
-            injured_text = self.font_small.render("INJURED", True, self.YELLOW)
-            screen.blit(injured_text, (self.margin + 60, status_y))
+            injured_text = render_text(self.font_small, "INJURED", True, self.YELLOW)
+            rects.append(screen.blit(injured_text, (self.margin + 60, status_y)))
         
         if player.exhausted:
-            exhausted_text = self.font_small.render("EXHAUSTED", True, self.BLUE)
-            screen.blit(exhausted_text, (self.margin + 130, status_y))
+            exhausted_text = render_text(self.font_small, "EXHAUSTED", True, self.BLUE)
+            rects.append(screen.blit(exhausted_text, (self.margin + 130, status_y)))
+        
+        return panel_rect.unionall(rects)
     
     def draw_resource_bars(self, screen, resource_manager):
         # Resource panel
@@ -78,10 +109,11 @@ class UI:
                                 resource_panel_width, resource_panel_height)
         pygame.draw.rect(screen, self.DARK_GRAY, panel_rect)
         pygame.draw.rect(screen, self.WHITE, panel_rect, 2)
+        rects = []
         
         # Title
-        title_text = self.font_medium.render("Resources", True, self.WHITE)
-        screen.blit(title_text, (resource_panel_x + 10, resource_panel_y + 10))
+        title_text = render_text(self.font_medium, "Resources", True, self.WHITE)
+        rects.append(screen.blit(title_text, (resource_panel_x + 10, resource_panel_y + 10)))
         
         # Resource bars
         resources = resource_manager.get_resource_status()
@@ -93,8 +125,8 @@ class UI:
             y = start_y + i * 25
             
             # Resource name
-            name_text = self.font_small.render(f"{resource_name.capitalize()}:", True, self.WHITE)
-            screen.blit(name_text, (resource_panel_x + 10, y))
+            name_text = render_text(self.font_small, f"{resource_name.capitalize()}:", True, self.WHITE)
+            rects.append(screen.blit(name_text, (resource_panel_x + 10, y)))
             
             # Background bar
             bar_rect = pygame.Rect(resource_panel_x + 80, y, bar_width, bar_height)
@@ -118,8 +150,10 @@ class UI:
                 pygame.draw.rect(screen, color, fill_rect)
             
             # Resource text
-            resource_text = self.font_small.render(f"{data['current']}/{data['max']}", True, self.WHITE)
-            screen.blit(resource_text, (resource_panel_x + 290, y))
+            resource_text = render_text(self.font_small, f"{data['current']}/{data['max']}", True, self.WHITE)
+            rects.append(screen.blit(resource_text, (resource_panel_x + 290, y)))
+        
+        return panel_rect.unionall(rects)
     
     def draw_player_status(self, screen, player):
         # Player status panel (right side)
@@ -132,14 +166,15 @@ class UI:
                                 status_panel_width, status_panel_height)
         pygame.draw.rect(screen, self.DARK_GRAY, panel_rect)
         pygame.draw.rect(screen, self.WHITE, panel_rect, 2)
+        rects = []
         
         # Title
-        title_text = self.font_medium.render("Player Status", True, self.WHITE)
-        screen.blit(title_text, (status_panel_x + 10, status_panel_y + 10))
+        title_text = render_text(self.font_medium, "Player Status", True, self.WHITE)
+        rects.append(screen.blit(title_text, (status_panel_x + 10, status_panel_y + 10)))
         
         # Health bar
-        health_label = self.font_small.render("Health:", True, self.WHITE)
-        screen.blit(health_label, (status_panel_x + 10, status_panel_y + 40))
+        health_label = render_text(self.font_small, "Health:", True, self.WHITE)
+        rects.append(screen.blit(health_label, (status_panel_x + 10, status_panel_y + 40)))
         
         health_bar_rect = pygame.Rect(status_panel_x + 70, status_panel_y + 40, 150, 15)
         pygame.draw.rect(screen, self.GRAY, health_bar_rect)
@@ -159,23 +194,25 @@ class UI:
         # Other stats
         stats_y = status_panel_y + 70
         
-        stamina_text = self.font_small.render(f"Stamina: {player.stamina}/100", True, self.WHITE)
-        screen.blit(stamina_text, (status_panel_x + 10, stats_y))
+        stamina_text = render_text(self.font_small, f"Stamina: {player.stamina}/100", True, self.WHITE)
+        rects.append(screen.blit(stamina_text, (status_panel_x + 10, stats_y)))
         
-        morale_text = self.font_small.render(f"Morale: {player.morale}/100", True, self.WHITE)
-        screen.blit(morale_text, (status_panel_x + 10, stats_y + 20))
+        morale_text = render_text(self.font_small, f"Morale: {player.morale}/100", True, self.WHITE)
+        rects.append(screen.blit(morale_text, (status_panel_x + 10, stats_y + 20)))
         
         # Survival info
         survival_y = stats_y + 50
-        survival_title = self.font_small.render("Survival Status:", True, self.WHITE)
-        screen.blit(survival_title, (status_panel_x + 10, survival_y))
+        survival_title = render_text(self.font_small, "Survival Status:", True, self.WHITE)
+        rects.append(screen.blit(survival_title, (status_panel_x + 10, survival_y)))
         
         if player.alive:
-            alive_text = self.font_small.render("ALIVE", True, self.GREEN)
-            screen.blit(alive_text, (status_panel_x + 10, survival_y + 20))
+            alive_text = render_text(self.font_small, "ALIVE", True, self.GREEN)
+            rects.append(screen.blit(alive_text, (status_panel_x + 10, survival_y + 20)))
         else:
-            dead_text = self.font_small.render("DEAD", True, self.RED)
-            screen.blit(dead_text, (status_panel_x + 10, survival_y + 20))
+            dead_text = render_text(self.font_small, "DEAD", True, self.RED)
+            rects.append(screen.blit(dead_text, (status_panel_x + 10, survival_y + 20)))
+        
+        return panel_rect.unionall(rects)
     
     def draw_controls(self, screen):
         # Controls panel (bottom)
@@ -186,6 +223,7 @@ class UI:
                                 self.screen_width - 2 * self.margin, controls_panel_height)
         pygame.draw.rect(screen, self.DARK_GRAY, panel_rect)
         pygame.draw.rect(screen, self.WHITE, panel_rect, 2)
+        rects = []
         
         # Controls text
         controls_text = [
@@ -195,8 +233,10 @@ class UI:
         ]
         
         for i, text in enumerate(controls_text):
-            text_surface = self.font_small.render(text, True, self.WHITE)
-            screen.blit(text_surface, (self.margin + 10, controls_panel_y + 10 + i * 18))
+            text_surface = render_text(self.font_small, text, True, self.WHITE)
+            rects.append(screen.blit(text_surface, (self.margin + 10, controls_panel_y + 10 + i * 18)))
+        
+        return panel_rect.unionall(rects)
     
     def draw_event_notification(self, screen, event_text):
         # Event notification (center of screen)
@@ -210,9 +250,11 @@ class UI:
                                        notification_width, notification_height)
         pygame.draw.rect(screen, self.BLACK, notification_rect)
         pygame.draw.rect(screen, self.RED, notification_rect, 3)
+        rects = []
         
         # Text
-        text_surface = self.font_medium.render(event_text, True, self.WHITE)
+        text_surface = render_text(self.font_medium, event_text, True, self.WHITE)
         text_rect = text_surface.get_rect(center=(notification_x + notification_width // 2, 
                                                  notification_y + notification_height // 2))
-        screen.blit(text_surface, text_rect)
\ No newline at end of file
+        rects.append(screen.blit(text_surface, text_rect))
+        return notification_rect.unionall(rects)
\ No newline at end of file
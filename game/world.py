@@ -1,118 +1,151 @@
 import pygame
-import random
-import math
+import numpy as np
+from .rng import GameRNG
+from .hazards import HazardSet, HAZARD_TYPES, HAZARD_CODES, STORM, PREDATOR, BANDIT_CAMP
+from .terrain import (Terrain, TERRAIN_NAMES, TERRAIN_COLORS, MOVEMENT_COST,
+                      generate_terrain_codes, terrain_code)
+
+MAX_HAZARD_RADIUS = 80
 
 class World:
-    def __init__(self, width, height):
+    def __init__(self, width, height, rng=None):
         self.width = width
         self.height = height
+        self.rng = rng or GameRNG()
+        self.init_colors()
         
         # World properties
         self.terrain_size = 40
-        self.terrain_grid = []
-        self.generate_terrain()
+        # uint8 terrain codes, indexed [row, col]
+        self.terrain_grid = np.zeros((0, 0), dtype=np.uint8)
+        
+        # The terrain never changes between frames, so it is drawn once
+        # into this surface and blitted as the background
+        self.terrain_surface = None
+        self.terrain_dirty = True
         
         # Environmental hazards
-        self.hazards = []
-        self.generate_hazards()
+        self.hazards = HazardSet(cell_size=MAX_HAZARD_RADIUS)
         
-        # Colors
-        self.GRASS = (34, 139, 34)
-        self.DIRT = (139, 69, 19)
-        self.WATER = (0, 191, 255)
-        self.MOUNTAIN = (105, 105, 105)
-        self.DESERT = (238, 203, 173)
+        self.generate_terrain()
+        self.generate_hazards()
+    
+    def init_colors(self):
+        # Terrain colors are defined once, in the TERRAIN_COLORS table
+        self.GRASS = self.get_terrain_color(Terrain.GRASS)
+        self.DIRT = self.get_terrain_color(Terrain.DIRT)
+        self.WATER = self.get_terrain_color(Terrain.WATER)
+        self.MOUNTAIN = self.get_terrain_color(Terrain.MOUNTAIN)
+        self.DESERT = self.get_terrain_color(Terrain.DESERT)
         self.DANGER = (255, 0, 0)
+        # Outline colors indexed by hazard type code
+        self.HAZARD_COLORS = [self.get_hazard_color(name) for name in HAZARD_TYPES]
         
     def generate_terrain(self):
-        # Generate a simple terrain grid
+        # Generate the whole terrain grid from coherent noise in one pass
         cols = self.width // self.terrain_size + 1
         rows = self.height // self.terrain_size + 1
         
-        for row in range(rows):
-            terrain_row = []
-            for col in range(cols):
-                # Generate terrain type based on position and random factor
-                terrain_type = self.get_terrain_type(col, row)
-                terrain_row.append(terrain_type)
-            self.terrain_grid.append(terrain_row)
+        self.terrain_seed = self.rng.randint(0, 2**63 - 1)
+        self.terrain_grid = generate_terrain_codes(cols, rows, self.terrain_seed)
+        self.terrain_dirty = True
     
-    def get_terrain_type(self, col, row):
-        # Use noise-like generation for more realistic terrain
-        base_noise = random.random()
+    def set_terrain(self, row, col, terrain_type):
+        """Change a single tile and schedule the background for re-baking"""
+        self.terrain_grid[row, col] = terrain_code(terrain_type)
+        self.terrain_dirty = True
+    
+    def bake_terrain(self):
+        """Render the whole terrain grid into the cached background surface"""
+        self.terrain_surface = self.render_terrain(self.terrain_grid)
+        self.terrain_dirty = False
+        return self.terrain_surface
+    
+    def render_terrain(self, terrain_grid):
+        """Draw a grid of terrain codes into a new surface in one array operation"""
+        # Look up every tile color at once and scale tiles up to pixels;
+        # surfarray expects [x, y] order, so the grid is transposed
+        colors = TERRAIN_COLORS[terrain_grid.T]
+        pixels = colors.repeat(self.terrain_size, axis=0).repeat(self.terrain_size, axis=1)
+        surface = pygame.surfarray.make_surface(pixels)
         
-        # Create some patterns
-        if base_noise < 0.1:
-            return "water"
-        elif base_noise < 0.2:
-            return "mountain"
-        elif base_noise < 0.3:
-            return "desert"
-        elif base_noise < 0.4:
-            return "dirt"
-        else:
-            return "grass"
+        # Match the display format when there is one for faster blits
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+    
+    def get_terrain_type(self, col, row):
+        # Terrain the noise field gives the tile at (col, row)
+        return TERRAIN_NAMES[self.get_terrain_code(col, row)]
+    
+    def get_terrain_code(self, col, row):
+        # Terrain code the noise field gives the tile at (col, row)
+        return Terrain(generate_terrain_codes(1, 1, self.terrain_seed, col, row)[0, 0])
     
     def generate_hazards(self):
         # Generate random environmental hazards
-        num_hazards = random.randint(5, 15)
+        num_hazards = self.rng.randint(5, 15)
         for _ in range(num_hazards):
-            x = random.randint(0, self.width)
-            y = random.randint(0, self.height)
-            hazard_type = random.choice(["storm", "predator", "bandit_camp"])
-            self.hazards.append({
-                "x": x,
-                "y": y,
-                "type": hazard_type,
-                "active": True,
-                "radius": random.randint(30, 80)
-            })
-    
-    def update(self):
-        # Update dynamic world elements
-        for hazard in self.hazards:
-            if hazard["type"] == "storm":
-                # Storms move randomly
-                hazard["x"] += random.randint(-2, 2)
-                hazard["y"] += random.randint(-2, 2)
-                
-                # Keep storms within bounds
-                hazard["x"] = max(0, min(self.width, hazard["x"]))
-                hazard["y"] = max(0, min(self.height, hazard["y"]))
+            x = self.rng.randint(0, self.width)
+            y = self.rng.randint(0, self.height)
+            hazard_type = self.rng.choice(HAZARD_TYPES)
+            self.hazards.add(x, y, hazard_type, self.rng.randint(30, MAX_HAZARD_RADIUS))
+    
+    def update(self, step_scale=1.0, focus=None):
+        # The whole world is always loaded, so the focus does not matter.
+        # Storms move randomly (drift is per frame at the nominal fps) and
+        # stay within bounds, all storms in one vectorized step
+        self.hazards.drift_storms(self.rng.numpy(), step_scale, (0, 0, self.width, self.height))
+    
+    def get_bounds(self):
+        """Area (left, top, right, bottom) that terrain_grid covers and NPCs stay in"""
+        return 0, 0, self.width, self.height
+    
+    def screen_offset(self):
+        """Offset from world to screen coordinates; the fixed world never scrolls"""
+        return 0, 0
     
     def draw(self, screen):
-        # Draw terrain
-        for row in range(len(self.terrain_grid)):
-            for col in range(len(self.terrain_grid[row])):
-                x = col * self.terrain_size
-                y = row * self.terrain_size
-                
-                terrain_type = self.terrain_grid[row][col]
-                color = self.get_terrain_color(terrain_type)
-                
-                pygame.draw.rect(screen, color, 
-                               (x, y, self.terrain_size, self.terrain_size))
+        """Draw the world and return the rects covered by hazards"""
+        # Draw terrain from the cached background
+        if self.terrain_dirty or self.terrain_surface is None:
+            self.bake_terrain()
+        screen.blit(self.terrain_surface, (0, 0))
         
         # Draw hazards
-        for hazard in self.hazards:
-            if hazard["active"]:
-                color = self.get_hazard_color(hazard["type"])
-                pygame.draw.circle(screen, color, 
-                                 (int(hazard["x"]), int(hazard["y"])), 
-                                 hazard["radius"], 2)
-                
-                # Draw hazard icon/symbol
-                self.draw_hazard_symbol(screen, hazard)
+        return self.draw_hazards(screen, self.hazards)
+    
+    def restore(self, screen, rect):
+        """Redraw the background terrain over one region of the screen"""
+        if self.terrain_dirty or self.terrain_surface is None:
+            self.bake_terrain()
+        return screen.blit(self.terrain_surface, rect, rect)
+    
+    def draw_hazards(self, screen, hazards, offset=(0, 0)):
+        # Read the HazardSet columns once rather than one HazardView per hazard
+        active = np.flatnonzero(hazards.active)
+        xs = (hazards.x[active] + offset[0]).astype(np.int64).tolist()
+        ys = (hazards.y[active] + offset[1]).astype(np.int64).tolist()
+        radii = hazards.radius[active].astype(np.int64).tolist()
+        kinds = hazards.type[active].tolist()
+        
+        rects = []
+        colors = self.HAZARD_COLORS
+        circle = pygame.draw.circle
+        draw_symbol = self.draw_symbol
+        for x, y, radius, kind in zip(xs, ys, radii, kinds):
+            rect = circle(screen, colors[kind], (x, y), radius, 2)
+            
+            # Draw hazard icon/symbol
+            rect.union_ip(draw_symbol(screen, kind, x, y))
+            rects.append(rect)
+        return rects
     
     def get_terrain_color(self, terrain_type):
-        colors = {
-            "grass": self.GRASS,
-            "dirt": self.DIRT,
-            "water": self.WATER,
-            "mountain": self.MOUNTAIN,
-            "desert": self.DESERT
-        }
-        return colors.get(terrain_type, self.GRASS)
+        code = terrain_code(terrain_type)
+        if code is None:
+            return self.GRASS
+        return tuple(TERRAIN_COLORS[code].tolist())
     
     def get_hazard_color(self, hazard_type):
         if hazard_type == "storm":
@@ -123,37 +156,68 @@ class World:
             return (255, 165, 0)  # Orange
         return (255, 255, 255)  # White default
     
-    def draw_hazard_symbol(self, screen, hazard):
-        x, y = int(hazard["x"]), int(hazard["y"])
-        
-        if hazard["type"] == "storm":
+    def draw_hazard_symbol(self, screen, hazard, offset=(0, 0)):
+        # Per-hazard interface kept for HazardView and dict callers
+        x, y = int(hazard["x"] + offset[0]), int(hazard["y"] + offset[1])
+        return self.draw_symbol(screen, HAZARD_CODES[hazard["type"]], x, y)
+    
+    def draw_symbol(self, screen, kind, x, y):
+        """Draw the icon of a hazard type code centred on (x, y) and return its rect"""
+        if kind == STORM:
             # Draw lightning bolt
             points = [(x-5, y-10), (x+5, y-5), (x-2, y-5), (x+5, y+10), (x-5, y+5), (x+2, y+5)]
             if len(points) >= 3:
-                pygame.draw.polygon(screen, (255, 255, 0), points)
+                return pygame.draw.polygon(screen, (255, 255, 0), points)
         
-        elif hazard["type"] == "predator":
+        elif kind == PREDATOR:
             # Draw triangle (predator teeth)
             points = [(x, y-8), (x-6, y+8), (x+6, y+8)]
-            pygame.draw.polygon(screen, (255, 0, 0), points)
+            return pygame.draw.polygon(screen, (255, 0, 0), points)
         
-        elif hazard["type"] == "bandit_camp":
+        elif kind == BANDIT_CAMP:
             # Draw crossed swords
-            pygame.draw.line(screen, (255, 165, 0), (x-6, y-6), (x+6, y+6), 3)
-            pygame.draw.line(screen, (255, 165, 0), (x+6, y-6), (x-6, y+6), 3)
+            rect = pygame.draw.line(screen, (255, 165, 0), (x-6, y-6), (x+6, y+6), 3)
+            return rect.union(pygame.draw.line(screen, (255, 165, 0), (x+6, y-6), (x-6, y+6), 3))
+        return pygame.Rect(x, y, 0, 0)
     
     def check_hazard_collision(self, player_x, player_y):
-        for hazard in self.hazards:
-            if hazard["active"]:
-                distance = math.sqrt((player_x - hazard["x"])**2 + (player_y - hazard["y"])**2)
-                if distance < hazard["radius"]:
-                    return hazard
-        return None
+        # First active hazard in list order whose circle contains the point
+        i = self.hazards.first_hit(player_x, player_y)
+        return None if i is None else self.hazards[i]
+    
+    def check_hazard_collisions(self, positions):
+        """check_hazard_collision for many entities at once"""
+        return [None if i is None else self.hazards[i] for i in self.hazards.first_hits(positions)]
+    
+    def get_hazards_in_radius(self, x, y, radius):
+        """Active hazards whose centers lie within radius of (x, y)"""
+        return [self.hazards[i] for i in self.hazards.query_radius(x, y, radius).tolist()]
     
     def get_terrain_at(self, x, y):
+        # String API kept for callers that compare terrain type names
+        return TERRAIN_NAMES[self.get_terrain_code_at(x, y)]
+    
+    def get_terrain_code_at(self, x, y):
         col = int(x // self.terrain_size)
         row = int(y // self.terrain_size)
+        rows, cols = self.terrain_grid.shape
+        
+        if 0 <= row < rows and 0 <= col < cols:
+            return Terrain(self.terrain_grid[row, col])
+        return Terrain.GRASS
+    
+    def get_movement_cost_at(self, x, y):
+        return float(MOVEMENT_COST[self.get_terrain_code_at(x, y)])
+    
+    def count_terrain_in_radius(self, x, y, radius, terrain_type):
+        """Number of tiles of a terrain type whose centers lie within radius of (x, y)"""
+        size = self.terrain_size
+        col0 = max(0, int((x - radius) // size))
+        row0 = max(0, int((y - radius) // size))
+        block = self.terrain_grid[row0:int((y + radius) // size) + 1,
+                                  col0:int((x + radius) // size) + 1]
         
-        if 0 <= row < len(self.terrain_grid) and 0 <= col < len(self.terrain_grid[row]):
-            return self.terrain_grid[row][col]
-        return "grass"
\ No newline at end of file
+        centers_x = (np.arange(col0, col0 + block.shape[1]) + 0.5) * size - x
+        centers_y = (np.arange(row0, row0 + block.shape[0]) + 0.5) * size - y
+        inside = centers_x[None, :] ** 2 + centers_y[:, None] ** 2 <= radius * radius
+        return int(np.count_nonzero(inside & (block == terrain_code(terrain_type))))
\ No newline at end of file
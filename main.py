@@ -10,9 +10,18 @@ def main():
     SCREEN_WIDTH = 1024
     SCREEN_HEIGHT = 768
     FPS = 60
+    SIM_RATE = FPS      # Simulation steps per second
+    RENDER_RATE = FPS   # Frames drawn per second (lower it on slow hardware)
+    DIRTY_RECTS = True  # Update only changed screen regions instead of flipping
+    PROFILE = False     # Record frame timings from the start (F3 toggles the overlay)
+    AUTOSAVE = False    # Snapshot the game every day (F5 saves, F9 loads)
+    NPCS = 0            # NPC survivors sharing the world (thousands run at full speed)
+    CHUNKED = False     # Endless world streamed in chunks around the player
     
     # Create the game engine
-    game = GameEngine(SCREEN_WIDTH, SCREEN_HEIGHT, FPS)
+    game = GameEngine(SCREEN_WIDTH, SCREEN_HEIGHT, FPS,
+                      sim_rate=SIM_RATE, render_rate=RENDER_RATE, dirty_rects=DIRTY_RECTS,
+                      profile=PROFILE, autosave=AUTOSAVE, npcs=NPCS, chunked=CHUNKED)
     
     # Run the game
     game.run()
@@ -5,16 +5,43 @@ Compatible with pygame-web/pygbag for browser deployment
 
 import asyncio
 import pygame
-import random
-from typing import Dict
+from typing import Dict, Optional
+
+from game.event_catalog import EventCatalog, Roll
+from game.rng import GameRNG
+from game.scheduler import EventScheduler
+from game.text_cache import get_font, render_text
+from game.profiler import FrameProfiler
 
 # Pygame-web compatible imports
 import pygame.freetype
 
+# Shorter texts and simpler effects than the shared catalog; the web
+# version has no morale
+WEB_CATALOG = EventCatalog(overrides={
+    "Sick Traveler": {"description": "You encounter a sick traveler."},
+    "Resource Cache": {"description": "You found supplies!"},
+    "fight_animal": {"text": "Fight it"},
+    "flee_animal": {"text": "Run away"},
+    "weapon_animal": {"text": "Use weapon"},
+    "help_sick": {"text": "Help them", "success": {"medicine": -1},
+                  "failure": {"player_health": -5}},
+    "ignore_sick": {"text": "Ignore them", "effect": {}},
+    "rob_sick": {"text": "Rob them", "effect": {"food": Roll(1, 5), "water": Roll(1, 3)}},
+    "take_all": {"text": "Take everything"},
+    "take_some": {"text": "Take some", "effect": {"food": Roll(3, 8), "water": Roll(2, 6)}},
+    "leave_cache": {"text": "Leave it", "effect": {}},
+})
+
 class WebGameState:
     """Simplified game state for web version"""
     
-    def __init__(self):
+    ENCOUNTER_CHANCE = 1 / 2000
+    CATALOG = WEB_CATALOG
+    
+    def __init__(self, rng: Optional[GameRNG] = None):
+        self.rng = rng or GameRNG()
+        self.scheduler = EventScheduler(self.rng)
         self.reset_game()
     
     def reset_game(self):
@@ -41,6 +68,10 @@ class WebGameState:
         self.distance_traveled = 0
         self.target_distance = 1000
         self.current_event = None
+        
+        # Sample when the next encounter happens instead of rolling each frame
+        self.scheduler.clear()
+        self.scheduler.schedule_chance("encounter", self.ENCOUNTER_CHANCE)
     
     def update(self, dt: float):
         if self.game_over or not self.player_alive:
@@ -53,7 +84,7 @@ class WebGameState:
             self.time_passed = 0
         
         # Random events
-        if random.randint(1, 2000) == 1:
+        if "encounter" in self.scheduler.advance():
             self.trigger_random_event()
         
         # Check death conditions
@@ -91,9 +122,9 @@ class WebGameState:
         self.day += 1
         
         # Resource consumption
-        self.food -= random.randint(3, 7)
-        self.water -= random.randint(5, 10)
-        self.fuel -= random.randint(1, 3)
+        self.food -= self.rng.randint(3, 7)
+        self.water -= self.rng.randint(5, 10)
+        self.fuel -= self.rng.randint(1, 3)
         
         # Effects of shortage
         if self.food <= 0:
@@ -110,102 +141,24 @@ class WebGameState:
         self.player_stamina = min(100, self.player_stamina + 20)
         
         # Daily events
-        if random.randint(1, 3) == 1:
+        if self.rng.randint(1, 3) == 1:
             self.trigger_daily_event()
     
     def trigger_random_event(self):
-        events = [
-            {
-                "title": "Wild Animal Attack",
-                "description": "A hostile animal blocks your path!",
-                "choices": [
-                    {"text": "Fight it", "id": "fight_animal"},
-                    {"text": "Run away", "id": "flee_animal"},
-                    {"text": "Use weapon", "id": "weapon_animal"}
-                ]
-            },
-            {
-                "title": "Sick Traveler",
-                "description": "You encounter a sick traveler.",
-                "choices": [
-                    {"text": "Help them", "id": "help_sick"},
-                    {"text": "Ignore them", "id": "ignore_sick"},
-                    {"text": "Rob them", "id": "rob_sick"}
-                ]
-            },
-            {
-                "title": "Resource Cache",
-                "description": "You found supplies!",
-                "choices": [
-                    {"text": "Take everything", "id": "take_all"},
-                    {"text": "Take some", "id": "take_some"},
-                    {"text": "Leave it", "id": "leave_cache"}
-                ]
-            }
-        ]
-        
-        self.current_event = random.choice(events)
+        self.current_event = self.CATALOG.random_encounter(self.rng)
     
     def trigger_daily_event(self):
-        events = [
-            "harsh_weather",
-            "found_berries", 
-            "storm_damage",
-            "met_travelers"
-        ]
-        
-        event = random.choice(events)
-        if event in ["harsh_weather", "storm_damage"]:
-            self.player_health -= random.randint(5, 15)
-            self.fuel -= random.randint(1, 5)
-        elif event in ["found_berries", "met_travelers"]:
-            self.food += random.randint(2, 8)
+        self.CATALOG.daily_event(self, self.rng)
     
     def handle_event_choice(self, choice_id: str):
         if not self.current_event:
             return
         
-        if choice_id == "fight_animal":
-            if random.randint(1, 2) == 1:
-                self.player_health -= random.randint(10, 25)
-                self.food += random.randint(5, 15)
-            else:
-                self.player_health -= random.randint(20, 40)
-        
-        elif choice_id == "flee_animal":
-            self.player_stamina -= 30
-        
-        elif choice_id == "weapon_animal":
-            if self.weapons > 0:
-                self.weapons -= 1
-                self.food += random.randint(8, 20)
-            else:
-                self.player_health -= random.randint(15, 35)
-        
-        elif choice_id == "help_sick":
-            if self.medicine > 0:
-                self.medicine -= 1
-            else:
-                self.player_health -= 5
-        
-        elif choice_id == "rob_sick":
-            self.food += random.randint(1, 5)
-            self.water += random.randint(1, 3)
-        
-        elif choice_id == "take_all":
-            self.food += random.randint(10, 20)
-            self.water += random.randint(5, 15)
-            self.medicine += random.randint(1, 5)
-            self.fuel += random.randint(3, 10)
-        
-        elif choice_id == "take_some":
-            self.food += random.randint(3, 8)
-            self.water += random.randint(2, 6)
-        
+        self.CATALOG.resolve(self, choice_id, self.rng)
         self.current_event = None
 
 class WebGame:
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         pygame.init()
         self.width = 800
         self.height = 600
@@ -213,13 +166,13 @@ class WebGame:
         pygame.display.set_caption("Death Game Simulator")
         
         self.clock = pygame.time.Clock()
-        self.game_state = WebGameState()
+        self.game_state = WebGameState(GameRNG(seed))
         self.running = True
         
         # Try to load font
         try:
-            self.font = pygame.font.Font(None, 36)
-            self.small_font = pygame.font.Font(None, 24)
+            self.font = get_font(36)
+            self.small_font = get_font(24)
         except:
             # Fallback if no font available
             self.font = pygame.font.Font(None, 36)
@@ -236,12 +189,22 @@ class WebGame:
         
         # UI state
         self.show_event_popup = False
+        
+        # Frame-time profiler, F3 toggles the overlay
+        self.profiler = FrameProfiler()
     
     async def run(self):
         while self.running:
-            await self.handle_events()
-            await self.update()
-            await self.draw()
+            profiler = self.profiler
+            profiler.begin_frame()
+            with profiler.section("events"):
+                await self.handle_events()
+            with profiler.section("update"):
+                await self.update()
+            with profiler.section("draw"):
+                await self.draw()
+            profiler.end_frame()
+            self.clock.tick(60)
             await asyncio.sleep(0)
     
     async def handle_events(self):
@@ -251,6 +214,8 @@ class WebGame:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
                 elif event.key == pygame.K_r:
                     self.game_state.reset_game()
                     self.show_event_popup = False
@@ -321,7 +286,8 @@ class WebGame:
             pygame.draw.rect(self.screen, self.RED, (bar_x, bar_y, health_width, 4))
         
         # Draw UI
-        self.draw_ui()
+        with self.profiler.section("draw.ui"):
+            self.draw_ui()
         
         # Draw event popup
         if self.show_event_popup:
@@ -331,18 +297,20 @@ class WebGame:
         if self.game_state.game_over:
             self.draw_game_over()
         
+        if self.profiler.overlay_visible:
+            self.profiler.draw_overlay(self.screen, (self.width - 260, self.height - 160))
+        
         pygame.display.flip()
-        self.clock.tick(60)
     
     def draw_ui(self):
         # Status
-        day_text = self.font.render(f"Day: {self.game_state.day}", True, self.WHITE)
+        day_text = render_text(self.font, f"Day: {self.game_state.day}", True, self.WHITE)
         self.screen.blit(day_text, (10, 10))
         
-        health_text = self.small_font.render(f"Health: {self.game_state.player_health:.0f}", True, self.WHITE)
+        health_text = render_text(self.small_font, f"Health: {self.game_state.player_health:.0f}", True, self.WHITE)
         self.screen.blit(health_text, (10, 50))
         
-        stamina_text = self.small_font.render(f"Stamina: {self.game_state.player_stamina:.0f}", True, self.WHITE)
+        stamina_text = render_text(self.small_font, f"Stamina: {self.game_state.player_stamina:.0f}", True, self.WHITE)
         self.screen.blit(stamina_text, (10, 70))
         
         # Resources
@@ -356,13 +324,13 @@ class WebGame:
         
         y_offset = 100
         for resource in resources:
-            text = self.small_font.render(resource, True, self.WHITE)
+            text = render_text(self.small_font, resource, True, self.WHITE)
             self.screen.blit(text, (10, y_offset))
             y_offset += 20
         
         # Progress
         progress = (self.game_state.distance_traveled / self.game_state.target_distance) * 100
-        progress_text = self.small_font.render(f"Progress: {progress:.1f}%", True, self.WHITE)
+        progress_text = render_text(self.small_font, f"Progress: {progress:.1f}%", True, self.WHITE)
         self.screen.blit(progress_text, (10, y_offset + 10))
         
         # Progress bar
@@ -380,7 +348,7 @@ class WebGame:
         
         y_offset = self.height - 100
         for control in controls:
-            text = self.small_font.render(control, True, self.WHITE)
+            text = render_text(self.small_font, control, True, self.WHITE)
             self.screen.blit(text, (self.width - 120, y_offset))
             y_offset += 20
     
@@ -399,11 +367,11 @@ class WebGame:
         
         # Event text
         event = self.game_state.current_event
-        title = self.font.render(event['title'], True, self.WHITE)
+        title = render_text(self.font, event['title'], True, self.WHITE)
         title_rect = title.get_rect(center=(popup_x + popup_width//2, popup_y + 30))
         self.screen.blit(title, title_rect)
         
-        desc = self.small_font.render(event['description'], True, self.WHITE)
+        desc = render_text(self.small_font, event['description'], True, self.WHITE)
         desc_rect = desc.get_rect(center=(popup_x + popup_width//2, popup_y + 60))
         self.screen.blit(desc, desc_rect)
         
@@ -411,12 +379,12 @@ class WebGame:
         y_offset = popup_y + 90
         for i, choice in enumerate(event['choices']):
             choice_text = f"{i+1}. {choice['text']}"
-            choice_surface = self.small_font.render(choice_text, True, self.WHITE)
+            choice_surface = render_text(self.small_font, choice_text, True, self.WHITE)
             self.screen.blit(choice_surface, (popup_x + 20, y_offset))
             y_offset += 25
         
         # Instructions
-        instruction = self.small_font.render("Press 1, 2, or 3", True, self.YELLOW)
+        instruction = render_text(self.small_font, "Press 1, 2, or 3", True, self.YELLOW)
         instruction_rect = instruction.get_rect(center=(popup_x + popup_width//2, popup_y + popup_height - 15))
         self.screen.blit(instruction, instruction_rect)
     
@@ -435,17 +403,17 @@ class WebGame:
             text = "GAME OVER"
             color = self.RED
         
-        game_over = self.font.render(text, True, color)
+        game_over = render_text(self.font, text, True, color)
         game_over_rect = game_over.get_rect(center=(self.width//2, self.height//2 - 50))
         self.screen.blit(game_over, game_over_rect)
         
         # Stats
-        survival = self.small_font.render(f"Survived {self.game_state.day} days", True, self.WHITE)
+        survival = render_text(self.small_font, f"Survived {self.game_state.day} days", True, self.WHITE)
         survival_rect = survival.get_rect(center=(self.width//2, self.height//2))
         self.screen.blit(survival, survival_rect)
         
         # Restart
-        restart = self.small_font.render("Press R to restart", True, self.WHITE)
+        restart = render_text(self.small_font, "Press R to restart", True, self.WHITE)
         restart_rect = restart.get_rect(center=(self.width//2, self.height//2 + 50))
         self.screen.blit(restart, restart_rect)
 
@@ -18,9 +18,11 @@ from kivy.core.window import Window
 from kivy.uix.anchorlayout import AnchorLayout
 from kivy.uix.floatlayout import FloatLayout
 import math
+import os
 
 # Import shared game logic
 from game.core_game import GameState
+from game.profiler import FrameProfiler
 
 class GameWidget(Widget):
     """Widget that handles the game rendering and touch controls"""
@@ -102,10 +104,21 @@ class GameWidget(Widget):
 class GameScreen(Screen):
     """Main game screen"""
     
+    # Kivy key codes of the profiler keys, as in the desktop version
+    KEY_F3 = 284
+    KEY_F4 = 285
+    
+    # Frames between refreshes of the profiler overlay text
+    OVERLAY_INTERVAL = 30
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.game_state = GameState()
+        # Frame-time profiler; F3 or the menu toggles its overlay, F4 or the
+        # menu writes the samples to the app's data directory
+        self.profiler = FrameProfiler()
         self.build_ui()
+        Window.bind(on_key_down=self.on_key_down)
         
         # Start game loop
         Clock.schedule_interval(self.update_game, 1.0/60.0)
@@ -173,25 +186,62 @@ class GameScreen(Screen):
         main_layout.add_widget(controls_layout)
         
         self.add_widget(main_layout)
+        
+        # Profiler overlay drawn on top of the game area
+        self.profiler_label = Label(text='', font_name='RobotoMono-Regular', font_size='11sp',
+                                    color=(1, 1, 0, 1), halign='left', valign='top',
+                                    size_hint=(0.9, 0.4), pos_hint={'x': 0.05, 'top': 0.82},
+                                    opacity=0)
+        self.profiler_label.bind(size=self.profiler_label.setter('text_size'))
+        self.add_widget(self.profiler_label)
+    
+    def on_key_down(self, window, key, scancode, codepoint, modifiers):
+        if key == self.KEY_F3:
+            self.toggle_profiler()
+            return True
+        if key == self.KEY_F4:
+            self.dump_profile()
+            return True
+        return False
+    
+    def toggle_profiler(self, *args):
+        """Show or hide the profiler overlay; showing it starts recording"""
+        self.profiler.toggle_overlay()
+        self.profiler_label.opacity = 1 if self.profiler.overlay_visible else 0
+    
+    def dump_profile(self, *args):
+        """Write the recorded frames as profile.json and profile.csv"""
+        path = os.path.join(App.get_running_app().user_data_dir, "profile")
+        self.profiler.dump_json(path + ".json")
+        self.profiler.dump_csv(path + ".csv")
     
     def update_game(self, dt):
         """Update game state and UI"""
-        self.game_state.update(dt)
+        profiler = self.profiler
+        profiler.begin_frame()
+        with profiler.section("update"):
+            self.game_state.update(dt)
         
         # Update UI elements
-        status = self.game_state.get_status()
-        
-        self.health_bar.value = status['health']
-        self.day_label.text = str(status['day'])
-        self.progress_bar.value = status['progress']
-        
-        self.food_label.text = f"Food: {status['food']}"
-        self.water_label.text = f"Water: {status['water']}"
-        self.medicine_label.text = f"Medicine: {status['medicine']}"
-        self.fuel_label.text = f"Fuel: {status['fuel']}"
+        with profiler.section("draw.ui"):
+            status = self.game_state.get_status()
+            
+            self.health_bar.value = status['health']
+            self.day_label.text = str(status['day'])
+            self.progress_bar.value = status['progress']
+            
+            self.food_label.text = f"Food: {status['food']}"
+            self.water_label.text = f"Water: {status['water']}"
+            self.medicine_label.text = f"Medicine: {status['medicine']}"
+            self.fuel_label.text = f"Fuel: {status['fuel']}"
         
         # Update game widget graphics
-        self.game_widget.update_graphics()
+        with profiler.section("draw.world"):
+            self.game_widget.update_graphics()
+        profiler.end_frame()
+        
+        if profiler.overlay_visible and profiler.frame_count % self.OVERLAY_INTERVAL == 0:
+            self.profiler_label.text = "\n".join(profiler.overlay_lines())
         
         # Check for events
         if status['current_event']:
@@ -242,22 +292,29 @@ class GameScreen(Screen):
         """Show menu popup"""
         content = BoxLayout(orientation='vertical', padding=10, spacing=10)
         
-        restart_btn = Button(text='Restart Game', size_hint_y=0.5)
+        restart_btn = Button(text='Restart Game', size_hint_y=0.25)
         restart_btn.bind(on_press=self.restart_game)
         
-        close_btn = Button(text='Close', size_hint_y=0.5)
+        profiler_btn = Button(text='Profiler Overlay', size_hint_y=0.25)
+        profiler_btn.bind(on_press=self.toggle_profiler)
+        
+        dump_btn = Button(text='Save Profile', size_hint_y=0.25)
+        dump_btn.bind(on_press=self.dump_profile)
+        
+        close_btn = Button(text='Close', size_hint_y=0.25)
         close_btn.bind(on_press=lambda x: popup.dismiss())
         
         content.add_widget(restart_btn)
+        content.add_widget(profiler_btn)
+        content.add_widget(dump_btn)
         content.add_widget(close_btn)
         
-        popup = Popup(title='Menu', content=content, size_hint=(0.6, 0.4))
+        popup = Popup(title='Menu', content=content, size_hint=(0.6, 0.6))
         popup.open()
     
     def rest_player(self, instance):
         """Rest to restore stamina"""
-        self.game_state.player_stamina = min(100, self.game_state.player_stamina + 20)
-        self.game_state.advance_day()  # Resting advances time
+        self.game_state.rest()
     
     def restart_game(self, instance):
         """Restart the game"""
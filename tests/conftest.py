@@ -0,0 +1,5 @@
+import os
+
+# Rendering tests run offscreen
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,51 @@
+import pytest
+
+from game.ai import REST, WALK, SurvivorAI
+from game.core_game import GameState
+from game.rng import GameRNG
+
+
+class QuietGame(GameState):
+    ENCOUNTER_CHANCE = 0
+
+
+# Enough stamina for the whole step, and running out part way through
+@pytest.mark.parametrize("stamina", [100, 5])
+def test_model_walk_matches_real_moves(stamina):
+    state = QuietGame(GameRNG(5))
+    state.player_stamina = stamina
+    ai = SurvivorAI(step_frames=300, speed=3.0, dt=1 / 60, seed=1)
+    model = ai.model(state)
+    model.walk()
+
+    for _ in range(300):
+        state.move_player(3.0, 0)
+        state.update(1 / 60)
+    assert model.distance_traveled == pytest.approx(state.distance_traveled)
+    assert model.player_stamina == pytest.approx(state.player_stamina)
+    assert model.player_health == pytest.approx(state.player_health)
+    assert model.time_passed == pytest.approx(state.time_passed)
+    assert model.day == state.day == 1
+    assert model.event is None
+
+
+def decisions(workers=0):
+    ai = SurvivorAI(iterations=200, seed=3, workers=workers)
+    state = GameState(GameRNG(8))
+    try:
+        actions = [ai.decide(state)]
+        state.trigger_random_event()
+        actions.append(ai.decide(state))
+        return actions, len(ai.table)
+    finally:
+        ai.close()
+
+
+def test_fixed_iterations_and_seed_are_deterministic():
+    first = decisions()
+    assert first == decisions()
+    assert first[0][0] in (WALK, REST)
+
+
+def test_worker_searches_are_deterministic():
+    assert decisions(workers=2) == decisions(workers=2)
@@ -0,0 +1,20 @@
+from benchmarks.bench import compare, environment_differences, pinned_versions
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    baseline = {"results": {"fast": {"median_seconds": 1.0}, "slow": {"median_seconds": 1.0}}}
+    results = {"fast": {"median_seconds": 1.2}, "slow": {"median_seconds": 1.3},
+               "new": {"median_seconds": 5.0}}
+    assert compare(results, baseline, 0.25) == ["slow"]
+
+
+def test_environment_differences_name_mismatched_versions():
+    expected = {"pygame": "2.5.2", "numpy": "1.24.3", "python": "3.11.7"}
+    actual = {"pygame": "2.6.1", "numpy": "1.24.3", "machine": "x86_64"}
+    assert environment_differences(expected, actual) == ["pygame: 2.5.2 vs 2.6.1"]
+
+
+def test_pins_are_read_from_requirements(tmp_path):
+    path = tmp_path / "requirements.txt"
+    path.write_text("pygame==2.5.2\nNumPy == 1.24.3  # arrays\nkivy>=2\n")
+    assert pinned_versions(str(path)) == {"pygame": "2.5.2", "numpy": "1.24.3"}
@@ -0,0 +1,134 @@
+import numpy as np
+import pygame
+
+from game.chunked_world import ChunkedWorld
+from game.ecs import Survivors
+from game.hazards import HazardSet
+from game.rng import GameRNG
+from game.terrain import Terrain
+
+
+def make_world(seed=3, **options):
+    return ChunkedWorld(1024, 768, GameRNG(seed), **options)
+
+
+def walk(world, start, stop, dx=8.0):
+    for i in range(start, stop):
+        world.update(1.0, (512 + i * dx, 384))
+
+
+def test_window_fills_the_world_attributes():
+    world = make_world()
+    assert isinstance(world.hazards, HazardSet)
+    left, top, right, bottom = world.get_bounds()
+    rows, cols = world.terrain_grid.shape
+    assert (right - left, bottom - top) == (cols * world.terrain_size, rows * world.terrain_size)
+    assert left <= 0 and top <= 0 and right >= world.width and bottom >= world.height
+    assert len(world.hazards) == sum(len(chunk.hazards[0]) for chunk, _ in world.window_chunks.values())
+
+
+def test_untouched_chunks_regenerate_identically():
+    world, other = make_world(), make_world()
+    chunk = world.generate_chunk(5, -2)
+    again = other.generate_chunk(5, -2)
+    assert np.array_equal(chunk.terrain_grid, again.terrain_grid)
+    assert all(np.array_equal(a, b) for a, b in zip(chunk.hazards, again.hazards))
+
+
+def test_evicted_edits_survive_and_storms_regenerate():
+    world = make_world(max_chunks=9)
+    world.set_terrain(2, 3, Terrain.MOUNTAIN)
+    walk(world, 0, 200)
+    window = world.window
+    # Travel far enough for those chunks to be evicted, then come back
+    for i in range(1, 12):
+        world.center_on(512 + 199 * 8.0 + i * world.chunk_size, 384)
+        world.load_window()
+    assert (0, 0) not in world.chunks
+    assert list(world.evicted) == [(0, 0)]
+
+    world.center_on(512 + 199 * 8.0, 384)
+    world.load_window()
+    assert world.window == window
+    assert world.get_terrain_code_at(3 * 40 + 1, 2 * 40 + 1) == Terrain.MOUNTAIN
+    # Chunks without edits come back as their seed made them
+    fresh = make_world()
+    for (cx, cy), (chunk, _) in world.window_chunks.items():
+        if (cx, cy) != (0, 0):
+            assert all(np.array_equal(a, b) for a, b in zip(chunk.hazards, fresh.generate_chunk(cx, cy).hazards))
+
+
+def test_long_journeys_keep_memory_flat():
+    world = make_world()
+    for i in range(20000):
+        world.update(1.0, (512 + i * 6.0, 384))
+    assert world.window[0] > 100
+    assert len(world.chunks) <= world.max_chunks
+    assert not world.evicted
+
+
+def test_queries_do_not_load_chunks():
+    world = make_world()
+    loaded = dict(world.chunks)
+    far = 100 * world.chunk_size
+    assert world.check_hazard_collision(far, far) is None
+    world.get_terrain_code_at(far, far)
+    world.count_terrain_in_radius(far, far, 200, Terrain.GRASS)
+    assert world.chunks == loaded
+    assert world.get_terrain_code_at(far, far) == make_world().generate_chunk(100, 100).terrain_grid[0, 0]
+
+
+def test_survivors_stay_in_the_window():
+    world = make_world()
+    survivors = Survivors(world, GameRNG(1), capacity=200)
+    survivors.reset(200)
+    walk(world, 0, 100)
+    for _ in range(100):
+        survivors.update()
+    left, top, right, bottom = world.get_bounds()
+    x, y = survivors.entities.position.x[:200], survivors.entities.position.y[:200]
+    assert ((x >= left) & (x <= right) & (y >= top) & (y <= bottom)).all()
+
+
+def test_draw_scrolls_with_the_camera():
+    screen = pygame.Surface((1024, 768))
+    world = make_world()
+    walk(world, 0, 50)
+    world.draw(screen)
+    # Sample the baked background at a screen pixel, since hazards may cover it
+    x, y = 300, 200
+    world_x, world_y = x - world.screen_offset()[0], y - world.screen_offset()[1]
+    left, top, _, _ = world.get_bounds()
+    background = tuple(world.terrain_surface.get_at((int(world_x - left), int(world_y - top))))[:3]
+    assert background == world.get_terrain_color(world.get_terrain_code_at(world_x, world_y))
+
+
+def test_food_stocks_follow_their_tiles_across_window_moves():
+    world = make_world()
+    survivors = Survivors(world, GameRNG(1), capacity=5)
+    survivors.reset(5)
+    foraging = survivors.systems[1]
+    entities = survivors.entities
+    grid = world.terrain_grid
+    row, col = np.argwhere(grid == Terrain.GRASS)[0]
+    left, top, _, _ = world.get_bounds()
+    tile = (top // world.terrain_size + row, left // world.terrain_size + col)
+
+    def forage():
+        entities.position.x[:5] = left + (col + 0.5) * world.terrain_size
+        entities.position.y[:5] = top + (row + 0.5) * world.terrain_size
+        entities.inventory.food[:5] = 0
+        foraging.update(entities, foraging.INTERVAL)
+
+    forage()
+    walk(world, 0, 300)
+    assert world.get_bounds()[0] > left
+    entities.status.alive[:5] = False
+    foraging.update(entities, foraging.INTERVAL)
+    for i in reversed(range(300)):
+        world.update(1.0, (512 + i * 8.0, 384))
+    assert world.get_bounds()[0] == left
+    entities.status.alive[:5] = True
+    forage()
+    stored = dict(zip(zip(foraging.depleted_rows, foraging.depleted_cols), foraging.depleted_stock))
+    assert stored == {tile: foraging.FOOD_PER_TILE - 10}
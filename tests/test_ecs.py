@@ -0,0 +1,83 @@
+import numpy as np
+import pygame
+import pytest
+
+from game.ecs import Entities, HazardSystem, RenderSystem
+from game.hazards import HazardSet
+
+
+def exposure(entities, hazards, step_scale):
+    """Effects of every hazard on every living survivor, tested densely"""
+    ids = np.flatnonzero(entities.exists[:entities.size] & entities.status.alive[:entities.size])
+    x, y = entities.position.x[ids, None], entities.position.y[ids, None]
+    inside = ((x - hazards.x) ** 2 + (y - hazards.y) ** 2 < hazards.radius ** 2) & hazards.active
+    effects = [inside @ table[hazards.type] * step_scale for table in
+               (HazardSystem.DAMAGE, HazardSystem.FOOD_STOLEN, HazardSystem.INJURY_CHANCE)]
+    exposed = inside.any(axis=1)
+    return ids[exposed], [effect[exposed] for effect in effects]
+
+
+@pytest.mark.parametrize("hazard_count", [10, 1000])
+def test_hazard_system_matches_a_dense_test(hazard_count):
+    rng = np.random.default_rng(2)
+    entities = Entities(64)
+    count = 3000
+    entities.create(count, x=rng.uniform(0, 1024, count), y=rng.uniform(0, 768, count),
+                    alive=rng.random(count) < 0.9, food=rng.uniform(0, 2, count))
+    entities.destroy(np.arange(0, count, 7))
+    hazards = HazardSet()
+    hazards.add_many(rng.uniform(0, 1024, hazard_count), rng.uniform(0, 768, hazard_count),
+                     rng.integers(0, 3, hazard_count), rng.uniform(30, 80, hazard_count),
+                     rng.random(hazard_count) < 0.8)
+
+    hit, (damage, theft, injury) = exposure(entities, hazards, 0.5)
+    health = entities.stats.health.copy()
+    food = entities.inventory.food.copy()
+    HazardSystem(hazards, np.random.default_rng(8)).update(entities, 0.5)
+
+    assert len(hit)
+    np.testing.assert_allclose(health[hit] - entities.stats.health[hit], damage)
+    np.testing.assert_allclose(entities.inventory.food[hit], np.maximum(0, food[hit] - theft))
+    untouched = np.setdiff1d(np.arange(entities.size), hit)
+    assert np.array_equal(entities.stats.health[untouched], health[untouched])
+    # One injury roll per exposed survivor, in id order
+    assert np.array_equal(entities.status.injured[hit], np.random.default_rng(8).random(len(hit)) < injury)
+
+
+def test_dense_and_bucketed_hit_pairs_agree(monkeypatch):
+    rng = np.random.default_rng(5)
+    hazards = HazardSet()
+    hazards.add_many(rng.uniform(0, 1024, 40), rng.uniform(0, 768, 40),
+                     rng.integers(0, 3, 40), rng.uniform(30, 80, 40))
+    x, y = rng.uniform(0, 1024, 2000), rng.uniform(0, 768, 2000)
+    dense = hazards.hit_pairs(x, y)
+    monkeypatch.setattr(HazardSet, "DENSE_PAIRS", 0)
+    bucketed = hazards.hit_pairs(x, y)
+    order = [np.lexsort((hazard, point)) for point, hazard in (dense, bucketed)]
+    assert all(np.array_equal(a[order[0]], b[order[1]]) for a, b in zip(dense, bucketed))
+    assert np.all(np.diff(bucketed[0]) >= 0)
+
+
+def test_entity_ids_are_reused_and_queries_follow():
+    entities = Entities(4)
+    ids = entities.create(6)
+    assert ids.tolist() == list(range(6)) and entities.capacity >= 6
+    assert entities.query("position") == slice(0, 6)
+    entities.destroy([1, 4])
+    assert entities.query("position").tolist() == [0, 2, 3, 5]
+    assert sorted(entities.create(2).tolist()) == [1, 4]
+    entities.remove_component([2], "stats")
+    assert 2 not in entities.query("position", "stats").tolist()
+
+
+def test_render_rects_cover_each_group_of_sprites():
+    renderer = RenderSystem()
+    size = renderer.RADIUS * 2 + 1
+    rng = np.random.default_rng(3)
+    x = np.r_[rng.integers(0, 20, 50), 900]
+    y = np.r_[rng.integers(0, 20, 50), 700]
+    rects = renderer.tile_rects(x, y)
+    # Two distant groups of sprites give two small rects, not one spanning the screen
+    assert len(rects) == 2 and all(rect.width < 40 and rect.height < 40 for rect in rects)
+    for sx, sy in zip(x.tolist(), y.tolist()):
+        assert any(rect.contains(pygame.Rect(sx, sy, size, size)) for rect in rects)
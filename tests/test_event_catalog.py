@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+from game.core_game import GameState
+from game.event_catalog import DEFAULT_CATALOG, ENCOUNTERS, EventCatalog
+from game.rng import GameRNG
+
+
+def make_state(**values):
+    state = dict(player_health=100, player_stamina=100, player_morale=100,
+                 food=50, water=30, medicine=10, fuel=20, weapons=5)
+    state.update(values)
+    return SimpleNamespace(**state)
+
+
+def test_every_choice_is_compiled_once():
+    ids = [choice["id"] for event in ENCOUNTERS for choice in event["choices"]]
+    assert len(set(ids)) == len(ids) == len(DEFAULT_CATALOG.choices)
+    assert DEFAULT_CATALOG.choice_ids() == [tuple(choice["id"] for choice in event["choices"])
+                                            for event in ENCOUNTERS]
+
+
+def test_odds_choice_rolls_like_the_handwritten_handler():
+    for seed in range(50):
+        state, rng = make_state(), GameRNG(seed)
+        expected, reference = make_state(), GameRNG(seed)
+        DEFAULT_CATALOG.resolve(state, "fight_animal", rng)
+        if reference.randint(1, 2) == 1:
+            expected.player_health -= reference.randint(10, 25)
+            expected.food += reference.randint(5, 15)
+        else:
+            expected.player_health -= reference.randint(20, 40)
+        assert state == expected
+        assert rng.random() == reference.random()
+
+
+def test_requires_choice_depends_on_the_resource():
+    rng = GameRNG(1)
+    armed, unarmed = make_state(weapons=2), make_state(weapons=0)
+    DEFAULT_CATALOG.resolve(armed, "weapon_animal", rng)
+    DEFAULT_CATALOG.resolve(unarmed, "weapon_animal", rng)
+    assert armed.weapons == 1 and armed.food > 50 and armed.player_health == 100
+    assert unarmed.weapons == 0 and unarmed.food == 50 and unarmed.player_health < 100
+
+
+def test_unknown_choice_changes_nothing():
+    state = make_state()
+    assert not DEFAULT_CATALOG.resolve(state, "no_such_choice", GameRNG(1))
+    assert state == make_state()
+
+
+def test_overrides_replace_choice_effects():
+    catalog = EventCatalog(overrides={"flee_animal": {"effect": {"player_stamina": -5}}})
+    state = make_state()
+    catalog.resolve(state, "flee_animal", GameRNG(1))
+    assert state.player_stamina == 95
+    # The shared catalog is left alone
+    DEFAULT_CATALOG.resolve(state, "flee_animal", GameRNG(1))
+    assert state.player_stamina == 65
+
+
+def test_game_state_resolves_and_clears_the_current_event():
+    state = GameState(GameRNG(3))
+    state.trigger_random_event()
+    choice = state.current_event["choices"][0]["id"]
+    state.handle_event_choice(choice)
+    assert state.current_event is None and state.total_events_faced == 1
@@ -0,0 +1,49 @@
+from game.core_game import GameState
+from game.rng import GameRNG
+from game.snapshot import GAME_STATE_FIELDS
+
+
+def play(state, ticks):
+    for tick in range(ticks):
+        if tick % 600 < 20:
+            state.move_player(2.0, 0.0)
+        if tick % 3600 == 0:
+            state.rest()
+        if state.current_event is not None:
+            state.handle_event_choice(state.current_event["choices"][tick % 3]["id"])
+        state.update(1 / 60)
+    return {name: getattr(state, name) for name in GAME_STATE_FIELDS}
+
+
+def test_fork_continues_exactly_like_the_original():
+    state = GameState(GameRNG(6))
+    play(state, 3000)
+    fork = state.fork()
+    assert play(fork, 20000) == play(state, 20000)
+
+
+def test_forks_do_not_affect_each_other_or_the_parent():
+    state = GameState(GameRNG(6))
+    play(state, 3000)
+    expected = play(state.fork(), 20000)
+    forks = state.forks(3)
+    # A fork that plays differently leaves its siblings and the parent alone
+    forks[0].move_player(0.0, 5.0)
+    play(forks[0], 5000)
+    assert play(forks[1], 20000) == expected
+    assert play(forks[2], 20000) == expected
+    assert play(state, 20000) == expected
+
+
+def test_restore_returns_to_the_fork_point():
+    state = GameState(GameRNG(9))
+    play(state, 2000)
+    saved = state.fork()
+    expected = play(saved.fork(), 10000)
+    play(state, 7000)
+    state.rest()
+    rng, scheduler = state.rng, state.scheduler
+    state.restore(saved)
+    # The state keeps its own rng and scheduler objects
+    assert state.rng is rng and state.scheduler is scheduler
+    assert play(state, 10000) == expected
@@ -0,0 +1,56 @@
+import numpy as np
+import pygame
+
+from game.hazards import HazardSet, HazardView
+from game.rng import GameRNG
+from game.world import World
+
+
+def random_hazards(seed=2, count=500, size=1500):
+    rng = np.random.default_rng(seed)
+    hazards = HazardSet(cell_size=80)
+    hazards.add_many(rng.uniform(-size, size, count), rng.uniform(-size, size, count),
+                     rng.integers(0, 3, count), rng.uniform(30, 80, count))
+    hazards.set_active(rng.random(count) < 0.2, False)
+    return hazards, rng
+
+
+def test_first_hits_matches_first_hit():
+    hazards, rng = random_hazards()
+    points = rng.uniform(-1600, 1600, (4000, 2))
+    expected = [hazards.first_hit(x, y) for x, y in points.tolist()]
+    assert hazards.first_hits(points) == expected
+    assert hazards.first_hits(points.tolist()) == expected
+    assert hazards.first_hits([]) == []
+    assert HazardSet().first_hits([(1.0, 2.0)]) == [None]
+
+
+def test_views_write_through_to_the_columns():
+    hazards, _ = random_hazards(count=10)
+    view = hazards[3]
+    assert isinstance(view, HazardView)
+    view["x"] = 5000.0
+    view["type"] = "predator"
+    view["active"] = True
+    assert hazards.x[3] == 5000.0 and hazards.first_hit(5000.0, hazards.y[3]) == 3
+    assert dict(view)["type"] == "predator"
+
+
+def test_draw_hazards_matches_per_hazard_drawing():
+    world = World(1024, 768, GameRNG(7))
+    hazards, _ = random_hazards(count=300, size=1000)
+    fast, slow = pygame.Surface((1024, 768)), pygame.Surface((1024, 768))
+    offset = (37, -12)
+    rects = world.draw_hazards(fast, hazards, offset)
+
+    # Reference: one HazardView at a time through the dict interface
+    expected = []
+    for hazard in hazards:
+        if hazard["active"]:
+            center = (int(hazard["x"] + offset[0]), int(hazard["y"] + offset[1]))
+            rect = pygame.draw.circle(slow, world.get_hazard_color(hazard["type"]), center,
+                                      int(hazard["radius"]), 2)
+            rect.union_ip(world.draw_hazard_symbol(slow, hazard, offset))
+            expected.append(rect)
+    assert rects == expected
+    assert pygame.image.tobytes(fast, "RGB") == pygame.image.tobytes(slow, "RGB")
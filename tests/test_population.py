@@ -0,0 +1,44 @@
+import numpy as np
+
+from game import population
+from game.population import PopulationSimulator, PopulationState
+from game.simulation import HeadlessSimulator, make_walk_policy, random_choice_policy
+
+
+def test_choice_codes_follow_catalog():
+    codes = sorted(population.CHOICE_CODES.values())
+    assert codes == list(range(len(population.CHOICE_RECORDS)))
+    for event, choices in enumerate(population.EVENT_CHOICE_IDS):
+        for index, choice_id in enumerate(choices):
+            code = population.CHOICE_CODES[choice_id]
+            assert code == population.CHOICE_OFFSETS[event] + index
+            assert population.CHOICE_RECORDS[code].choice_id == choice_id
+
+
+def test_random_choices_stay_within_their_encounter():
+    simulator = PopulationSimulator(10, seed=1)
+    state = PopulationState(5000, seed=2)
+    events = state.rng.integers(0, len(population.EVENT_TITLES), 5000)
+    codes = simulator.choose(state, events)
+    offsets = population.CHOICE_OFFSETS[events]
+    assert np.all(codes >= offsets)
+    assert np.all(codes < offsets + population.CHOICE_COUNTS[events])
+
+
+def test_daily_events_match_catalog_effects():
+    state = PopulationState(20000, seed=3)
+    before = {name: getattr(state, name).copy() for name in state.COLUMNS}
+    state.trigger_daily_event(np.arange(state.size))
+    changed = {name for name in state.COLUMNS if np.any(getattr(state, name) != before[name])}
+    touched = {population.ATTRIBUTE_COLUMNS.get(attribute, attribute)
+               for outcome in population.DAILY_OUTCOMES
+               for attribute, *_ in outcome.deltas + outcome.rolls}
+    assert changed == touched
+
+
+def test_population_matches_headless_simulator():
+    vectorized = PopulationSimulator(20000, speed=3, min_stamina=10, seed=1)
+    vectorized_rate = vectorized.report(vectorized.run()).summary()["victory_rate"]
+    headless = HeadlessSimulator(make_walk_policy(min_stamina=10), random_choice_policy, seed=1)
+    headless_rate = headless.run_batch(4000).summary()["victory_rate"]
+    assert abs(vectorized_rate - headless_rate) < 0.02
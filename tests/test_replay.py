@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from game.core_game import GameState
+from game.replay import InputLog, Replay
+from game.rng import GameRNG
+from game.snapshot import GAME_STATE_FIELDS
+
+
+def play(seed, ticks=6000, jitter=True):
+    """A recorded session with measured-looking frame times and some input"""
+    state = GameState(GameRNG(seed), record=True)
+    inputs = random.Random(seed)
+    for tick in range(ticks):
+        if tick % 300 < 120:
+            state.move_player(1.5, -0.5)
+        if tick % 997 == 0:
+            state.rest()
+        if state.current_event is not None:
+            state.handle_event_choice(state.current_event["choices"][0]["id"])
+        state.update(1 / 60 + (inputs.uniform(-0.002, 0.002) if jitter else 0.0))
+    return state
+
+
+def fields(state):
+    return {name: getattr(state, name) for name in GAME_STATE_FIELDS}
+
+
+@pytest.mark.parametrize("seed", [7, -3, 2**64 - 1])
+def test_replay_reproduces_the_session(seed):
+    state = play(seed)
+    log = InputLog.from_bytes(state.input_log.to_bytes())
+    assert log.seed == seed and len(log) == len(state.input_log)
+    assert fields(Replay(log).run()) == fields(state)
+
+
+def test_inputs_merge_into_runs_despite_varying_dt():
+    log = play(11).input_log
+    # Held keys and idle stretches collapse although every dt differs
+    assert len(log.runs) < len(log) / 50
+    assert len(log.dt_runs) == len(log)
+    steady = play(11, jitter=False).input_log
+    assert len(steady.dt_runs) == 1
+
+
+def test_seeking_back_matches_a_fresh_replay():
+    log = play(5).input_log
+    replay = Replay(log, keyframe_interval=500)
+    replay.seek(5000)
+    rewound = fields(replay.seek(1234))
+    assert rewound == fields(Replay(log).seek(1234))
+    assert [log.frame(tick) for tick in range(1200, 1300)] == list(log.frames(1200, 1300))
@@ -0,0 +1,72 @@
+from game.rng import GameRNG, derive_seed
+
+
+def draws(rng, count=20):
+    return ([rng.random() for _ in range(count)] + [rng.randint(1, 100) for _ in range(count)]
+            + [rng.buffered() for _ in range(count)])
+
+
+def test_same_seed_same_sequence():
+    assert draws(GameRNG(5)) == draws(GameRNG(5))
+    assert draws(GameRNG(5)) != draws(GameRNG(6))
+    assert derive_seed(5, "world") == derive_seed(5, "world") != derive_seed(5, "events")
+
+
+def test_streams_do_not_affect_each_other():
+    rng = GameRNG(9)
+    expected = draws(GameRNG(9).stream("world"))
+    draws(rng.stream("events"), 500)
+    assert draws(rng.stream("world")) == expected
+
+
+def test_state_round_trip_covers_substreams_and_numpy():
+    rng = GameRNG(3)
+    draws(rng)
+    rng.stream("npcs").numpy().random(10)
+    state = rng.get_state()
+    expected = draws(rng), draws(rng.stream("npcs")), rng.stream("npcs").numpy().random(5).tolist()
+
+    rng.set_state(state)
+    assert (draws(rng), draws(rng.stream("npcs")), rng.stream("npcs").numpy().random(5).tolist()) == expected
+
+
+def test_set_state_of_another_seed_keeps_the_objects_components_hold():
+    source = GameRNG(1)
+    source.stream("npcs").numpy().random(7)
+    target = GameRNG(2)
+    stream, generator = target.stream("npcs"), target.stream("npcs").numpy()
+    generator.random(3)
+
+    target.set_state(source.get_state())
+    assert target.stream("npcs") is stream and stream.numpy() is generator
+    assert generator.random(5).tolist() == source.stream("npcs").numpy().random(5).tolist()
+
+
+def test_numpy_generator_rewinds_to_a_state_that_never_used_it():
+    rng = GameRNG(4)
+    state = rng.get_state()
+    first = rng.numpy().random(5).tolist()
+    rng.set_state(state)
+    assert rng.numpy().random(5).tolist() == first
+
+
+def test_forks_continue_like_the_parent_and_stay_independent():
+    rng = GameRNG(11)
+    draws(rng)
+    rng.stream("world").numpy().random(4)
+    forks = rng.forks(3)
+    expected = draws(rng.clone())
+    for fork in forks:
+        assert draws(fork) == expected
+        draws(fork, 100)
+    assert draws(forks[0].stream("world")) == draws(forks[1].stream("world"))
+
+
+def test_restore_returns_to_a_fork():
+    rng = GameRNG(12)
+    saved = rng.fork()
+    expected = draws(rng.clone())
+    draws(rng, 200)
+    rng.stream("world").random()
+    rng.restore(saved)
+    assert draws(rng) == expected
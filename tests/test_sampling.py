@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from game.event_manager import EventManager
+from game.rng import GameRNG
+from game.sampling import AliasTable, WeightedSampler
+from game.terrain import Terrain
+
+WEIGHTS = [5.0, 0.0, 1.0, 2.5, 0.5, 1.0]
+
+
+def assert_frequencies(indices, weights, size):
+    expected = np.array(weights) / sum(weights)
+    counts = np.bincount(indices, minlength=len(weights))
+    # Each count within five binomial standard deviations
+    assert np.all(np.abs(counts - size * expected) <= 5 * np.sqrt(size * expected * (1 - expected)) + 1e-9)
+
+
+def test_alias_table_distribution_is_the_weights():
+    table = AliasTable(WEIGHTS)
+    np.testing.assert_allclose(table.probabilities(), np.array(WEIGHTS) / sum(WEIGHTS), atol=1e-12)
+
+
+def test_alias_frequencies_match_weights():
+    table = AliasTable(WEIGHTS)
+    rng = GameRNG(7)
+    size = 200_000
+    draws = [table.sample(rng) for _ in range(size)]
+    assert 1 not in draws
+    assert_frequencies(draws, WEIGHTS, size)
+    assert_frequencies(table.sample_many(size, np.random.default_rng(7)), WEIGHTS, size)
+
+
+@pytest.mark.parametrize("weights", [[], [0.0, 0.0], [1.0, -1.0]])
+def test_alias_table_rejects_bad_weights(weights):
+    with pytest.raises(ValueError):
+        AliasTable(weights)
+
+
+def test_sampler_builds_one_table_per_bucket():
+    calls = []
+
+    def weight(item, bucket):
+        calls.append(bucket)
+        return item * (bucket or 1)
+
+    sampler = WeightedSampler([1, 2, 3], weight, max_tables=2)
+    rng = GameRNG(1)
+    for bucket in (None, 2, None, 3):
+        sampler.sample(rng, bucket)
+    assert calls.count(None) == 3 and calls.count(2) == 3 and calls.count(3) == 3
+    # The least recently used table was dropped to stay within max_tables
+    assert list(sampler.tables) == [None, 3]
+
+
+def test_daily_outcomes_follow_the_event_weights():
+    manager = EventManager(GameRNG(2))
+    bucket = manager.context_bucket(Terrain.DESERT, 20)
+    probabilities = manager.daily_sampler.probabilities(bucket)
+    assert probabilities[0] == pytest.approx(1 - manager.DAILY_EVENT_CHANCE)
+    assert sum(probabilities) == pytest.approx(1.0)
+
+    size = 100_000
+    outcomes = manager.sample_daily_events(size, np.random.default_rng(3), Terrain.DESERT, 20)
+    indices = [manager.daily_sampler.items.index(outcome) for outcome in outcomes]
+    assert_frequencies(indices, probabilities, size)
@@ -0,0 +1,64 @@
+from game.rng import GameRNG
+from game.scheduler import EventScheduler
+
+
+def run(scheduler, ticks):
+    return [(scheduler.tick, name) for _ in range(ticks) for name in scheduler.advance()]
+
+
+def test_recurring_and_one_shot_events_fire_on_their_ticks():
+    scheduler = EventScheduler(GameRNG(1))
+    scheduler.schedule_every("day", 10)
+    scheduler.schedule("storm", 15)
+    assert scheduler.ticks_until_next() == 10
+    assert run(scheduler, 30) == [(10, "day"), (15, "storm"), (20, "day"), (30, "day")]
+
+
+def test_same_tick_events_fire_in_priority_order():
+    scheduler = EventScheduler(GameRNG(1))
+    scheduler.schedule("encounter", 5)
+    scheduler.schedule("other", 5)
+    scheduler.schedule_every("day", 5)
+    assert scheduler.advance(5) == ("day", "encounter", "other")
+
+
+def test_jumping_ahead_fires_everything_passed():
+    scheduler = EventScheduler(GameRNG(1))
+    scheduler.schedule_every("day", 10)
+    assert scheduler.advance(35) == ("day", "day", "day")
+    assert scheduler.ticks_until_next() == 5
+
+
+def test_cancel_and_reschedule_drop_pending_occurrences():
+    scheduler = EventScheduler(GameRNG(1))
+    scheduler.schedule_every("day", 10)
+    scheduler.schedule("storm", 5)
+    scheduler.cancel("storm")
+    scheduler.schedule_every("day", 7)
+    assert run(scheduler, 20) == [(7, "day"), (14, "day")]
+
+
+def test_chance_events_match_per_tick_rolls():
+    scheduler = EventScheduler(GameRNG(3))
+    chance = 1 / 300
+    scheduler.schedule_chance("encounter", chance)
+    ticks = 600_000
+    fired = len(run(scheduler, ticks))
+    expected = ticks * chance
+    # Within five standard deviations of the binomial count
+    assert abs(fired - expected) < 5 * (expected * (1 - chance)) ** 0.5
+
+
+def test_state_round_trip_fires_the_same_events():
+    rng = GameRNG(4)
+    scheduler = EventScheduler(rng)
+    scheduler.schedule_every("day", 60)
+    scheduler.schedule_chance("encounter", 0.01)
+    run(scheduler, 500)
+    state, rng_state = scheduler.get_state(), rng.get_state()
+    expected = run(scheduler, 5000)
+
+    rng.set_state(rng_state)
+    other = EventScheduler(rng)
+    other.set_state(state)
+    assert run(other, 5000) == expected
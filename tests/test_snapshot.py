@@ -0,0 +1,78 @@
+import pygame
+import pytest
+
+from game.core_game import GameState
+from game.game_engine import GameEngine
+from game.rng import GameRNG
+from game.snapshot import (GAME_STATE_FIELDS, engine_to_bytes, game_state_to_bytes, load_engine,
+                           load_game_state, save_engine, save_game_state)
+
+
+@pytest.fixture(autouse=True)
+def display():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def step_state(state, ticks):
+    for tick in range(ticks):
+        if tick % 200 < 50:
+            state.move_player(2.0, 1.0)
+        if state.current_event is not None:
+            state.handle_event_choice(state.current_event["choices"][-1]["id"])
+        state.update(1 / 60)
+
+
+def step_engine(engine, ticks):
+    for tick in range(ticks):
+        # Walk right now and then, as a player holding a key would
+        if tick % 120 < 40:
+            engine.player.x += 3
+        engine.update()
+
+
+def test_game_state_round_trip_continues_identically(tmp_path):
+    path = str(tmp_path / "state.dgs")
+    state = GameState(GameRNG(21))
+    step_state(state, 5000)
+    save_game_state(state, path)
+    loaded = load_game_state(path, GameState(GameRNG(99)))
+    step_state(state, 20000)
+    step_state(loaded, 20000)
+    assert {name: getattr(loaded, name) for name in GAME_STATE_FIELDS} == \
+        {name: getattr(state, name) for name in GAME_STATE_FIELDS}
+    assert game_state_to_bytes(loaded) == game_state_to_bytes(state)
+
+
+@pytest.mark.parametrize("chunked, npcs", [(False, 0), (True, 0), (False, 300), (True, 300)])
+def test_engine_round_trip_continues_identically(tmp_path, chunked, npcs):
+    path = str(tmp_path / "engine.dgs")
+    engine = GameEngine(640, 480, 60, seed=4, chunked=chunked, npcs=npcs)
+    engine.start_game()
+    step_engine(engine, 900)
+    save_engine(engine, path)
+
+    other = GameEngine(640, 480, 60, seed=8, chunked=chunked, npcs=npcs)
+    other.start_game()
+    load_engine(path, other)
+    # Terrain is copied out of the mapping, which is closed after loading
+    assert other.world.terrain_grid.flags.owndata
+    step_engine(engine, 4000)
+    step_engine(other, 4000)
+    assert engine_to_bytes(other) == engine_to_bytes(engine)
+
+    # The loaded file is not held open, so it can be saved over at once
+    save_engine(other, path)
+    load_engine(path, engine)
+    assert engine_to_bytes(engine) == engine_to_bytes(other)
+
+
+def test_snapshot_of_another_world_type_is_refused(tmp_path):
+    path = str(tmp_path / "engine.dgs")
+    save_engine(GameEngine(640, 480, 60, seed=1, chunked=True), path)
+    with pytest.raises(ValueError):
+        load_engine(path, GameEngine(640, 480, 60, seed=1))
+    save_engine(GameEngine(640, 480, 60, seed=1), path)
+    with pytest.raises(ValueError):
+        load_engine(path, GameEngine(640, 480, 60, seed=1, npcs=10))
@@ -0,0 +1,49 @@
+import numpy as np
+
+from game.hazards import HazardSet
+from game.spatial import SpatialHash
+
+
+def brute_first_hit(hazards, x, y):
+    inside = ((hazards.x - x) ** 2 + (hazards.y - y) ** 2 < hazards.radius ** 2) & hazards.active
+    hits = np.flatnonzero(inside)
+    return int(hits[0]) if len(hits) else None
+
+
+def brute_query_radius(hazards, x, y, radius):
+    inside = ((hazards.x - x) ** 2 + (hazards.y - y) ** 2 <= radius * radius) & hazards.active
+    return np.flatnonzero(inside)
+
+
+def random_hazards(rng, count=300, size=2000):
+    hazards = HazardSet(cell_size=80)
+    hazards.add_many(rng.uniform(0, size, count), rng.uniform(0, size, count),
+                     rng.integers(0, 3, count), rng.uniform(30, 80, count))
+    hazards.set_active(rng.random(count) < 0.2, False)
+    return hazards
+
+
+def test_hash_only_moves_keys_between_cells():
+    index = SpatialHash(cell_size=100)
+    index.insert("a", 50, 50, 10)
+    index.move("a", 60, 40, 10)
+    assert list(index.members_at(55, 55)) == ["a"]
+    index.move("a", 250, 50, 10)
+    assert list(index.members_at(55, 55)) == []
+    assert "a" in index.members_near(240, 60, 5)
+    index.remove("a")
+    assert len(index) == 0 and not index.cells
+
+
+def test_queries_match_brute_force_after_storms_drift():
+    rng = np.random.default_rng(4)
+    hazards = random_hazards(rng)
+    # Small drifts mostly stay inside the same cells, so the index is
+    # left untouched while the hazards move
+    for _ in range(500):
+        hazards.drift_storms(rng, 1.0, (0, 0, 2000, 2000))
+    points = rng.uniform(0, 2000, (2000, 2))
+    for x, y in points:
+        assert hazards.first_hit(x, y) == brute_first_hit(hazards, x, y)
+    for x, y in points[:200]:
+        assert np.array_equal(hazards.query_radius(x, y, 150), brute_query_radius(hazards, x, y, 150))
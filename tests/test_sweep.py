@@ -0,0 +1,40 @@
+from game.sweep import build_grid, run_shard
+
+
+def test_grid_without_start_values_keeps_engine_defaults():
+    assert build_grid({}, [None]) == [{"start": {}, "event_chance": None}]
+
+
+def test_components_shard_starts_from_resource_manager_defaults(monkeypatch):
+    from game import engine_simulation
+    from game.resource_manager import STARTING_AMOUNTS, WATER
+
+    waters = []
+    start_game = engine_simulation.HeadlessEngine.start_game
+
+    def record(engine):
+        start_game(engine)
+        waters.append(engine.resource_manager.water)
+    monkeypatch.setattr(engine_simulation.HeadlessEngine, "start_game", record)
+
+    options = {"max_days": 1, "policy": "idle", "choices": "random", "speed": 0, "min_stamina": 0}
+    _, _, report = run_shard(("components", 0, 0, {"start": {}, "event_chance": None}, 3, 1, options))
+    assert report.runs == 3
+    assert waters == [STARTING_AMOUNTS[WATER]] * 3
+
+
+def test_build_grid_expands_every_combination():
+    grid = build_grid({"food": [10, 20], "water": [5]}, [None, 0.01])
+    assert len(grid) == 4
+    assert {config["start"]["food"] for config in grid} == {10, 20}
+
+
+def test_headless_engine_shares_the_engine_rule_setup():
+    from game.engine_simulation import HeadlessEngine
+
+    engine = HeadlessEngine(seed=5)
+    assert engine.survivors is None and not engine.autosave
+    assert not hasattr(engine, "screen") and not hasattr(engine, "world")
+    first = HeadlessEngine(seed=5).run_batch(20)
+    again = HeadlessEngine(seed=5).run_batch(20)
+    assert (first.day_histogram, first.causes) == (again.day_histogram, again.causes)
@@ -10,9 +10,12 @@ import os
 
 # Import the existing game modules
 from game.core_game import GameState
+from game.rng import GameRNG
+from game.text_cache import get_font, render_text
+from game.profiler import FrameProfiler
 
 class WebGameEngine:
-    def __init__(self):
+    def __init__(self, seed=None):
         pygame.init()
         self.width = 800
         self.height = 600
@@ -21,10 +24,10 @@ class WebGameEngine:
         self.clock = pygame.time.Clock()
         
         # Game state
-        self.game_state = GameState()
+        self.game_state = GameState(GameRNG(seed))
         self.running = True
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.font = get_font(36)
+        self.small_font = get_font(24)
         
         # Colors
         self.BLACK = (0, 0, 0)
@@ -39,11 +42,21 @@ class WebGameEngine:
         self.show_event_popup = False
         self.event_choices = []
         
+        # Frame-time profiler, F3 toggles the overlay
+        self.profiler = FrameProfiler()
+        
     async def run(self):
         while self.running:
-            await self.handle_events()
-            await self.update()
-            await self.draw()
+            profiler = self.profiler
+            profiler.begin_frame()
+            with profiler.section("events"):
+                await self.handle_events()
+            with profiler.section("update"):
+                await self.update()
+            with profiler.section("draw"):
+                await self.draw()
+            profiler.end_frame()
+            self.clock.tick(60)
             await asyncio.sleep(0)
             
     async def handle_events(self):
@@ -53,6 +66,8 @@ class WebGameEngine:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
                 elif event.key == pygame.K_r:
                     self.game_state.reset_game()
                 elif event.key == pygame.K_SPACE:
@@ -98,14 +113,19 @@ class WebGameEngine:
     async def draw(self):
         self.screen.fill(self.BLACK)
         
+        profiler = self.profiler
+        
         # Draw game world
-        self.draw_world()
+        with profiler.section("draw.world"):
+            self.draw_world()
         
         # Draw player
-        self.draw_player()
+        with profiler.section("draw.player"):
+            self.draw_player()
         
         # Draw UI
-        self.draw_ui()
+        with profiler.section("draw.ui"):
+            self.draw_ui()
         
         # Draw event popup if needed
         if self.show_event_popup:
@@ -115,8 +135,10 @@ class WebGameEngine:
         if self.game_state.game_over:
             self.draw_game_over()
         
+        if self.profiler.overlay_visible:
+            self.profiler.draw_overlay(self.screen, (self.width - 260, self.height - 160))
+        
         pygame.display.flip()
-        self.clock.tick(60)
     
     def draw_world(self):
         # Draw simple world background
@@ -163,15 +185,15 @@ class WebGameEngine:
         status = self.game_state.get_status()
         
         # Day counter
-        day_text = self.font.render(f"Day: {status['day']}", True, self.WHITE)
+        day_text = render_text(self.font, f"Day: {status['day']}", True, self.WHITE)
         self.screen.blit(day_text, (10, 10))
         
         # Health
-        health_text = self.small_font.render(f"Health: {status['health']:.0f}/100", True, self.WHITE)
+        health_text = render_text(self.small_font, f"Health: {status['health']:.0f}/100", True, self.WHITE)
         self.screen.blit(health_text, (10, 50))
         
         # Stamina
-        stamina_text = self.small_font.render(f"Stamina: {status['stamina']:.0f}/100", True, self.WHITE)
+        stamina_text = render_text(self.small_font, f"Stamina: {status['stamina']:.0f}/100", True, self.WHITE)
         self.screen.blit(stamina_text, (10, 75))
         
         # Resources
@@ -185,12 +207,12 @@ class WebGameEngine:
         ]
         
         for text in resource_texts:
-            resource_surface = self.small_font.render(text, True, self.WHITE)
+            resource_surface = render_text(self.small_font, text, True, self.WHITE)
             self.screen.blit(resource_surface, (10, y_offset))
             y_offset += 20
         
         # Progress bar
-        progress_text = self.small_font.render(f"Progress: {status['progress']:.1f}%", True, self.WHITE)
+        progress_text = render_text(self.small_font, f"Progress: {status['progress']:.1f}%", True, self.WHITE)
         self.screen.blit(progress_text, (10, y_offset + 10))
         
         # Progress bar visual
@@ -214,7 +236,7 @@ class WebGameEngine:
         
         y_offset = self.height - 130
         for text in controls_text:
-            control_surface = self.small_font.render(text, True, self.WHITE)
+            control_surface = render_text(self.small_font, text, True, self.WHITE)
             self.screen.blit(control_surface, (self.width - 150, y_offset))
             y_offset += 20
     
@@ -234,12 +256,12 @@ class WebGameEngine:
         
         # Event title
         event = self.game_state.current_event
-        title_surface = self.font.render(event['title'], True, self.WHITE)
+        title_surface = render_text(self.font, event['title'], True, self.WHITE)
         title_rect = title_surface.get_rect(center=(popup_x + popup_width//2, popup_y + 30))
         self.screen.blit(title_surface, title_rect)
         
         # Event description
-        desc_surface = self.small_font.render(event['description'], True, self.WHITE)
+        desc_surface = render_text(self.small_font, event['description'], True, self.WHITE)
         desc_rect = desc_surface.get_rect(center=(popup_x + popup_width//2, popup_y + 70))
         self.screen.blit(desc_surface, desc_rect)
         
@@ -247,13 +269,13 @@ class WebGameEngine:
         y_offset = popup_y + 110
         for i, choice in enumerate(event['choices']):
             choice_text = f"{i+1}. {choice['text']}"
-            choice_surface = self.small_font.render(choice_text, True, self.WHITE)
+            choice_surface = render_text(self.small_font, choice_text, True, self.WHITE)
             self.screen.blit(choice_surface, (popup_x + 20, y_offset))
             y_offset += 30
         
         # Instructions
         instruction_text = "Press 1, 2, or 3 to choose"
-        instruction_surface = self.small_font.render(instruction_text, True, self.YELLOW)
+        instruction_surface = render_text(self.small_font, instruction_text, True, self.YELLOW)
         instruction_rect = instruction_surface.get_rect(center=(popup_x + popup_width//2, popup_y + popup_height - 20))
         self.screen.blit(instruction_surface, instruction_rect)
     
@@ -272,19 +294,19 @@ class WebGameEngine:
             game_over_text = "GAME OVER"
             color = self.RED
             
-        game_over_surface = self.font.render(game_over_text, True, color)
+        game_over_surface = render_text(self.font, game_over_text, True, color)
         game_over_rect = game_over_surface.get_rect(center=(self.width//2, self.height//2 - 50))
         self.screen.blit(game_over_surface, game_over_rect)
         
         # Survival info
         survival_text = f"You survived {self.game_state.day} days"
-        survival_surface = self.small_font.render(survival_text, True, self.WHITE)
+        survival_surface = render_text(self.small_font, survival_text, True, self.WHITE)
         survival_rect = survival_surface.get_rect(center=(self.width//2, self.height//2))
         self.screen.blit(survival_surface, survival_rect)
         
         # Restart instruction
         restart_text = "Press R to restart"
-        restart_surface = self.small_font.render(restart_text, True, self.WHITE)
+        restart_surface = render_text(self.small_font, restart_text, True, self.WHITE)
         restart_rect = restart_surface.get_rect(center=(self.width//2, self.height//2 + 50))
         self.screen.blit(restart_surface, restart_rect)
 